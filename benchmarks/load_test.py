@@ -0,0 +1,125 @@
+"""
+Load-test development planning over HTTP against the Ollama stub server.
+
+Starts the stub server in-process (or targets ``--url``), points the shared LLM
+at it and runs ``--plans`` calls to ``DevCrew.create_development_plan`` with
+``--concurrency`` of them in flight. Reports plan throughput, p50/p95/p99 plan
+latency, failures and the server's own counters.
+
+Usage:
+    python -m benchmarks.load_test --plans 8 --concurrency 4 \\
+        --latency lognormal:-2.5,0.5 --chunk-interval 0.005 --max-concurrency 4
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional
+
+from src.llm.stub_server import StubServer, add_server_arguments, config_from_args
+from src.utils.stats import summarize_latencies
+
+PROJECT_DESCRIPTION = (
+    "Create a web application that lets users upload images, apply filters, "
+    "and manage and share their image library."
+)
+
+
+def run_plans(plans: int, concurrency: int, parallel_tasks: bool) -> Dict[str, Any]:
+    """Run development plans concurrently and collect their latencies and errors."""
+    from src.main import DevCrew
+
+    def plan(index: int) -> float:
+        started = time.perf_counter()
+        crew = DevCrew(cache=False, runs_dir=None)
+        crew.create_development_plan(f"{PROJECT_DESCRIPTION} (variant {index})",
+                                     parallel=parallel_tasks)
+        if crew.error_log:
+            raise RuntimeError(crew.error_log[0].error_message)
+        return time.perf_counter() - started
+
+    latencies: List[float] = []
+    errors: List[str] = []
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = [pool.submit(plan, index) for index in range(plans)]
+        for future in as_completed(futures):
+            try:
+                latencies.append(future.result())
+            except Exception as exc:
+                errors.append(f"{type(exc).__name__}: {exc}")
+    elapsed = time.perf_counter() - started
+
+    return {
+        "plans": plans,
+        "concurrency": concurrency,
+        "succeeded": len(latencies),
+        "failed": len(errors),
+        "errors": errors[:10],
+        "elapsed_s": elapsed,
+        "plans_per_minute": len(latencies) / elapsed * 60 if elapsed > 0 else 0.0,
+        "latency": summarize_latencies(latencies)
+    }
+
+
+def display_report(report: Dict[str, Any]) -> None:
+    """Print throughput, latency percentiles and server counters."""
+    from rich.console import Console
+    from rich.table import Table
+
+    latency = report["latency"]
+    table = Table(title="Development Plan Load Test")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Plans (ok / failed)", f"{report['succeeded']} / {report['failed']}")
+    table.add_row("Concurrency", str(report["concurrency"]))
+    table.add_row("Throughput", f"{report['plans_per_minute']:.1f} plans/min")
+    for key in ("p50", "p95", "p99", "max"):
+        table.add_row(f"Latency {key}", f"{latency[key]:.2f}s")
+    for key, value in report.get("server", {}).items():
+        table.add_row(f"Server {key}", str(value))
+    Console().print(table)
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--plans", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--parallel-tasks", action="store_true",
+                        help="Also run each plan's independent tasks concurrently")
+    parser.add_argument("--url", help="Use an already running server instead of starting one")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="Client timeout between streamed chunks, in seconds")
+    parser.add_argument("--output", help="Write the report to this JSON file")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server: Optional[StubServer] = None
+    url = args.url
+    if url is None:
+        server = StubServer(config_from_args(args)).start()
+        url = server.url
+
+    # Must be set before the shared LLM is built
+    os.environ["DEVCREW_LLM_BACKEND"] = "ollama"
+    os.environ["OLLAMA_ENDPOINTS"] = url
+    os.environ["OLLAMA_TIMEOUT"] = str(args.timeout)
+
+    try:
+        report = run_plans(args.plans, max(1, args.concurrency), args.parallel_tasks)
+    finally:
+        if server is not None:
+            server.stop()
+    if server is not None:
+        report["server"] = server.stats.to_dict()
+
+    display_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(report, handle, indent=2)
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
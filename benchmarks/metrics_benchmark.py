@@ -0,0 +1,161 @@
+"""
+Microbenchmark of metric recording overhead under thread contention.
+
+Every recorder is driven by 1, 2, 4 and 8 threads at once, each recording
+``--events`` events in a tight loop. The report gives the wall time per event
+and checks the final count. The plain dict recorder is what the monitoring
+utilities did before the sharded core; its count shows the increments lost
+to races. The locked dict is the obvious fix, for comparison.
+
+Usage:
+    python -m benchmarks.metrics_benchmark [--events 100000] [--threads 1 2 4 8] [--output FILE]
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from src.utils.metrics import DevCrewMetrics
+from src.utils.metrics_core import ShardedCounter
+from src.utils.monitor import TaskMonitor
+from src.utils.tracing import Tracer
+
+# Builds (record, read) for one run: record() is called once per event from
+# every thread, read() returns the final count
+RecorderFactory = Callable[[], Any]
+
+
+def _plain_dict() -> Any:
+    counts: Dict[str, int] = {}
+
+    def record() -> None:
+        counts["events"] = counts.get("events", 0) + 1
+    return record, lambda: counts.get("events", 0)
+
+
+def _locked_dict() -> Any:
+    counts: Dict[str, int] = {}
+    lock = threading.Lock()
+
+    def record() -> None:
+        with lock:
+            counts["events"] = counts.get("events", 0) + 1
+    return record, lambda: counts.get("events", 0)
+
+
+def _sharded_counter() -> Any:
+    counter = ShardedCounter()
+    return (lambda: counter.inc("events")), (lambda: counter.value("events"))
+
+
+def _prometheus_counter() -> Any:
+    child = DevCrewMetrics().task_errors.labels("development", "model_error")
+    return child.inc, (lambda: child.value)
+
+
+def _prometheus_histogram() -> Any:
+    child = DevCrewMetrics().task_duration.labels("development")
+    return (lambda: child.observe(42.0)), (lambda: child.snapshot()[2])
+
+
+def _task_monitor() -> Any:
+    monitor = TaskMonitor(tracer=Tracer(enabled=False), metrics=DevCrewMetrics())
+    monitor.start_task("development")
+    return (
+        (lambda: monitor.record_validation("development", passed=True)),
+        (lambda: monitor.task_metrics["development"].validation_attempts)
+    )
+
+
+RECORDERS: Dict[str, RecorderFactory] = {
+    "plain_dict": _plain_dict,
+    "locked_dict": _locked_dict,
+    "sharded_counter": _sharded_counter,
+    "prometheus_counter": _prometheus_counter,
+    "prometheus_histogram": _prometheus_histogram,
+    "task_monitor": _task_monitor
+}
+
+
+def measure(factory: RecorderFactory, threads: int, events: int) -> Dict[str, Any]:
+    """Record ``events`` events from each of ``threads`` threads started together."""
+    record, read = factory()
+    barrier = threading.Barrier(threads + 1)
+
+    def work() -> None:
+        barrier.wait()
+        for _ in range(events):
+            record()
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    expected = threads * events
+    counted = int(read())
+    return {
+        "threads": threads,
+        "ns_per_event": elapsed / expected * 1e9,
+        "expected": expected,
+        "counted": counted,
+        "lost": expected - counted
+    }
+
+
+def run_benchmark(events: int, thread_counts: List[int]) -> Dict[str, List[Dict[str, Any]]]:
+    # A short switch interval makes races as likely as on a busy free-threaded build
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        return {
+            name: [measure(factory, threads, events) for threads in thread_counts]
+            for name, factory in RECORDERS.items()
+        }
+    finally:
+        sys.setswitchinterval(interval)
+
+
+def display_results(results: Dict[str, List[Dict[str, Any]]]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    thread_counts = [row["threads"] for row in next(iter(results.values()))]
+    table = Table(title="Metric Recording Overhead (ns/event)")
+    table.add_column("Recorder", style="cyan")
+    for threads in thread_counts:
+        table.add_column(f"{threads} thr", justify="right")
+    table.add_column("Lost events", justify="right")
+    for name, rows in results.items():
+        lost = sum(row["lost"] for row in rows)
+        table.add_row(name, *(f"{row['ns_per_event']:.0f}" for row in rows),
+                      str(lost), style="red" if lost else None)
+    Console().print(table)
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=100_000, help="Events per thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--output", help="Write the raw results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.events, args.threads)
+    display_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    # Only the unsynchronised baseline may lose events
+    lost = [name for name, rows in results.items()
+            if name != "plain_dict" and any(row["lost"] for row in rows)]
+    return 1 if lost else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
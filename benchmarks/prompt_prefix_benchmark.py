@@ -0,0 +1,111 @@
+"""
+Measure prompt-evaluation time of full development plans per prompt layout.
+
+Runs the same projects once with the inline layout and once with the
+static-first layout against a live Ollama server, and compares the time Ollama
+spent evaluating prompts. Reused prompt prefixes are not re-evaluated, so both
+the evaluated prompt tokens and the evaluation time drop when prefixes match.
+
+Usage:
+    python -m benchmarks.prompt_prefix_benchmark [--projects N] [--output FILE]
+"""
+import argparse
+import json
+import time
+from typing import Any, Dict, List
+
+from rich.console import Console
+from rich.table import Table
+
+from src.config.config import get_llm
+from src.main import DevCrew
+from src.tasks.task_definitions import PromptLayout
+
+console = Console()
+
+PROJECTS = [
+    "Create a web application for a small bakery with online ordering, "
+    "pickup scheduling and an admin dashboard for daily production.",
+    "Build a mobile app for a community library that lets members reserve "
+    "books, join waitlists and receive due-date reminders.",
+    "Develop an internal tool that collects support tickets from email and "
+    "chat, tags them automatically and reports response times."
+]
+
+
+def run_layout(layout: PromptLayout, projects: List[str]) -> Dict[str, Any]:
+    """Plan every project with one layout and aggregate Ollama's prompt statistics."""
+    llm = get_llm()
+    llm.stats.reset()
+    started = time.perf_counter()
+    for description in projects:
+        crew = DevCrew(cache=False, runs_dir=None, prompt_layout=layout)
+        crew.create_development_plan(description)
+    wall_time = time.perf_counter() - started
+
+    task_stats = llm.stats.get_all_stats()
+    prompt_tokens = sum(entry["prompt_tokens"] for entry in task_stats.values())
+    prompt_eval_time = sum(entry["prompt_eval_time"] for entry in task_stats.values())
+    return {
+        "layout": layout.value,
+        "projects": len(projects),
+        "calls": sum(entry["calls"] for entry in task_stats.values()),
+        "prompt_tokens_evaluated": prompt_tokens,
+        "prompt_eval_time_s": prompt_eval_time,
+        "wall_time_s": wall_time,
+        "tasks": {
+            name: {
+                "prompt_tokens": entry["prompt_tokens"],
+                "prompt_eval_time_s": entry["prompt_eval_time"]
+            }
+            for name, entry in task_stats.items()
+        }
+    }
+
+
+def display_results(results: List[Dict[str, Any]]) -> None:
+    """Print the per-layout totals and the relative change against the first layout."""
+    table = Table(title="Prompt Evaluation per Layout")
+    table.add_column("Layout", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Prompt Tokens Evaluated", justify="right")
+    table.add_column("Prompt Eval Time", justify="right")
+    table.add_column("Change", justify="right")
+    table.add_column("Wall Time", justify="right")
+
+    baseline = results[0]["prompt_eval_time_s"]
+    for result in results:
+        change = (
+            (result["prompt_eval_time_s"] - baseline) / baseline * 100 if baseline else 0.0
+        )
+        table.add_row(
+            result["layout"],
+            str(result["calls"]),
+            str(result["prompt_tokens_evaluated"]),
+            f"{result['prompt_eval_time_s']:.2f}s",
+            f"{change:+.1f}%",
+            f"{result['wall_time_s']:.1f}s"
+        )
+    console.print(table)
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--projects", type=int, default=2,
+                        help=f"Number of sample projects to plan (max {len(PROJECTS)})")
+    parser.add_argument("--output", help="Write the raw results to this JSON file")
+    args = parser.parse_args(argv)
+
+    projects = PROJECTS[:max(1, args.projects)]
+    results = [run_layout(layout, projects)
+               for layout in (PromptLayout.INLINE, PromptLayout.STATIC_FIRST)]
+    display_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
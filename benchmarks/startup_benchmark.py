@@ -0,0 +1,143 @@
+"""
+Measure CLI startup: module import time and time until the first prompt.
+
+Each entry point is started in a fresh interpreter several times. The child
+reports how long its imports took, how long it took to reach the first user
+prompt (answered from stdin), and whether crewai was imported on the way,
+which would mean some module lost its lazy construction.
+
+Usage:
+    python -m benchmarks.startup_benchmark [--runs N] [--budget SECONDS] [--output FILE]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from src.utils.stats import summarize_latencies
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Per entry point: the imports, the code that reaches the first prompt, and its answer
+ENTRY_POINTS = {
+    "main_interface": {
+        "imports": "import src.main_interface as entry",
+        "first_prompt": "entry.AIDevelopmentInterface().get_user_choice()",
+        "stdin": "3. Exit\n"
+    },
+    "script_generator": {
+        "imports": "import src.script_generator as entry",
+        "first_prompt": "entry.ScriptGenerator().get_user_requirements()",
+        "stdin": "Data Processing\nPython\nread a csv\nn\n"
+    },
+    "estimate_project": {
+        "imports": "import estimate_project as entry",
+        "first_prompt": "len(entry.DevCrew().agents); entry.get_project_requirements()",
+        "stdin": "1\n\n"
+    }
+}
+
+CHILD_TEMPLATE = """
+import json, sys, time
+started = time.perf_counter()
+{imports}
+imported = time.perf_counter()
+{first_prompt}
+prompted = time.perf_counter()
+sys.stderr.write(json.dumps({{
+    "import_s": imported - started,
+    "first_prompt_s": prompted - started,
+    "crewai_imported": "crewai" in sys.modules
+}}) + "\\n")
+"""
+
+
+def measure(entry_point: Dict[str, str]) -> Dict[str, Any]:
+    """Start one entry point in a fresh interpreter and collect its timings."""
+    code = CHILD_TEMPLATE.format(**entry_point)
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        input=entry_point["stdin"],
+        capture_output=True,
+        text=True,
+        cwd=REPO_ROOT,
+        check=False
+    )
+    wall_time = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"Entry point failed:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stderr.strip().splitlines()[-1])
+    result["process_s"] = wall_time
+    return result
+
+
+def run_benchmark(runs: int, names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Measure every selected entry point ``runs`` times and summarize the timings."""
+    results = {}
+    for name in names or list(ENTRY_POINTS):
+        samples = [measure(ENTRY_POINTS[name]) for _ in range(runs)]
+        results[name] = {
+            "import": summarize_latencies([sample["import_s"] for sample in samples]),
+            "first_prompt": summarize_latencies([sample["first_prompt_s"] for sample in samples]),
+            "process": summarize_latencies([sample["process_s"] for sample in samples]),
+            "crewai_imported": any(sample["crewai_imported"] for sample in samples)
+        }
+    return results
+
+
+def display_results(results: Dict[str, Dict[str, Any]]) -> None:
+    """Print median and tail startup times per entry point."""
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="CLI Startup")
+    table.add_column("Entry Point", style="cyan")
+    table.add_column("Import p50", justify="right")
+    table.add_column("First Prompt p50", justify="right")
+    table.add_column("First Prompt p95", justify="right")
+    table.add_column("Process p50", justify="right")
+    table.add_column("crewai Loaded", justify="center")
+    for name, result in results.items():
+        table.add_row(
+            name,
+            f"{result['import']['p50'] * 1000:.0f}ms",
+            f"{result['first_prompt']['p50'] * 1000:.0f}ms",
+            f"{result['first_prompt']['p95'] * 1000:.0f}ms",
+            f"{result['process']['p50'] * 1000:.0f}ms",
+            "[red]yes[/red]" if result["crewai_imported"] else "no"
+        )
+    Console().print(table)
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point")
+    parser.add_argument("--entry-point", action="append", choices=sorted(ENTRY_POINTS),
+                        help="Only measure these entry points")
+    parser.add_argument("--budget", type=float,
+                        help="Fail if any median time to first prompt exceeds this many seconds")
+    parser.add_argument("--output", help="Write the raw results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(max(1, args.runs), args.entry_point)
+    display_results(results)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.budget is not None:
+        slow = [name for name, result in results.items()
+                if result["first_prompt"]["p50"] > args.budget]
+        if slow:
+            print(f"Startup budget of {args.budget}s exceeded by: {', '.join(slow)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
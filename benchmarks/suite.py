@@ -0,0 +1,338 @@
+"""
+End-to-end benchmarks of the planning pipelines against the stub model.
+
+``run`` executes every scenario in a fresh interpreter with the stub backend.
+It records wall time, CPU time, peak RSS, prompt and response tokens, and how
+much of each task's time was spent outside the model. ``compare`` checks a
+results file against a stored baseline and exits non-zero on regressions.
+
+Usage:
+    python -m benchmarks.suite run --output results.json [--repeat 3] [--scenario dev_plan]
+    python -m benchmarks.suite compare baseline.json results.json [--threshold 0.1]
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.llm.streaming import GenerationStats, StreamListener
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROJECT_DESCRIPTION = """Create a web application that allows users to:
+1. Upload and process images
+2. Apply various filters and effects
+3. Save and share processed images
+4. Manage their image library"""
+
+SCRIPT_REQUIREMENTS = {
+    "script_type": "Data Processing",
+    "language": "Python",
+    "description": "Read a CSV of orders and report revenue per month",
+    "additional_requirements": "None"
+}
+
+# Metrics compared against the baseline; all of them are "lower is better"
+COMPARED_METRICS = ("wall_s", "cpu_s", "peak_rss_mb", "overhead_s", "prompt_tokens", "completion_tokens")
+
+
+def _dev_plan(parallel: bool) -> Callable[[], Any]:
+    def run() -> Any:
+        from src.main import DevCrew
+        return DevCrew(cache=False, runs_dir=None).create_development_plan(
+            PROJECT_DESCRIPTION, parallel=parallel
+        )
+    return run
+
+
+def _script() -> Any:
+    from src.script_generator import ScriptGenerator
+    return ScriptGenerator(cache=False).generate_script(SCRIPT_REQUIREMENTS)
+
+
+def _plan_project() -> Any:
+    from src.main_interface import AIDevelopmentInterface
+    return AIDevelopmentInterface(cache=False).plan_project(PROJECT_DESCRIPTION)
+
+
+def _estimate() -> Any:
+    from estimate_project import ProjectEstimator
+    return ProjectEstimator(visual_delay=0).estimate_project_time(PROJECT_DESCRIPTION, team_size=7)
+
+
+SCENARIOS: Dict[str, Callable[[], Any]] = {
+    "dev_plan": _dev_plan(parallel=False),
+    "dev_plan_parallel": _dev_plan(parallel=True),
+    "script_generator": _script,
+    "plan_project": _plan_project,
+    "estimate": _estimate
+}
+
+
+class TaskTimingListener(StreamListener):
+    """Tracks each task's span from its first model request to its last response."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.tasks: Dict[str, Dict[str, float]] = {}
+
+    def on_start(self, task_name: Optional[str], model: str) -> None:
+        with self._lock:
+            self.tasks.setdefault(task_name or "unknown",
+                                  {"first_start": time.perf_counter(), "llm_s": 0.0})
+
+    def on_complete(self, task_name: Optional[str], stats: GenerationStats) -> None:
+        with self._lock:
+            entry = self.tasks[task_name or "unknown"]
+            entry["last_end"] = time.perf_counter()
+            entry["llm_s"] += stats.total_time
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                name: {
+                    "span_s": entry.get("last_end", entry["first_start"]) - entry["first_start"],
+                    "llm_s": entry["llm_s"],
+                    "overhead_s": max(0.0, entry.get("last_end", entry["first_start"])
+                                      - entry["first_start"] - entry["llm_s"])
+                }
+                for name, entry in self.tasks.items()
+            }
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(name: str) -> Dict[str, Any]:
+    """Run one scenario in the current process and measure it."""
+    from src.config.config import get_llm
+
+    llm = get_llm()
+    llm.stats.reset()
+    timings = TaskTimingListener()
+    llm.add_listener(timings)
+
+    rss_before = _peak_rss_mb()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        SCENARIOS[name]()
+    finally:
+        llm.remove_listener(timings)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    stats = llm.stats.get_all_stats().values()
+    llm_time = sum(entry["total_time"] for entry in stats)
+    return {
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "peak_rss_mb": _peak_rss_mb(),
+        "rss_growth_mb": _peak_rss_mb() - rss_before,
+        "llm_calls": sum(entry["calls"] for entry in stats),
+        "prompt_tokens": sum(entry["prompt_tokens"] for entry in stats),
+        "completion_tokens": sum(entry["completion_tokens"] for entry in stats),
+        "llm_s": llm_time,
+        "overhead_s": max(0.0, wall - llm_time),
+        "tasks": timings.summary()
+    }
+
+
+def _child(name: str, output_path: str) -> int:
+    """Entry point of the per-scenario interpreter."""
+    # Importing crewai and building the LLM take seconds and are not measured
+    import crewai  # noqa: F401
+    from src.config.config import get_llm
+    get_llm()
+
+    result = run_scenario(name)
+    with open(output_path, "w", encoding="utf-8") as handle:
+        json.dump(result, handle)
+    return 0
+
+
+def measure(name: str, stub_env: Dict[str, str]) -> Dict[str, Any]:
+    """Run a scenario in a fresh interpreter with the stub backend."""
+    env = dict(os.environ, DEVCREW_LLM_BACKEND="stub", **stub_env)
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as handle:
+        output_path = handle.name
+    try:
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.suite", "_child", name, output_path],
+            cwd=REPO_ROOT,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Scenario {name} failed:\n{completed.stderr[-2000:]}")
+        with open(output_path, encoding="utf-8") as handle:
+            return json.load(handle)
+    finally:
+        os.unlink(output_path)
+
+
+def _median_run(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Collapse repeated runs into the median of every numeric metric."""
+    result = dict(runs[0])
+    for key, value in runs[0].items():
+        if isinstance(value, (int, float)):
+            result[key] = statistics.median(run[key] for run in runs)
+    result["repeats"] = len(runs)
+    result["wall_s_runs"] = [run["wall_s"] for run in runs]
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(scenarios: List[str], repeat: int, stub_env: Dict[str, str]) -> Dict[str, Any]:
+    """Run the selected scenarios and build the results document."""
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "stub": stub_env
+        },
+        "scenarios": {
+            name: _median_run([measure(name, stub_env) for _ in range(repeat)])
+            for name in scenarios
+        }
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any],
+            threshold: float, min_delta: float = 0.0) -> List[Dict[str, Any]]:
+    """
+    Find metrics that got worse than the baseline by more than ``threshold``.
+
+    Args:
+        baseline: Results document used as reference
+        current: Results document to check
+        threshold: Allowed relative increase, e.g. 0.1 for 10%
+        min_delta: Absolute increases up to this size are treated as noise
+
+    Returns:
+        One entry per regressed metric with both values and the relative change
+    """
+    regressions = []
+    for name, result in current["scenarios"].items():
+        reference = baseline["scenarios"].get(name)
+        if reference is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = reference.get(metric), result.get(metric)
+            if old is None or new is None:
+                continue
+            if new - old <= min_delta:
+                continue
+            change = (new - old) / old if old else float("inf")
+            if change > threshold:
+                regressions.append({
+                    "scenario": name, "metric": metric,
+                    "baseline": old, "current": new, "change": change
+                })
+    return regressions
+
+
+def display_results(results: Dict[str, Any]) -> None:
+    """Print the main metrics of every scenario."""
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Planning Pipeline Benchmarks")
+    for column in ("Scenario", "Wall", "CPU", "Peak RSS", "LLM Calls",
+                   "Prompt Tok", "Response Tok", "Overhead"):
+        table.add_column(column, justify="left" if column == "Scenario" else "right")
+    for name, result in results["scenarios"].items():
+        table.add_row(
+            name,
+            f"{result['wall_s']:.2f}s",
+            f"{result['cpu_s']:.2f}s",
+            f"{result['peak_rss_mb']:.0f}MB",
+            str(int(result["llm_calls"])),
+            str(int(result["prompt_tokens"])),
+            str(int(result["completion_tokens"])),
+            f"{result['overhead_s']:.2f}s"
+        )
+    Console().print(table)
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS))
+    run_parser.add_argument("--output-tokens", type=int, default=256,
+                            help="Tokens per stub response")
+    run_parser.add_argument("--tokens-per-second", type=float, default=0.0,
+                            help="Simulated generation speed; 0 measures pure overhead")
+    run_parser.add_argument("--prompt-tokens-per-second", type=float, default=0.0)
+
+    compare_parser = commands.add_parser("compare", help="Compare results with a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Allowed relative increase before flagging")
+    compare_parser.add_argument("--min-delta", type=float, default=0.02,
+                                help="Ignore absolute increases up to this size (seconds, MB, tokens)")
+
+    child_parser = commands.add_parser("_child")
+    child_parser.add_argument("scenario")
+    child_parser.add_argument("output")
+
+    args = parser.parse_args(argv)
+    if args.command == "_child":
+        return _child(args.scenario, args.output)
+
+    if args.command == "run":
+        stub_env = {
+            "DEVCREW_STUB_OUTPUT_TOKENS": str(args.output_tokens),
+            "DEVCREW_STUB_TPS": str(args.tokens_per_second),
+            "DEVCREW_STUB_PROMPT_TPS": str(args.prompt_tokens_per_second)
+        }
+        results = run_suite(args.scenario or list(SCENARIOS), max(1, args.repeat), stub_env)
+        display_results(results)
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    with open(args.current, encoding="utf-8") as handle:
+        current = json.load(handle)
+    regressions = compare(baseline, current, args.threshold, args.min_delta)
+    for regression in regressions:
+        print(f"REGRESSION {regression['scenario']}.{regression['metric']}: "
+              f"{regression['baseline']:.3f} -> {regression['current']:.3f} "
+              f"({regression['change']:+.1%})")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
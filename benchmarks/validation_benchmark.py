@@ -0,0 +1,140 @@
+"""
+Microbenchmark of validating stored task outputs in bulk.
+
+Validates ``--documents`` synthetic architecture designs with the common
+output rules three ways: rule by rule with plain lambdas, as the validator
+did before compiled rule sets; with the compiled rule set; and with the
+compiled rule set spread over ``--processes`` worker processes. The report
+gives the time per document and checks that all three agree.
+
+Usage:
+    python -m benchmarks.validation_benchmark [--documents 5000] [--processes 4] [--output FILE]
+"""
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from src.utils.validator import (
+    CompiledRuleSet,
+    ValidationResult,
+    ValidationRule,
+    create_common_validation_rules
+)
+
+TASK_TYPE = "architecture_design"
+
+VOCABULARY = (
+    "service gateway queue cache database worker client server request response "
+    "token schema event stream batch index replica shard tenant session"
+).split()
+
+
+def make_documents(count: int, words: int = 600, seed: int = 7) -> List[str]:
+    """Markdown-ish designs; some miss the interface section, a few are empty."""
+    rng = random.Random(seed)
+    documents = []
+    for index in range(count):
+        body = " ".join(rng.choice(VOCABULARY) for _ in range(words))
+        sections = ["## Components", body]
+        if index % 3:
+            sections += ["## Interfaces", body[: words]]
+        documents.append("" if index % 50 == 0 else "\n".join(sections))
+    return documents
+
+
+def _lambda_rules() -> List[ValidationRule]:
+    """The common rules with each check recomputing what it needs from the raw text."""
+    checks: Dict[str, Callable[[Any], bool]] = {
+        "has_components": lambda x: "components" in x.lower(),
+        "has_interfaces": lambda x: "interface" in x.lower()
+    }
+    rules = []
+    for rule in create_common_validation_rules()[TASK_TYPE]:
+        validator = checks.get(rule.name, rule.validator)
+        rules.append(ValidationRule(rule.name, rule.description, validator,
+                                    rule.error_message, rule.severity, rule.streaming))
+    return rules
+
+
+def _per_rule(documents: List[str], processes: int) -> List[ValidationResult]:
+    results = []
+    rules = _lambda_rules()
+    for document in documents:
+        errors, warnings = [], []
+        for rule in rules:
+            if not rule.validator(document):
+                issue = {"rule_name": rule.name, "message": rule.error_message}
+                (warnings if rule.severity.value == "warning" else errors).append(issue)
+        results.append(ValidationResult(not errors, errors, warnings))
+    return results
+
+
+def _compiled(documents: List[str], processes: int) -> List[ValidationResult]:
+    return CompiledRuleSet(create_common_validation_rules()[TASK_TYPE]).validate_batch(documents)
+
+
+def _compiled_pool(documents: List[str], processes: int) -> List[ValidationResult]:
+    rules = CompiledRuleSet(create_common_validation_rules()[TASK_TYPE])
+    return rules.validate_batch(documents, processes=processes)
+
+
+STRATEGIES = {
+    "per_rule": _per_rule,
+    "compiled": _compiled,
+    "compiled_pool": _compiled_pool
+}
+
+
+def run_benchmark(documents: int, processes: int) -> Dict[str, Dict[str, Any]]:
+    corpus = make_documents(documents)
+    results: Dict[str, Dict[str, Any]] = {}
+    reference = None
+    for name, strategy in STRATEGIES.items():
+        started = time.perf_counter()
+        outcome = strategy(corpus, processes)
+        elapsed = time.perf_counter() - started
+        verdicts = [(result.is_valid, len(result.errors), len(result.warnings)) for result in outcome]
+        reference = reference if reference is not None else verdicts
+        results[name] = {
+            "documents": documents,
+            "us_per_document": elapsed / documents * 1e6,
+            "invalid": sum(not valid for valid, _, _ in verdicts),
+            "agrees": verdicts == reference
+        }
+    return results
+
+
+def display_results(results: Dict[str, Dict[str, Any]]) -> None:
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Bulk Output Validation")
+    table.add_column("Strategy", style="cyan")
+    table.add_column("us/document", justify="right")
+    table.add_column("Invalid", justify="right")
+    table.add_column("Agrees", justify="right")
+    for name, row in results.items():
+        table.add_row(name, f"{row['us_per_document']:.1f}", str(row["invalid"]),
+                      "yes" if row["agrees"] else "no", style=None if row["agrees"] else "red")
+    Console().print(table)
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--output", help="Write the raw results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.documents, args.processes)
+    display_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2)
+    return 0 if all(row["agrees"] for row in results.values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -42,8 +42,13 @@ class ProjectEstimator:
         "advanced": 1.6   # Advanced stack (e.g., Microservices, ML, etc.)
     }
 
-    def __init__(self):
+    def __init__(self, visual_delay: float = 1.0):
+        """
+        Args:
+            visual_delay: Seconds each phase is shown as running; 0 skips the animation
+        """
         self.progress_mgr = ProgressManager()
+        self.visual_delay = visual_delay
 
     def analyze_project_complexity(self, description: str) -> Tuple[str, str]:
         """
@@ -125,7 +130,8 @@ class ProjectEstimator:
             # Simulate analysis for visual feedback
             for phase in phase_estimates.keys():
                 self.progress_mgr.start_task(phase)
-                time.sleep(1)  # Brief pause for visualization
+                if self.visual_delay:
+                    time.sleep(self.visual_delay)  # Brief pause for visualization
                 self.progress_mgr.complete_task(phase)
         
         # Create the results dictionary
@@ -251,7 +257,7 @@ def main():
     # Create estimator with AI crew team size
     estimator = ProjectEstimator()
     dev_crew = DevCrew()
-    team_size = len(dev_crew.agents.get_all_agents())  # Get actual number of AI agents
+    team_size = len(dev_crew.agents)  # Number of AI agents, without building them
     
     # Generate estimate
     estimate = estimator.estimate_project_time(
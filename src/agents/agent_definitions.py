@@ -1,14 +1,24 @@
-from typing import List
-from src.config.config import create_agent
-from src.utils.tools import DevTeamTools
+"""Agent definitions and the registry that builds them on first use."""
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-class DevTeamAgents:
-    """Main development and QA team agents."""
-    def __init__(self):
-        self.developer = create_agent(
-            role='Software Developer',
-            goal='Design and implement high-quality code solutions based on user requirements',
-            backstory="""You are a senior software developer with expertise in multiple programming 
+@dataclass(frozen=True)
+class AgentSpec:
+    """Everything needed to build an agent, without building it."""
+    role: str
+    goal: str
+    backstory: str
+    toolset: str  # Key of DevTeamTools.TOOLSETS
+    allow_delegation: bool = False
+    verbose: bool = True
+
+# Specifications of every agent, keyed by the attribute name teams expose them under
+AGENT_SPECS: Dict[str, AgentSpec] = {
+    "developer": AgentSpec(
+        role='Software Developer',
+        goal='Design and implement high-quality code solutions based on user requirements',
+        backstory="""You are a senior software developer with expertise in multiple programming 
             languages and frameworks. You specialize in:
             - Writing clean, efficient, and well-documented code
             - Understanding and implementing user requirements
@@ -17,14 +27,12 @@ class DevTeamAgents:
             - Creating robust test cases
             - Code review and optimization
             - Error handling and input validation""",
-            tools=DevTeamTools.get_developer_tools(),
-            verbose=True
-        )
-
-        self.qa_engineer = create_agent(
-            role='QA Engineer',
-            goal='Ensure code quality and functionality through comprehensive testing',
-            backstory="""You are a detail-oriented QA engineer with experience in various testing 
+        toolset="developer"
+    ),
+    "qa_engineer": AgentSpec(
+        role='QA Engineer',
+        goal='Ensure code quality and functionality through comprehensive testing',
+        backstory="""You are a detail-oriented QA engineer with experience in various testing 
             methodologies. You excel at:
             - Writing and executing test cases
             - Identifying edge cases and potential issues
@@ -32,33 +40,20 @@ class DevTeamAgents:
             - Ensuring code reliability and performance
             - Providing detailed feedback on code quality
             - Suggesting improvements and optimizations""",
-            tools=DevTeamTools.get_qa_tools(),
-            verbose=True
-        )
-
-    def get_all_agents(self) -> List:
-        return [
-            self.developer,
-            self.qa_engineer
-        ]
-
-class ProjectTeamAgents:
-    """Project management and documentation team agents."""
-    def __init__(self):
-        self.documentation_specialist = create_agent(
-            role='Documentation Specialist',
-            goal='Create comprehensive and clear documentation for all aspects of the project',
-            backstory="""You are an experienced technical writer and documentation specialist with 
+        toolset="qa"
+    ),
+    "documentation_specialist": AgentSpec(
+        role='Documentation Specialist',
+        goal='Create comprehensive and clear documentation for all aspects of the project',
+        backstory="""You are an experienced technical writer and documentation specialist with 
             expertise in creating user guides, API documentation, and technical specifications. 
             You excel at making complex information accessible and maintaining documentation quality.""",
-            tools=DevTeamTools.get_documentation_tools(),
-            verbose=True
-        )
-
-        self.product_owner = create_agent(
-            role='Product Owner & Project Manager',
-            goal='Define product vision, manage project execution, and ensure value delivery',
-            backstory="""You are an experienced Product Owner and Project Manager with a strong background in 
+        toolset="documentation"
+    ),
+    "product_owner": AgentSpec(
+        role='Product Owner & Project Manager',
+        goal='Define product vision, manage project execution, and ensure value delivery',
+        backstory="""You are an experienced Product Owner and Project Manager with a strong background in 
             agile methodologies and software development. You excel at understanding user needs,
             defining requirements, and ensuring the product delivers value. You are also skilled in:
             - Project planning and execution
@@ -68,38 +63,140 @@ class ProjectTeamAgents:
             - Stakeholder communication
             - Agile ceremonies facilitation
             - Project metrics and KPI tracking""",
-            tools=DevTeamTools.get_product_owner_tools(),
-            verbose=True,
-            allow_delegation=True
-        )
-
-        self.architect = create_agent(
-            role='Solution Architect',
-            goal='Design scalable and maintainable system architectures',
-            backstory="""You are an experienced solution architect with a strong background in 
+        toolset="product_owner",
+        allow_delegation=True
+    ),
+    "architect": AgentSpec(
+        role='Solution Architect',
+        goal='Design scalable and maintainable system architectures',
+        backstory="""You are an experienced solution architect with a strong background in 
             system design and architectural patterns. You excel at:
             - Creating scalable system architectures
             - Defining integration patterns
             - Making technology stack decisions
             - Ensuring security and performance
             - Documenting architectural decisions""",
-            tools=DevTeamTools.get_architect_tools(),
-            verbose=True
-        )
-
-        self.devops_engineer = create_agent(
-            role='DevOps Engineer',
-            goal='Optimize development operations and ensure reliable deployment',
-            backstory="""You are a DevOps engineer skilled in automation, CI/CD, and cloud technologies. 
+        toolset="architect"
+    ),
+    "devops_engineer": AgentSpec(
+        role='DevOps Engineer',
+        goal='Optimize development operations and ensure reliable deployment',
+        backstory="""You are a DevOps engineer skilled in automation, CI/CD, and cloud technologies. 
             You ensure smooth deployment and operation of software systems.""",
-            tools=DevTeamTools.get_devops_tools(),
-            verbose=True
-        )
+        toolset="devops"
+    ),
+    "designer": AgentSpec(
+        role='UI/UX Designer',
+        goal='Design intuitive interfaces and user experiences that meet user needs',
+        backstory="""You are a UI/UX designer experienced in turning requirements into
+            wireframes, mockups and interaction flows. You excel at:
+            - User research and persona definition
+            - Information architecture and navigation design
+            - Accessible, consistent visual design systems
+            - Communicating designs clearly to developers""",
+        toolset="designer"
+    )
+}
+
+def build_agent(spec: AgentSpec) -> Any:
+    """Create an agent with its tools and the shared LLM."""
+    from src.config.config import create_agent
+    from src.utils.tools import DevTeamTools
+
+    return create_agent(
+        role=spec.role,
+        goal=spec.goal,
+        backstory=spec.backstory,
+        tools=DevTeamTools.get_toolset(spec.toolset),
+        verbose=spec.verbose,
+        allow_delegation=spec.allow_delegation
+    )
+
+class AgentRegistry:
+    """
+    Builds agents on first use and shares them afterwards.
+
+    Constructing an agent imports crewai and creates its tools and the LLM
+    client, so nothing is built until a team member is actually accessed.
+    """
+
+    def __init__(
+        self,
+        specs: Optional[Dict[str, AgentSpec]] = None,
+        factory: Callable[[AgentSpec], Any] = build_agent
+    ):
+        self.specs = dict(AGENT_SPECS if specs is None else specs)
+        self.factory = factory
+        self._agents: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, spec: AgentSpec) -> None:
+        """Add or replace an agent specification, dropping any built instance."""
+        with self._lock:
+            self.specs[name] = spec
+            self._agents.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """
+        Get an agent, building it on first access.
+
+        Raises:
+            KeyError: If no agent is registered under ``name``
+        """
+        with self._lock:
+            if name not in self._agents:
+                self._agents[name] = self.factory(self.specs[name])
+            return self._agents[name]
+
+    def is_built(self, name: str) -> bool:
+        """Whether an agent has been constructed yet."""
+        with self._lock:
+            return name in self._agents
+
+    def names(self) -> List[str]:
+        """Names of all registered agents."""
+        return list(self.specs)
+
+# Registry shared by all teams
+agent_registry = AgentRegistry()
+
+class AgentTeam:
+    """
+    A named group of agents resolved lazily through a registry.
+
+    Members are accessed as attributes (``team.developer``); ``len(team)``
+    counts members without building any of them.
+    """
+    MEMBERS: Tuple[str, ...] = ()
+
+    def __init__(self, registry: Optional[AgentRegistry] = None):
+        self.registry = registry or agent_registry
+
+    def __getattr__(self, name: str) -> Any:
+        if name in type(self).MEMBERS:
+            return self.registry.get(name)
+        raise AttributeError(f"{type(self).__name__} has no agent {name!r}")
+
+    def __len__(self) -> int:
+        return len(self.MEMBERS)
 
     def get_all_agents(self) -> List:
-        return [
-            self.product_owner,
-            self.architect,
-            self.devops_engineer,
-            self.documentation_specialist
-        ]
+        return [self.registry.get(name) for name in self.MEMBERS]
+
+class DevTeamAgents(AgentTeam):
+    """Main development and QA team agents."""
+    MEMBERS = ("developer", "qa_engineer")
+
+class ProjectTeamAgents(AgentTeam):
+    """Project management, design and documentation team agents."""
+    MEMBERS = (
+        "product_owner",
+        "architect",
+        "devops_engineer",
+        "documentation_specialist",
+        "designer"
+    )
+
+class DevCrewAgents(AgentTeam):
+    """Every agent taking part in a full development plan."""
+    MEMBERS = DevTeamAgents.MEMBERS + ProjectTeamAgents.MEMBERS
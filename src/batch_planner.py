@@ -0,0 +1,223 @@
+"""Headless batch planning over a JSONL file of project descriptions."""
+import argparse
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from src.utils.scheduler import DEFAULT_MAX_CONCURRENCY
+from src.utils.stats import summarize_latencies
+
+console = Console()
+
+DEFAULT_WORKERS = 2
+
+@dataclass
+class BatchItem:
+    """A single project description to plan."""
+    item_id: str
+    description: str
+
+    @property
+    def dedup_key(self) -> str:
+        """Key shared by descriptions that differ only in whitespace."""
+        normalized = " ".join(self.description.split())
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+@dataclass
+class BatchReport:
+    """Outcome and timing of a batch run."""
+    total_items: int = 0
+    unique_plans: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    wall_time: float = 0.0
+    plan_latencies: List[float] = field(default_factory=list)
+
+    @property
+    def plans_per_hour(self) -> float:
+        """Distinct plans computed per hour of wall time."""
+        if self.wall_time <= 0:
+            return 0.0
+        return self.unique_plans / self.wall_time * 3600
+
+    @property
+    def items_per_hour(self) -> float:
+        """Input items answered per hour of wall time, including coalesced ones."""
+        if self.wall_time <= 0:
+            return 0.0
+        return self.total_items / self.wall_time * 3600
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_items": self.total_items,
+            "unique_plans": self.unique_plans,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "wall_time_s": round(self.wall_time, 3),
+            "plans_per_hour": round(self.plans_per_hour, 2),
+            "items_per_hour": round(self.items_per_hour, 2),
+            "latency_s": summarize_latencies(self.plan_latencies)
+        }
+
+
+def load_batch_items(path: str) -> List[BatchItem]:
+    """
+    Read project descriptions from a JSONL file.
+
+    Each line is a JSON object. The description is taken from
+    ``project_description`` or ``description``; otherwise ``title`` and ``body``
+    are combined, which matches the layout of ``requests.jsonl``. The identifier
+    comes from ``id`` or ``request_id`` and falls back to the line number.
+    """
+    items = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            description = record.get("project_description") or record.get("description")
+            if not description:
+                parts = [record.get("title", ""), record.get("body", "")]
+                description = "\n\n".join(part for part in parts if part)
+            if not description:
+                raise ValueError(f"{path}:{line_number} has no project description")
+            item_id = str(record.get("id") or record.get("request_id") or line_number)
+            items.append(BatchItem(item_id=item_id, description=description))
+    return items
+
+
+def _default_crew_factory() -> Any:
+    from src.main import DevCrew
+    return DevCrew()
+
+
+class BatchPlanner:
+    """
+    Plans many projects over a bounded pool of DevCrew workers.
+
+    Every worker thread owns its own DevCrew, since a crew tracks per-run state.
+    Items with identical descriptions are computed once and the result is
+    written for each of them.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        crew_factory: Callable[[], Any] = _default_crew_factory,
+        parallel: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.crew_factory = crew_factory
+        self.parallel = parallel
+        self.max_concurrency = max_concurrency
+        self._local = threading.local()
+
+    def _crew(self) -> Any:
+        if not hasattr(self._local, "crew"):
+            self._local.crew = self.crew_factory()
+        return self._local.crew
+
+    def _plan(self, description: str) -> Dict[str, Any]:
+        crew = self._crew()
+        start = time.perf_counter()
+        try:
+            result = crew.create_development_plan(
+                description,
+                parallel=self.parallel,
+                max_concurrency=self.max_concurrency
+            )
+            outcome = {"status": "ok", "result": str(result)}
+        except Exception as e:
+            outcome = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+        outcome["latency_s"] = round(time.perf_counter() - start, 3)
+        outcome["run_id"] = getattr(crew, "last_run_id", None)
+        return outcome
+
+    def run(self, items: List[BatchItem], output_path: str) -> BatchReport:
+        """
+        Plan every item and append one JSON line per item to ``output_path``.
+
+        Lines are written as soon as each plan finishes, so partial results
+        survive an interrupted batch.
+        """
+        groups: Dict[str, List[BatchItem]] = {}
+        for item in items:
+            groups.setdefault(item.dedup_key, []).append(item)
+
+        report = BatchReport(total_items=len(items), unique_plans=len(groups))
+        start = time.perf_counter()
+
+        with open(output_path, "a", encoding="utf-8") as out, \
+                ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {
+                pool.submit(self._plan, group[0].description): group
+                for group in groups.values()
+            }
+            for future in as_completed(futures):
+                group = futures[future]
+                outcome = future.result()
+                report.plan_latencies.append(outcome["latency_s"])
+                for item in group:
+                    record = {"id": item.item_id, **outcome}
+                    if item is not group[0]:
+                        record["coalesced_with"] = group[0].item_id
+                    out.write(json.dumps(record) + "\n")
+                    if outcome["status"] == "ok":
+                        report.succeeded += 1
+                    else:
+                        report.failed += 1
+                out.flush()
+
+        report.wall_time = time.perf_counter() - start
+        return report
+
+
+def display_report(report: BatchReport) -> None:
+    """Print a batch report as a table."""
+    summary = report.to_dict()
+    latency = summary.pop("latency_s")
+    table = Table(title="Batch Planning Report", show_header=True, header_style="bold magenta")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    for name, value in summary.items():
+        table.add_row(name, str(value))
+    for name, value in latency.items():
+        table.add_row(f"latency {name}", f"{value:.2f}s" if name != "count" else str(value))
+    console.print(table)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Generate development plans for a JSONL batch")
+    parser.add_argument("input", help="JSONL file with one project description per line")
+    parser.add_argument("-o", "--output", default="plans.jsonl", help="JSONL file to append results to")
+    parser.add_argument("-w", "--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Number of plans computed at once")
+    parser.add_argument("--parallel", action="store_true",
+                        help="Run independent tasks of each plan concurrently")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help="Task concurrency cap per plan in parallel mode")
+    args = parser.parse_args(argv)
+
+    items = load_batch_items(args.input)
+    console.print(f"[bold blue]Planning {len(items)} project(s) with {args.workers} worker(s)[/bold blue]")
+    planner = BatchPlanner(
+        workers=args.workers,
+        parallel=args.parallel,
+        max_concurrency=args.max_concurrency
+    )
+    report = planner.run(items, args.output)
+    display_report(report)
+
+
+if __name__ == "__main__":
+    main()
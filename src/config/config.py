@@ -1,33 +1,135 @@
 import os
-from typing import List, Optional, Sequence, Any
-from dotenv import load_dotenv
-from langchain_ollama import OllamaLLM
-from crewai import Agent
-from crewai.tools import BaseTool
-
-# Load environment variables
-load_dotenv()
-
-# Initialize the LLM for CrewAI
-llm = OllamaLLM(
-    model="llama2",  # Using Llama 2 model
-    base_url="http://localhost:11434",
-    temperature=0.7,
-    num_ctx=4096,  # Context window size
-    num_thread=4   # Number of threads for processing
-)
+import threading
+from typing import TYPE_CHECKING, Any, List, Optional, Sequence
+
+from src.config.model_routing import ModelRouting
+
+if TYPE_CHECKING:
+    from crewai import Agent
+    from crewai.tools import BaseTool
+    from src.llm.crew_llm import StreamingOllamaLLM
+    from src.llm.endpoint_pool import EndpointPool
+
+# Generation budget (num_predict) per task; tasks not listed use the default
+TASK_NUM_PREDICT = {
+    "development": 2048,
+    "architecture_design": 2048,
+    "technical_documentation": 2048
+}
+
+DEFAULT_OLLAMA_URL = "http://localhost:11434"
+
+# Backend the shared LLM talks to, chosen with DEVCREW_LLM_BACKEND
+OLLAMA_BACKEND = "ollama"  # Real Ollama servers through the endpoint pool
+STUB_BACKEND = "stub"      # Deterministic offline stub, see src/llm/stub_backend.py
+
+# Everything below is built on first use so importing this module stays cheap;
+# crewai alone takes seconds to import.
+_lock = threading.RLock()
+_env_loaded = False
+_endpoint_pool: Optional["EndpointPool"] = None
+_model_routing: Optional[ModelRouting] = None
+_llm: Optional["StreamingOllamaLLM"] = None
+
+def load_environment() -> None:
+    """Load environment variables from ``.env`` once."""
+    global _env_loaded
+    with _lock:
+        if not _env_loaded:
+            from dotenv import load_dotenv
+            load_dotenv()
+            _env_loaded = True
+
+def get_endpoint_pool() -> "EndpointPool":
+    """Ollama servers to spread requests over (OLLAMA_ENDPOINTS, comma-separated; OLLAMA_TIMEOUT)."""
+    global _endpoint_pool
+    with _lock:
+        if _endpoint_pool is None:
+            from src.llm.endpoint_pool import EndpointPool
+            from src.llm.ollama_client import DEFAULT_TIMEOUT
+
+            load_environment()
+            _endpoint_pool = EndpointPool.from_env(
+                default_url=DEFAULT_OLLAMA_URL,
+                timeout=float(os.getenv("OLLAMA_TIMEOUT", DEFAULT_TIMEOUT))
+            )
+            if len(_endpoint_pool.endpoints) > 1:
+                _endpoint_pool.start_health_checks()
+        return _endpoint_pool
+
+def get_model_routing() -> ModelRouting:
+    """Model tier per task type (see model_routing for the DEVCREW_* overrides)."""
+    global _model_routing
+    with _lock:
+        if _model_routing is None:
+            load_environment()
+            _model_routing = ModelRouting.from_env()
+        return _model_routing
+
+def get_llm_client() -> Any:
+    """
+    Client for the backend selected by ``DEVCREW_LLM_BACKEND`` (default: ollama).
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    load_environment()
+    backend = os.getenv("DEVCREW_LLM_BACKEND", OLLAMA_BACKEND).lower()
+    if backend == OLLAMA_BACKEND:
+        return get_endpoint_pool()
+    if backend == STUB_BACKEND:
+        from src.llm.stub_backend import StubOllamaClient, StubSettings
+        return StubOllamaClient(StubSettings.from_env())
+    raise ValueError(f"Unknown LLM backend: {backend}")
+
+def get_llm() -> "StreamingOllamaLLM":
+    """The LLM shared by all agents; responses are streamed token by token."""
+    global _llm
+    with _lock:
+        if _llm is None:
+            from src.llm.crew_llm import DEFAULT_KEEP_ALIVE, DEFAULT_NUM_PREDICT, StreamingOllamaLLM
+            from src.llm.resilience import RetryPolicy
+            from src.utils.metrics import get_metrics
+
+            _llm = StreamingOllamaLLM(
+                model="llama2",  # Using Llama 2 model
+                base_url=DEFAULT_OLLAMA_URL,
+                temperature=0.7,
+                num_ctx=4096,  # Context window size
+                num_thread=4,  # Number of threads for processing
+                num_predict=DEFAULT_NUM_PREDICT,
+                task_num_predict=TASK_NUM_PREDICT,
+                keep_alive=os.getenv("OLLAMA_KEEP_ALIVE", DEFAULT_KEEP_ALIVE),
+                routing=get_model_routing(),
+                client=get_llm_client(),
+                retry_policy=RetryPolicy.from_env()
+            )
+            _llm.add_listener(get_metrics().llm_listener)
+        return _llm
+
+_LAZY_ATTRIBUTES = {
+    "llm": get_llm,
+    "endpoint_pool": get_endpoint_pool,
+    "model_routing": get_model_routing
+}
+
+def __getattr__(name: str) -> Any:
+    # Keeps ``from src.config.config import llm`` working, building it on demand
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def create_agent(
     role: str,
     goal: str,
     backstory: str,
-    tools: Optional[Sequence[BaseTool]] = None,
+    tools: Optional[Sequence["BaseTool"]] = None,
     verbose: bool = True,
     allow_delegation: bool = False
-) -> Agent:
+) -> "Agent":
     """
     Create an agent with the configured LLM and optional tools
-    
+
     Args:
         role: The role of the agent
         goal: The agent's goal
@@ -35,11 +137,13 @@ def create_agent(
         tools: Optional sequence of tools for the agent
         verbose: Whether to enable verbose output
         allow_delegation: Whether to allow task delegation
-    
+
     Returns:
         Agent: Configured agent with the specified tools
     """
-    tool_list: List[BaseTool] = list(tools) if tools is not None else []
+    from crewai import Agent
+
+    tool_list: List["BaseTool"] = list(tools) if tools is not None else []
     return Agent(
         role=role,
         goal=goal,
@@ -47,5 +151,5 @@ def create_agent(
         tools=tool_list,
         verbose=verbose,
         allow_delegation=allow_delegation,
-        llm=llm
+        llm=get_llm()
     )
@@ -14,8 +14,14 @@ class ModelConfig:
     model_path: str
     context_length: int
     temperature: float = 0.7
-    top_p: float = 0.95
+    top_p: Optional[float] = 0.95  # None leaves it to Ollama's default
     repeat_penalty: float = 1.1
+    ollama_model: Optional[str] = None  # Ollama tag, defaults to the model type name
+
+    @property
+    def model_name(self) -> str:
+        """Name of the model as served by Ollama."""
+        return self.ollama_model or self.model_type.value
 
 # Default configurations for local models
 DEFAULT_CONFIGS = {
@@ -0,0 +1,167 @@
+"""Routing of task types to model tiers."""
+import os
+from dataclasses import replace
+from enum import Enum
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from src.config.model_config import DEFAULT_CONFIGS, ModelConfig, ModelType
+
+class ModelTier(Enum):
+    SMALL = "small"        # Fast model for templated, structured output
+    STANDARD = "standard"  # General planning and writing
+    LARGE = "large"        # Heavy reasoning: architecture, code, reviews
+
+# The crew's own llama2 settings; top_p has always been left to Ollama
+CREW_MODEL_CONFIG = replace(DEFAULT_CONFIGS[ModelType.LLAMA2], top_p=None)
+
+# Model behind each tier. Every tier runs the crew's llama2 model unless a
+# deployment opts into others with DEVCREW_TIER_<TIER>=<ollama tag>
+DEFAULT_TIER_CONFIGS = {
+    ModelTier.SMALL: CREW_MODEL_CONFIG,
+    ModelTier.STANDARD: CREW_MODEL_CONFIG,
+    ModelTier.LARGE: CREW_MODEL_CONFIG
+}
+
+# Tier of each DevTeamTasks task; tasks not listed use the default tier
+DEFAULT_TASK_TIERS = {
+    "git_workflow": ModelTier.SMALL,
+    "progress_tracking": ModelTier.SMALL,
+    "sprint_planning": ModelTier.SMALL,
+    "sprint_report": ModelTier.SMALL,
+    "test_documentation": ModelTier.SMALL,
+    "architecture_design": ModelTier.LARGE,
+    "design": ModelTier.LARGE,
+    "development": ModelTier.LARGE,
+    "code_review": ModelTier.LARGE
+}
+
+# Settings of the model types we ship configurations for, by Ollama name
+_KNOWN_CONFIGS = {model_type.value: config for model_type, config in DEFAULT_CONFIGS.items()}
+_KNOWN_CONFIGS[ModelType.LLAMA2.value] = CREW_MODEL_CONFIG
+
+class ModelRouting:
+    """
+    Maps task types to model tiers and tiers to model configurations.
+
+    Cheap structured tasks can be sent to a small, fast model and
+    reasoning-heavy tasks to a larger one; everything else uses the default
+    tier. Out of the box all tiers use the same model, so routing only changes
+    models once tiers are configured.
+    """
+
+    def __init__(
+        self,
+        tier_configs: Optional[Mapping[ModelTier, ModelConfig]] = None,
+        task_tiers: Optional[Mapping[str, ModelTier]] = None,
+        default_tier: ModelTier = ModelTier.STANDARD
+    ):
+        self.tier_configs = dict(DEFAULT_TIER_CONFIGS)
+        self.tier_configs.update(tier_configs or {})
+        self.task_tiers = dict(DEFAULT_TASK_TIERS if task_tiers is None else task_tiers)
+        self.default_tier = default_tier
+
+    @classmethod
+    def from_env(cls) -> "ModelRouting":
+        """
+        Build the routing table from environment settings.
+
+        ``DEVCREW_TIER_SMALL``, ``DEVCREW_TIER_STANDARD`` and ``DEVCREW_TIER_LARGE``
+        set the Ollama model of a tier, for example ``DEVCREW_TIER_LARGE=mistral``.
+        Tags of a known model type take its settings, such as mistral's 8192
+        token context window. ``DEVCREW_TASK_TIERS`` overrides task
+        assignments as comma-separated ``task=tier`` pairs, for example
+        ``qa=large,devops=small``. ``DEVCREW_DEFAULT_TIER`` sets the fallback tier.
+
+        Returns:
+            ModelRouting: Routing table with the overrides applied
+        """
+        tier_configs = {}
+        for tier, config in DEFAULT_TIER_CONFIGS.items():
+            model = os.getenv(f"DEVCREW_TIER_{tier.name}")
+            if model:
+                known = _KNOWN_CONFIGS.get(model.split(":", 1)[0].lower(), config)
+                tier_configs[tier] = replace(known, ollama_model=model)
+
+        task_tiers = dict(DEFAULT_TASK_TIERS)
+        for pair in os.getenv("DEVCREW_TASK_TIERS", "").split(","):
+            if "=" in pair:
+                task_name, tier = pair.split("=", 1)
+                task_tiers[task_name.strip()] = ModelTier(tier.strip().lower())
+
+        default_tier = ModelTier(os.getenv("DEVCREW_DEFAULT_TIER", ModelTier.STANDARD.value))
+        return cls(tier_configs=tier_configs, task_tiers=task_tiers, default_tier=default_tier)
+
+    def tier_for(self, task_name: Optional[str]) -> ModelTier:
+        """Tier a task is routed to."""
+        return self.task_tiers.get(task_name or "", self.default_tier)
+
+    def config_for(self, task_name: Optional[str]) -> ModelConfig:
+        """Model configuration a task is routed to."""
+        return self.tier_configs[self.tier_for(task_name)]
+
+    def tier_report(self, task_stats: Mapping[str, Mapping[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Aggregate per-task generation statistics by tier.
+
+        Args:
+            task_stats: Statistics per task, as returned by
+                ``GenerationStatsRecorder.get_all_stats``
+
+        Returns:
+            Dict mapping tier name to its model, tasks, call count, token counts,
+            mean latency per call and generation throughput
+        """
+        report: Dict[str, Dict[str, Any]] = {}
+        for task_name, entry in task_stats.items():
+            tier = self.tier_for(task_name)
+            row = report.setdefault(tier.value, {
+                "model": self.tier_configs[tier].model_name,
+                "tasks": [],
+                "calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "total_time": 0.0,
+                "generation_time": 0.0
+            })
+            row["tasks"].append(task_name)
+            for key in ("calls", "prompt_tokens", "completion_tokens", "total_time", "generation_time"):
+                row[key] += entry.get(key, 0)
+
+        for row in report.values():
+            row["avg_latency"] = row["total_time"] / row["calls"] if row["calls"] else 0.0
+            row["tokens_per_second"] = (
+                row["completion_tokens"] / row["generation_time"] if row["generation_time"] > 0 else 0.0
+            )
+        return report
+
+    def context_lengths(self, task_names: Iterable[str]) -> Dict[str, int]:
+        """Context window of the model each of the given tasks is routed to."""
+        return {name: self.config_for(name).context_length for name in task_names}
+
+def display_tier_report(report: Mapping[str, Mapping[str, Any]], console: Any = None) -> None:
+    """Print per-tier latency and token counts as a table."""
+    from rich.console import Console
+    from rich.table import Table
+
+    table = Table(title="Model Tier Report")
+    table.add_column("Tier", style="cyan")
+    table.add_column("Model")
+    table.add_column("Tasks")
+    table.add_column("Calls", justify="right")
+    table.add_column("Prompt Tokens", justify="right")
+    table.add_column("Completion Tokens", justify="right")
+    table.add_column("Avg Latency", justify="right")
+    table.add_column("Tokens/s", justify="right")
+
+    for tier, row in report.items():
+        table.add_row(
+            tier,
+            row["model"],
+            ", ".join(row["tasks"]),
+            str(row["calls"]),
+            str(row["prompt_tokens"]),
+            str(row["completion_tokens"]),
+            f"{row['avg_latency']:.2f}s",
+            f"{row['tokens_per_second']:.1f}"
+        )
+    (console or Console()).print(table)
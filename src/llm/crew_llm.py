@@ -0,0 +1,198 @@
+"""CrewAI LLM adapter that streams responses from Ollama."""
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+
+from crewai import BaseLLM
+
+from src.config.model_routing import ModelRouting
+from src.llm.ollama_client import DEFAULT_BASE_URL, OllamaClient
+from src.llm.resilience import RetryPolicy, call_with_retries
+from src.llm.streaming import (
+    GenerationStatsRecorder,
+    StreamListener,
+    scoped_listeners,
+    stream_generation
+)
+from src.utils.cancellation import current_token
+from src.utils.tracing import get_tracer
+
+DEFAULT_NUM_PREDICT = 1024  # Per-call generation budget in tokens
+DEFAULT_KEEP_ALIVE = "30m"  # Keep the model and its KV cache loaded between tasks
+FINAL_ANSWER = "Final Answer:"  # Marker crewai's agent parser looks for
+
+
+class StreamingOllamaLLM(BaseLLM):
+    """
+    Ollama-backed LLM for crewai agents that streams tokens as they are produced.
+
+    Registered listeners see every token with the name of the task that requested
+    it; listeners of a single run are added with ``listener_scope`` instead, since
+    the LLM is shared by every run in the process. Per-task time-to-first-token and tokens/sec are kept in ``stats``.
+    ``keep_alive`` is sent with every request so the model stays loaded between
+    tasks and Ollama can reuse the cached prompt prefix.
+
+    With a ``routing`` table, each call uses the model, context window and
+    sampling settings of the tier its task is routed to.
+
+    Transient failures (timeouts, unreachable or busy servers, server errors)
+    are retried according to ``retry_policy``; listeners see each failure and
+    whether the retries recovered the call. A retried stream starts over, so
+    listeners get ``on_start`` again. Calls made under a cancelled token (see
+    ``src.utils.cancellation``) stop with a TaskCancelledError.
+
+    For tasks with an ``output_json`` or ``output_pydantic`` model, the
+    model's JSON schema is sent as Ollama's ``format``, so the response is
+    exactly that JSON object. It is returned as crewai's final answer.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        base_url: str = DEFAULT_BASE_URL,
+        temperature: Optional[float] = None,
+        num_ctx: int = 4096,
+        num_thread: Optional[int] = None,
+        num_predict: int = DEFAULT_NUM_PREDICT,
+        task_num_predict: Optional[Dict[str, int]] = None,
+        keep_alive: Optional[Union[str, int]] = DEFAULT_KEEP_ALIVE,
+        routing: Optional[ModelRouting] = None,
+        client: Optional[OllamaClient] = None,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        super().__init__(model=model, temperature=temperature)
+        self.base_url = base_url
+        self.num_ctx = num_ctx
+        self.num_thread = num_thread
+        self.num_predict = num_predict
+        self.task_num_predict = dict(task_num_predict or {})
+        self.keep_alive = keep_alive
+        self.routing = routing
+        self.client = client or OllamaClient(base_url=base_url)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.stats = GenerationStatsRecorder()
+        self.listeners: List[StreamListener] = [self.stats]
+        self._listeners_lock = threading.Lock()
+
+    def add_listener(self, listener: StreamListener) -> None:
+        """Register a listener for the streaming events of every call."""
+        # Copy on write: calls streaming on other threads keep iterating the old list
+        with self._listeners_lock:
+            self.listeners = self.listeners + [listener]
+
+    def remove_listener(self, listener: StreamListener) -> None:
+        """Unregister a previously added listener."""
+        with self._listeners_lock:
+            self.listeners = [item for item in self.listeners if item is not listener]
+
+    def num_predict_for(self, task_name: Optional[str]) -> int:
+        """Generation budget for a task, falling back to the default."""
+        return self.task_num_predict.get(task_name or "", self.num_predict)
+
+    def model_for(self, task_name: Optional[str]) -> str:
+        """Model a task's requests are sent to."""
+        if self.routing is None:
+            return self.model
+        return self.routing.config_for(task_name).model_name
+
+    def num_ctx_for(self, task_name: Optional[str]) -> int:
+        """Context window used for a task's requests."""
+        if self.routing is None:
+            return self.num_ctx
+        return self.routing.config_for(task_name).context_length
+
+    def _options(self, task_name: Optional[str]) -> Dict[str, Any]:
+        options: Dict[str, Any] = {
+            "num_ctx": self.num_ctx_for(task_name),
+            "num_predict": self.num_predict_for(task_name)
+        }
+        if self.routing is not None:
+            config = self.routing.config_for(task_name)
+            options["temperature"] = config.temperature
+            if config.top_p is not None:
+                options["top_p"] = config.top_p
+            options["repeat_penalty"] = config.repeat_penalty
+        elif self.temperature is not None:
+            options["temperature"] = self.temperature
+        if self.num_thread is not None:
+            options["num_thread"] = self.num_thread
+        if self.stop:
+            options["stop"] = list(self.stop)
+        return options
+
+    def call(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        tools: Optional[List[dict]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        from_task: Optional[Any] = None,
+        from_agent: Optional[Any] = None
+    ) -> str:
+        """
+        Stream a response for the given messages and return its full text.
+
+        Raises:
+            TaskExecutionError: If the request failed and retrying did not help
+        """
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        task_name = getattr(from_task, "name", None)
+        model = self.model_for(task_name)
+        response_format = _response_format(from_task)
+        listeners = self.listeners + list(scoped_listeners())
+        attempts = 0
+
+        def attempt() -> Any:
+            nonlocal attempts
+            token = current_token()
+            if token is not None:
+                token.raise_if_cancelled()
+            attempts += 1
+            chunks = self.client.chat_stream(
+                model=model,
+                messages=messages,
+                options=self._options(task_name),
+                keep_alive=self.keep_alive,
+                format=response_format
+            )
+            return stream_generation(chunks, model, task_name, listeners)
+
+        with get_tracer().span(f"llm:{model}", "llm", task=task_name, model=model) as span:
+            try:
+                text, stats = call_with_retries(
+                    attempt, task_name, model, self.retry_policy, listeners
+                )
+            finally:
+                span.set(attempts=attempts)
+            span.set(
+                prompt_tokens=stats.prompt_tokens,
+                completion_tokens=stats.completion_tokens,
+                time_to_first_token=stats.time_to_first_token
+            )
+        if response_format is not None:
+            # Constrained output cannot carry crewai's ReAct markers
+            return f"{FINAL_ANSWER} {text.strip()}"
+        return text
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        # crewai asks without naming the task; scheduled tasks run under a
+        # cancellation token named after them
+        token = current_token()
+        return self.num_ctx_for(token.name if token is not None else None)
+
+
+def _response_format(task: Any) -> Optional[Dict[str, Any]]:
+    """JSON schema constraining a task's answer, if the task has an output model."""
+    output_model = getattr(task, "output_json", None) or getattr(task, "output_pydantic", None)
+    if output_model is None:
+        return None
+    return _json_schema(output_model)
+
+
+@lru_cache(maxsize=None)
+def _json_schema(output_model: Any) -> Dict[str, Any]:
+    return output_model.model_json_schema()
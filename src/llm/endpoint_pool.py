@@ -0,0 +1,310 @@
+"""Load-balanced pool of Ollama endpoints with health checks."""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
+
+import requests
+
+from src.llm.ollama_client import DEFAULT_BASE_URL, DEFAULT_TIMEOUT, OllamaClient, OllamaError
+from src.llm.resilience import (
+    DEFAULT_FAILURE_THRESHOLD,
+    OVERLOADED_STATUS_CODES,
+    CircuitBreaker
+)
+from src.utils.cancellation import current_token
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EJECT_SECONDS = 30.0        # How long an ejected endpoint is skipped
+DEFAULT_HEALTH_CHECK_INTERVAL = 10.0
+HEALTH_CHECK_TIMEOUT = 2.0
+LATENCY_ALPHA = 0.3                 # Weight of the newest sample in the latency EWMA
+
+# Failures that mean the endpoint itself is unreachable or stuck
+UNREACHABLE_ERRORS = (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+
+
+@dataclass
+class Endpoint:
+    """State kept for one Ollama server."""
+    url: str
+    client: OllamaClient
+    breaker: CircuitBreaker
+    in_flight: int = 0
+    latency: Optional[float] = None  # EWMA of seconds until the first chunk
+    requests: int = 0
+    failures: int = 0
+
+    def is_available(self) -> bool:
+        return self.breaker.is_available()
+
+
+class EndpointPool:
+    """
+    Routes chat requests across several Ollama servers.
+
+    Each request goes to the available endpoint with the lowest expected wait,
+    estimated as ``(in_flight + 1) * latency``. The latency is an EWMA of the
+    time to the first streamed chunk, which tracks queueing and prompt
+    evaluation without depending on how long the answer is.
+
+    Every endpoint has a circuit breaker. Endpoints that time out or refuse
+    connections are ejected at once and the request is retried elsewhere;
+    ``failure_threshold`` consecutive server errors (5xx, 429) eject an
+    overloaded endpoint too. The last available endpoint stays in service. After ``eject_seconds`` one probe request is let
+    through, and health checks bring endpoints back early.
+
+    The pool exposes ``chat_stream`` with the same signature as
+    ``OllamaClient``, so it can be passed as the client of a StreamingOllamaLLM.
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        timeout: float = DEFAULT_TIMEOUT,
+        eject_seconds: float = DEFAULT_EJECT_SECONDS,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        client_factory: Optional[Callable[[str], Any]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if not base_urls:
+            raise ValueError("At least one Ollama endpoint is required")
+        factory = client_factory or (lambda url: OllamaClient(base_url=url, timeout=timeout))
+        self.endpoints = [
+            Endpoint(
+                url=url.rstrip("/"),
+                client=factory(url),
+                breaker=CircuitBreaker(failure_threshold, eject_seconds, clock=clock)
+            )
+            for url in base_urls
+        ]
+        self.eject_seconds = eject_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls, default_url: str = DEFAULT_BASE_URL, **kwargs: Any) -> "EndpointPool":
+        """
+        Build a pool from ``OLLAMA_ENDPOINTS``, a comma-separated list of base URLs.
+
+        Args:
+            default_url: Endpoint used when the variable is not set
+            **kwargs: Passed through to the constructor
+
+        Returns:
+            EndpointPool over the configured endpoints
+        """
+        urls = [url.strip() for url in os.getenv("OLLAMA_ENDPOINTS", "").split(",") if url.strip()]
+        return cls(urls or [default_url], **kwargs)
+
+    def acquire(self) -> Endpoint:
+        """
+        Reserve the endpoint with the lowest expected wait that admits a request.
+
+        Raises:
+            OllamaError: If every endpoint is ejected or refuses the request
+        """
+        return self._acquire(exclude=())
+
+    def _acquire(self, exclude: Sequence[Endpoint], last_resort: bool = False) -> Endpoint:
+        """
+        Reserve an endpoint not in ``exclude``.
+
+        With ``last_resort``, a request every breaker refuses goes to the
+        endpoint ejected longest ago instead of failing; its outcome closes or
+        reopens that circuit.
+        """
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints
+                          if endpoint.is_available() and endpoint not in exclude]
+            known = [endpoint.latency for endpoint in candidates if endpoint.latency is not None]
+            # Endpoints without samples are assumed average so they get traffic
+            default_latency = sum(known) / len(known) if known else 1.0
+            candidates.sort(
+                key=lambda e: (e.in_flight + 1) * (e.latency if e.latency is not None
+                                                   else default_latency)
+            )
+            for endpoint in candidates:
+                # Refused when another request already holds the probe slot of
+                # a half-open circuit, or the circuit opened meanwhile
+                if endpoint.breaker.acquire():
+                    return self._reserve(endpoint)
+            remaining = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+            if last_resort and remaining:
+                return self._reserve(min(remaining, key=lambda e: e.breaker.opened_at or 0.0))
+            raise OllamaError("No healthy Ollama endpoint available")
+
+    def _reserve(self, endpoint: Endpoint) -> Endpoint:
+        """Count a request against an endpoint. Caller holds the lock."""
+        endpoint.in_flight += 1
+        endpoint.requests += 1
+        return endpoint
+
+    def release(self, endpoint: Endpoint, latency: Optional[float] = None,
+                failed: bool = False, server_error: bool = False) -> None:
+        """
+        Return an endpoint to the pool after a request.
+
+        Args:
+            endpoint: Endpoint returned by ``acquire``
+            latency: Seconds until the first chunk, if one arrived
+            failed: Whether the endpoint was unreachable or timed out; ejects it
+            server_error: Whether the server failed the request or was busy;
+                ejects it after repeated failures
+
+        The last available endpoint is never ejected: without another one to
+        take over, that would fail every request until it is probed again,
+        while a passing blip only fails the request that hit it.
+        """
+        with self._lock:
+            endpoint.in_flight = max(0, endpoint.in_flight - 1)
+            if latency is not None:
+                endpoint.latency = latency if endpoint.latency is None else (
+                    LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * endpoint.latency
+                )
+            if failed or server_error:
+                endpoint.failures += 1
+            last_available = not any(other.is_available() for other in self.endpoints
+                                     if other is not endpoint)
+        if (failed or server_error) and last_available:
+            endpoint.breaker.reset()
+        elif failed:
+            endpoint.breaker.trip()
+        elif server_error:
+            endpoint.breaker.record_failure()
+        else:
+            endpoint.breaker.record_success()
+        if not endpoint.breaker.is_available():
+            logger.warning("Ejected Ollama endpoint %s for %.0fs", endpoint.url, self.eject_seconds)
+
+    def chat_stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[Union[str, int]] = None,
+        format: Optional[Union[str, Dict[str, Any]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a chat completion from the least-loaded endpoint.
+
+        A request that fails before its first chunk is retried on the next
+        endpoint; once tokens have been streamed, failures are raised. A
+        request aborted because its task was cancelled is neither retried nor
+        held against the endpoint.
+
+        Every call reaches at least one server, even when all circuits are
+        open, so a caller retrying with backoff is not refused by the breaker
+        its own first failure opened.
+
+        Raises:
+            OllamaError: If the server rejected the request
+            requests.RequestException: If an endpoint fails mid-stream, or the
+                last endpoint left fails before its first chunk
+        """
+        tried: List[Endpoint] = []
+        last_error: Optional[BaseException] = None
+        while True:
+            try:
+                endpoint = self._acquire(exclude=tried, last_resort=not tried)
+            except OllamaError:
+                if last_error is None:
+                    raise
+                # Report why the request failed rather than that no endpoint is left
+                raise last_error from None
+            tried.append(endpoint)
+            started = self.clock()
+            latency = None
+            try:
+                for chunk in endpoint.client.chat_stream(
+                    model=model,
+                    messages=messages,
+                    options=options,
+                    keep_alive=keep_alive,
+                    format=format
+                ):
+                    if latency is None:
+                        latency = self.clock() - started
+                    yield chunk
+            except UNREACHABLE_ERRORS as exc:
+                token = current_token()
+                if token is not None and token.cancelled:
+                    # The task's own abort closed the connection; the server is fine
+                    self.release(endpoint, latency)
+                    raise
+                self.release(endpoint, latency, failed=True)
+                if latency is not None:
+                    raise
+                logger.warning("Ollama endpoint %s failed (%s), retrying", endpoint.url, exc)
+                last_error = exc
+                continue
+            except OllamaError as exc:
+                status_code = exc.status_code
+                self.release(endpoint, latency, server_error=status_code is not None and (
+                    status_code >= 500 or status_code in OVERLOADED_STATUS_CODES
+                ))
+                raise
+            except BaseException:
+                self.release(endpoint, latency)
+                raise
+            self.release(endpoint, latency)
+            return
+
+    def check_health(self) -> Dict[str, bool]:
+        """
+        Probe every endpoint's ``/api/tags`` and eject or restore it.
+
+        Returns:
+            Dict mapping endpoint URL to whether it answered
+        """
+        results = {}
+        for endpoint in self.endpoints:
+            try:
+                response = requests.get(f"{endpoint.url}/api/tags", timeout=HEALTH_CHECK_TIMEOUT)
+                healthy = response.status_code < 500
+            except requests.RequestException:
+                healthy = False
+            if healthy:
+                endpoint.breaker.reset()
+            else:
+                endpoint.breaker.trip()
+            results[endpoint.url] = healthy
+        return results
+
+    def start_health_checks(self, interval: float = DEFAULT_HEALTH_CHECK_INTERVAL) -> None:
+        """Probe endpoints periodically on a daemon thread."""
+        if self._health_thread and self._health_thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def loop() -> None:
+            while not self._stop_event.wait(interval):
+                self.check_health()
+
+        self._health_thread = threading.Thread(target=loop, name="ollama-health", daemon=True)
+        self._health_thread.start()
+
+    def stop_health_checks(self) -> None:
+        """Stop the background health checks."""
+        self._stop_event.set()
+        if self._health_thread:
+            self._health_thread.join()
+            self._health_thread = None
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Snapshot of every endpoint's load, latency and health."""
+        with self._lock:
+            return [{
+                "url": endpoint.url,
+                "healthy": endpoint.is_available(),
+                "circuit": endpoint.breaker.state.value,
+                "in_flight": endpoint.in_flight,
+                "latency": endpoint.latency,
+                "requests": endpoint.requests,
+                "failures": endpoint.failures
+            } for endpoint in self.endpoints]
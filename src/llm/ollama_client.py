@@ -0,0 +1,225 @@
+"""Minimal streaming HTTP client for the Ollama API."""
+import json
+import socket
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from src.utils.cancellation import current_token
+
+DEFAULT_BASE_URL = "http://localhost:11434"
+DEFAULT_TIMEOUT = 300.0  # seconds between streamed chunks
+MIN_TIMEOUT = 0.05  # seconds; floor of a timeout capped by a deadline
+
+
+class OllamaError(RuntimeError):
+    """Raised when the Ollama server reports an error."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        self.status_code = status_code
+        super().__init__(message)
+
+
+class OllamaClient:
+    """Thin wrapper around Ollama's streaming ``/api/chat`` endpoint."""
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        timeout: float = DEFAULT_TIMEOUT,
+        session: Optional[requests.Session] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = session or cancellable_session()
+
+    def chat_stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[Union[str, int]] = None,
+        format: Optional[Union[str, Dict[str, Any]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a chat completion.
+
+        Args:
+            model: Model name as known to Ollama
+            messages: Chat messages with ``role`` and ``content``
+            options: Model options such as ``num_ctx`` or ``num_predict``
+            keep_alive: How long the server keeps the model loaded afterwards
+            format: ``"json"`` or a JSON schema constraining the output
+
+        If the thread's cancellation token is cancelled, the connection is
+        shut down, also while the server is still loading the model or
+        evaluating the prompt (this needs a session from
+        ``cancellable_session``; other sessions can only be aborted once the
+        response headers arrived). Ollama then aborts the generation and the
+        model slot is free for the next request. The request timeout is
+        capped by the token's deadline.
+
+        Yields:
+            Decoded NDJSON chunks, the last one having ``done`` set
+
+        Raises:
+            OllamaError: If the server answers with an error status or message
+        """
+        payload: Dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "stream": True,
+            "options": options or {}
+        }
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        if format is not None:
+            payload["format"] = format
+
+        token = current_token()
+        timeout = self.timeout
+        abort = _RequestAbort()
+        detach = None
+        if token is not None:
+            remaining = token.remaining()
+            if remaining is not None:
+                timeout = max(MIN_TIMEOUT, min(timeout, remaining))
+            # Registered before sending, so a deadline during model load aborts too
+            detach = token.on_cancel(abort)
+        try:
+            reset = _request_abort.set(abort)
+            try:
+                response = self.session.post(
+                    f"{self.base_url}/api/chat",
+                    json=payload,
+                    stream=True,
+                    timeout=timeout
+                )
+            finally:
+                _request_abort.reset(reset)
+            with response:
+                abort.attach(lambda: _abort(response))
+                if response.status_code >= 400:
+                    raise OllamaError(
+                        f"Ollama returned HTTP {response.status_code}: {response.text[:200]}",
+                        status_code=response.status_code
+                    )
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise OllamaError(chunk["error"], status_code=response.status_code)
+                    yield chunk
+        finally:
+            if detach is not None:
+                detach()
+
+
+def _abort(response: requests.Response) -> None:
+    """Tear down a streaming response from another thread, waking up a blocked read."""
+    raw = response.raw
+    shutdown = getattr(raw, "shutdown", None)  # urllib3 >= 2.3
+    if shutdown is not None:
+        shutdown()
+    else:
+        response.close()
+
+
+class _RequestAbort:
+    """
+    Tears down one request from another thread.
+
+    Whatever can stop the request (its socket once connected, the response
+    once headers arrived) is attached as it becomes available; aborting
+    before that makes the attachment stop the request right away.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._closers: List[Callable[[], None]] = []
+        self.aborted = False
+
+    def attach(self, close: Callable[[], None]) -> None:
+        with self._lock:
+            self._closers.append(close)
+            aborted = self.aborted
+        if aborted:
+            close()
+
+    def __call__(self) -> None:
+        with self._lock:
+            self.aborted = True
+            closers = list(self._closers)
+        for close in closers:
+            close()
+
+
+# Abort of the request being sent on this thread, seen by its connection
+_request_abort: ContextVar[Optional[_RequestAbort]] = ContextVar("request_abort", default=None)
+
+
+def _shutdown(sock: socket.socket) -> None:
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass  # Already closed
+
+
+class _AbortableConnection:
+    """Connection mixin attaching its socket to the abort of the request using it."""
+
+    def connect(self) -> None:
+        super().connect()
+        self._attach_to_request()
+
+    def request(self, *args: Any, **kwargs: Any) -> None:
+        self._attach_to_request()  # Reused keep-alive connections are already connected
+        super().request(*args, **kwargs)
+
+    def _attach_to_request(self) -> None:
+        abort = _request_abort.get()
+        sock = self.sock
+        if abort is not None and sock is not None:
+            abort.attach(lambda: _shutdown(sock))
+
+
+class _HTTPConnection(_AbortableConnection, HTTPConnection):
+    pass
+
+
+class _HTTPSConnection(_AbortableConnection, HTTPSConnection):
+    pass
+
+
+class _HTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _HTTPConnection
+
+
+class _HTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _HTTPSConnection
+
+
+class _CancellableAdapter(HTTPAdapter):
+    """Transport whose connections can be shut down before a response arrives."""
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _HTTPConnectionPool,
+            "https": _HTTPSConnectionPool
+        }
+
+
+def cancellable_session() -> requests.Session:
+    """Session whose requests the current cancellation token can abort at any point."""
+    session = requests.Session()
+    adapter = _CancellableAdapter()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -0,0 +1,316 @@
+"""
+Failure classification, retries and circuit breaking for LLM calls.
+
+Failures of a model request are mapped onto the task error types:
+timeouts become ``TIMEOUT_ERROR``, unreachable or overloaded servers
+``RESOURCE_ERROR``, and errors reported by the model server
+``ModelExecutionError``. Transient ones are retried with jittered exponential
+backoff (``RetryPolicy``). ``CircuitBreaker`` stops requests to an endpoint
+that keeps failing until it has had time to recover; the endpoint pool keeps
+one per Ollama server. ``ErrorReporter`` logs retried failures and their
+outcome in an ``ErrorHandler``.
+"""
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Dict, Optional, Sequence, TypeVar
+
+import requests
+
+from src.llm.ollama_client import OllamaError
+from src.llm.streaming import StreamListener
+from src.utils import cancellation
+from src.utils.error_handler import ErrorHandler, TaskError
+from src.utils.error_types import (
+    ErrorCategory,
+    ErrorSeverity,
+    ModelExecutionError,
+    TaskExecutionError
+)
+
+T = TypeVar("T")
+
+DEFAULT_FAILURE_THRESHOLD = 3  # Consecutive failures that open a circuit
+DEFAULT_RESET_TIMEOUT = 30.0   # Seconds an open circuit waits before a probe
+
+# Server answers that mean "busy, try again later"
+OVERLOADED_STATUS_CODES = (429, 503)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"        # Requests flow normally
+    OPEN = "open"            # Requests are refused until the reset timeout passes
+    HALF_OPEN = "half_open"  # One probe request decides whether to close again
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker. Safe to share between threads.
+
+    Opens after ``failure_threshold`` consecutive failures, or at once on
+    ``trip``. After ``reset_timeout`` seconds a single probe is let through;
+    its success closes the circuit and its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _state(self) -> CircuitState:
+        """Current state. Caller holds the lock."""
+        if self.opened_at is None:
+            return CircuitState.CLOSED
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._state()
+
+    def is_available(self) -> bool:
+        """Whether a request would be let through, without claiming the probe."""
+        with self._lock:
+            state = self._state()
+            return state is CircuitState.CLOSED or (
+                state is CircuitState.HALF_OPEN and not self._probing
+            )
+
+    def acquire(self) -> bool:
+        """
+        Claim permission for one request.
+
+        Returns:
+            False if the circuit is open or a half-open probe is already running
+        """
+        with self._lock:
+            state = self._state()
+            if state is CircuitState.OPEN:
+                return False
+            if state is CircuitState.HALF_OPEN:
+                if self._probing:
+                    return False
+                self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        """Close the circuit after a request that reached a working server."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure; opens the circuit at the threshold or when probing."""
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._probing = False
+
+    def trip(self) -> None:
+        """Open the circuit immediately, e.g. when the server is unreachable."""
+        with self._lock:
+            self.failures = max(self.failures + 1, self.failure_threshold)
+            self.opened_at = self.clock()
+            self._probing = False
+
+    def reset(self) -> None:
+        """Close the circuit, e.g. after a successful health check."""
+        self.record_success()
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How often and how patiently failed LLM calls are retried.
+
+    Delays use "full jitter": attempt ``n`` waits a uniformly random time up to
+    ``min(max_delay, base_delay * 2 ** (n - 1))``. That spreads out retries
+    from parallel tasks, which would otherwise hit a recovering server at the
+    same moment.
+    """
+    max_attempts: int = 3
+    base_delay: float = 1.0   # seconds
+    max_delay: float = 30.0   # seconds
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        """
+        Read ``DEVCREW_LLM_MAX_ATTEMPTS``, ``DEVCREW_LLM_RETRY_BASE_DELAY`` and
+        ``DEVCREW_LLM_RETRY_MAX_DELAY``, falling back to the defaults.
+        """
+        defaults = cls()
+        return cls(
+            max_attempts=int(os.getenv("DEVCREW_LLM_MAX_ATTEMPTS", defaults.max_attempts)),
+            base_delay=float(os.getenv("DEVCREW_LLM_RETRY_BASE_DELAY", defaults.base_delay)),
+            max_delay=float(os.getenv("DEVCREW_LLM_RETRY_MAX_DELAY", defaults.max_delay))
+        )
+
+    def delay(self, attempt: int, rng: Callable[[], float] = random.random) -> float:
+        """Seconds to wait after failed attempt number ``attempt`` (1-based)."""
+        return rng() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+
+
+def classify_llm_error(
+    error: BaseException,
+    task_name: Optional[str],
+    model: str
+) -> TaskExecutionError:
+    """
+    Map a failed model request onto the task error types.
+
+    The result's ``context["retryable"]`` says whether trying again may help.
+
+    Args:
+        error: Exception raised by the client or while streaming
+        task_name: Task the request was made for
+        model: Model the request was sent to
+
+    Returns:
+        TaskExecutionError describing the failure; errors that already are
+        one are returned unchanged
+    """
+    if isinstance(error, TaskExecutionError):
+        return error
+    task = task_name or "unknown"
+    context = {"model_name": model, "error_type": type(error).__name__}
+
+    if isinstance(error, (requests.exceptions.Timeout, TimeoutError)):
+        return TaskExecutionError(
+            message=f"Model {model} timed out: {error}",
+            task_name=task,
+            severity=ErrorSeverity.MEDIUM,
+            category=ErrorCategory.TIMEOUT_ERROR,
+            context={**context, "retryable": True},
+            recovery_hint="Retry later, or raise OLLAMA_TIMEOUT for slow models"
+        )
+
+    status_code = getattr(error, "status_code", None)
+    # The endpoint pool raises a status-less OllamaError when every endpoint is down
+    unavailable = isinstance(error, OllamaError) and status_code is None
+    if (isinstance(error, requests.RequestException) or unavailable
+            or status_code in OVERLOADED_STATUS_CODES):
+        return TaskExecutionError(
+            message=f"Model server unavailable for {model}: {error}",
+            task_name=task,
+            severity=ErrorSeverity.HIGH,
+            category=ErrorCategory.RESOURCE_ERROR,
+            context={**context, "status_code": status_code, "retryable": True},
+            recovery_hint="Check that Ollama is running and not overloaded"
+        )
+
+    # 5xx means the server failed this request; 4xx (e.g. unknown model) will not improve
+    retryable = isinstance(error, OllamaError) and status_code is not None and status_code >= 500
+    classified = ModelExecutionError(
+        message=f"Model {model} failed: {error}",
+        task_name=task,
+        model_name=model,
+        prompt_info={"status_code": status_code},
+        recovery_hint="Check the model name and the Ollama server logs"
+    )
+    classified.context.update(context, retryable=retryable)
+    return classified
+
+
+def is_retryable(error: TaskExecutionError) -> bool:
+    """Whether ``classify_llm_error`` judged the failure transient."""
+    return bool(error.context.get("retryable"))
+
+
+def call_with_retries(
+    call: Callable[[], T],
+    task_name: Optional[str],
+    model: str,
+    policy: RetryPolicy,
+    listeners: Sequence[StreamListener] = (),
+    sleep: Callable[[float], None] = cancellation.sleep
+) -> T:
+    """
+    Run ``call``, retrying transient failures according to ``policy``.
+
+    Listeners are told about every failure (``on_error``) and, once a call
+    that was retried finishes, whether the retries recovered it
+    (``on_recovery``). Cancellation is never retried, and cancelling the
+    thread's token cuts a backoff sleep short.
+
+    Returns:
+        The result of the first successful attempt
+
+    Raises:
+        TaskExecutionError: The classified failure of the last attempt
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            result = call()
+        except Exception as exc:
+            error = classify_llm_error(exc, task_name, model)
+            will_retry = is_retryable(error) and attempt < policy.max_attempts
+            for listener in listeners:
+                listener.on_error(task_name, model, error, attempt, will_retry)
+            if not will_retry:
+                if attempt > 1:
+                    for listener in listeners:
+                        listener.on_recovery(task_name, model, attempt, successful=False)
+                if error is exc:
+                    raise
+                raise error from exc
+            sleep(policy.delay(attempt))
+            continue
+        if attempt > 1:
+            for listener in listeners:
+                listener.on_recovery(task_name, model, attempt, successful=True)
+        return result
+
+
+class ErrorReporter(StreamListener):
+    """Logs retried model failures in an ErrorHandler, with whether retrying recovered them."""
+
+    def __init__(self, error_handler: ErrorHandler,
+                 phase_for: Callable[[str], str] = lambda task_name: "Unknown"):
+        self.error_handler = error_handler
+        self.phase_for = phase_for
+        self._pending: Dict[str, TaskError] = {}  # Last retried error per task
+        self._lock = threading.Lock()
+
+    def on_error(self, task_name: Optional[str], model: str, error: TaskExecutionError,
+                 attempt: int, will_retry: bool) -> None:
+        # A final failure is logged by whoever handles the raised error
+        if not will_retry:
+            return
+        task = task_name or "unknown"
+        task_error = TaskError(
+            task_name=task,
+            error_message=str(error),
+            timestamp=datetime.now(),
+            phase=self.phase_for(task),
+            context={"error_type": type(error).__name__, **error.context, "attempt": attempt},
+            category=error.category
+        )
+        self.error_handler.log_error(task_error)
+        with self._lock:
+            self._pending[task] = task_error
+
+    def on_recovery(self, task_name: Optional[str], model: str, attempts: int,
+                    successful: bool) -> None:
+        with self._lock:
+            task_error = self._pending.pop(task_name or "unknown", None)
+        if task_error is not None:
+            self.error_handler.record_recovery(task_error, successful)
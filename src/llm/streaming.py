@@ -0,0 +1,238 @@
+"""Streaming generation events and statistics."""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.utils.cancellation import current_token
+
+if TYPE_CHECKING:
+    from src.utils.error_types import TaskExecutionError
+
+
+@dataclass
+class GenerationStats:
+    """Timing and token counts for a single streamed generation."""
+    model: str
+    task_name: Optional[str] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0                   # eval_count of the final chunk
+    chunk_count: int = 0                         # streamed chunks carrying text
+    time_to_first_token: Optional[float] = None  # seconds from request to first token
+    total_time: float = 0.0                      # seconds, measured client side
+    prompt_eval_time: float = 0.0                # seconds, reported by the server
+    generation_time: float = 0.0                 # seconds, reported by the server
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Generation throughput, preferring the server's own timing."""
+        elapsed = self.generation_time
+        if elapsed <= 0 and self.time_to_first_token is not None:
+            elapsed = self.total_time - self.time_to_first_token
+        if elapsed <= 0:
+            return 0.0
+        return self.completion_tokens / elapsed
+
+
+class StreamListener:
+    """Receives events while a model response is streamed. Methods are no-ops by default."""
+
+    def on_start(self, task_name: Optional[str], model: str) -> None:
+        """Called when a request is sent to the model."""
+
+    def on_token(self, task_name: Optional[str], text: str, token_count: int) -> None:
+        """
+        Called for every streamed chunk with an estimate of the tokens it carries.
+
+        Ollama streams about one token per chunk; the server's exact count
+        arrives with ``on_complete`` as ``stats.completion_tokens``.
+        """
+
+    def on_complete(self, task_name: Optional[str], stats: GenerationStats) -> None:
+        """Called once the response has been fully received."""
+
+    def on_error(self, task_name: Optional[str], model: str, error: "TaskExecutionError",
+                 attempt: int, will_retry: bool) -> None:
+        """Called when a request fails, with its classified error and whether it is retried."""
+
+    def on_recovery(self, task_name: Optional[str], model: str, attempts: int,
+                    successful: bool) -> None:
+        """Called when a retried request finally succeeds or runs out of attempts."""
+
+
+# Listeners of the run the current thread works for, see listener_scope
+_scoped_listeners: ContextVar[Tuple[StreamListener, ...]] = ContextVar(
+    "stream_listeners", default=()
+)
+
+
+@contextmanager
+def listener_scope(*listeners: StreamListener) -> Iterator[None]:
+    """
+    Add listeners to the model calls made within the enclosed block.
+
+    Unlike listeners registered on a shared LLM, scoped listeners only see
+    their own run's calls, also when several runs use the LLM at once. The
+    scheduler carries the scope over to the threads running the tasks.
+    """
+    reset = _scoped_listeners.set(_scoped_listeners.get() + listeners)
+    try:
+        yield
+    finally:
+        _scoped_listeners.reset(reset)
+
+
+def scoped_listeners() -> Tuple[StreamListener, ...]:
+    """Listeners added by the enclosing ``listener_scope`` blocks."""
+    return _scoped_listeners.get()
+
+
+def stream_generation(
+    chunks: Iterable[Dict[str, Any]],
+    model: str,
+    task_name: Optional[str] = None,
+    listeners: Sequence[StreamListener] = ()
+) -> Tuple[str, GenerationStats]:
+    """
+    Consume Ollama streaming chunks, notifying listeners as tokens arrive.
+
+    The thread's cancellation token is checked for every chunk. A cancelled
+    stream stops there, even if the connection was already torn down.
+
+    Args:
+        chunks: Decoded NDJSON objects from ``/api/chat`` or ``/api/generate``
+        model: Model name, for reporting
+        task_name: Task the generation belongs to, if known
+        listeners: Listeners to notify
+
+    Returns:
+        Tuple of the full response text and its generation statistics
+
+    Raises:
+        TaskCancelledError: If the token was cancelled, with the text received so far
+    """
+    stats = GenerationStats(model=model, task_name=task_name)
+    parts: List[str] = []
+    start = time.perf_counter()
+    token = current_token()
+
+    for listener in listeners:
+        listener.on_start(task_name, model)
+
+    try:
+        for chunk in chunks:
+            if token is not None and token.cancelled:
+                getattr(chunks, "close", lambda: None)()  # Releases the connection now
+                break
+            _consume_chunk(chunk, stats, parts, start, task_name, listeners)
+    except Exception:
+        # A listener may reject the response; stop the server generating it
+        getattr(chunks, "close", lambda: None)()
+        # An aborted connection surfaces as a read error
+        if token is not None:
+            token.raise_if_cancelled(partial_output="".join(parts))
+        raise
+    if token is not None:
+        token.raise_if_cancelled(partial_output="".join(parts))
+
+    stats.total_time = time.perf_counter() - start
+    for listener in listeners:
+        listener.on_complete(task_name, stats)
+    return "".join(parts), stats
+
+
+def _consume_chunk(
+    chunk: Dict[str, Any],
+    stats: GenerationStats,
+    parts: List[str],
+    start: float,
+    task_name: Optional[str],
+    listeners: Sequence[StreamListener]
+) -> None:
+    """Add one streamed chunk to the response text and statistics."""
+    if "message" in chunk:
+        text = chunk["message"].get("content", "")
+    else:
+        text = chunk.get("response", "")
+    if text:
+        if stats.time_to_first_token is None:
+            stats.time_to_first_token = time.perf_counter() - start
+        parts.append(text)
+        stats.chunk_count += 1
+        for listener in listeners:
+            listener.on_token(task_name, text, 1)
+    if chunk.get("done"):
+        # Final chunk carries the authoritative counts; durations are in ns
+        stats.prompt_tokens = chunk.get("prompt_eval_count", stats.prompt_tokens)
+        stats.completion_tokens = chunk.get("eval_count", stats.chunk_count)
+        stats.prompt_eval_time = chunk.get("prompt_eval_duration", 0) / 1e9
+        stats.generation_time = chunk.get("eval_duration", 0) / 1e9
+
+
+class GenerationStatsRecorder(StreamListener):
+    """
+    Aggregates generation statistics per task. Safe to share between threads.
+
+    Times are summed over calls like the token counts; ``get_task_stats`` adds
+    the mean time to first token and the throughput.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+
+    def on_complete(self, task_name: Optional[str], stats: GenerationStats) -> None:
+        key = task_name or "unknown"
+        with self._lock:
+            entry = self._tasks.setdefault(key, {
+                "calls": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "first_token_calls": 0,
+                "time_to_first_token": 0.0,
+                "last_time_to_first_token": None,
+                "total_time": 0.0,
+                "prompt_eval_time": 0.0,
+                "generation_time": 0.0
+            })
+            entry["calls"] += 1
+            entry["prompt_tokens"] += stats.prompt_tokens
+            entry["completion_tokens"] += stats.completion_tokens
+            if stats.time_to_first_token is not None:
+                entry["first_token_calls"] += 1
+                entry["time_to_first_token"] += stats.time_to_first_token
+                entry["last_time_to_first_token"] = stats.time_to_first_token
+            entry["total_time"] += stats.total_time
+            entry["prompt_eval_time"] += stats.prompt_eval_time
+            entry["generation_time"] += stats.generation_time or (
+                stats.completion_tokens / stats.tokens_per_second
+                if stats.tokens_per_second else 0.0
+            )
+
+    def get_task_stats(self, task_name: str) -> Dict[str, Any]:
+        """Get aggregated statistics for a task, including tokens per second."""
+        with self._lock:
+            entry = dict(self._tasks.get(task_name, {}))
+        if entry:
+            first_token_calls = entry["first_token_calls"]
+            entry["avg_time_to_first_token"] = (
+                entry["time_to_first_token"] / first_token_calls if first_token_calls else None
+            )
+            generation_time = entry["generation_time"]
+            entry["tokens_per_second"] = (
+                entry["completion_tokens"] / generation_time if generation_time > 0 else 0.0
+            )
+        return entry
+
+    def get_all_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get aggregated statistics for every task seen so far."""
+        with self._lock:
+            task_names = list(self._tasks)
+        return {name: self.get_task_stats(name) for name in task_names}
+
+    def reset(self) -> None:
+        """Forget all recorded statistics."""
+        with self._lock:
+            self._tasks.clear()
@@ -0,0 +1,201 @@
+"""Deterministic stand-in for an Ollama server, for offline runs and benchmarks."""
+import hashlib
+import json
+import os
+import random
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+from src.utils import cancellation
+from src.utils.context_budget import estimate_tokens
+
+# Vocabulary the filler text is drawn from
+_WORDS = (
+    "requirement design module service interface user data api test deploy "
+    "review metric plan sprint backlog component database cache queue schema "
+    "endpoint workflow release monitor security performance documentation"
+).split()
+
+# Generated tokens covered by one simulated sleep; keeps sleeps coarse
+_TOKENS_PER_SLEEP = 8
+
+
+@dataclass
+class StubSettings:
+    """Shape and speed of the simulated model."""
+    output_tokens: int = 256             # Tokens per response, capped by num_predict
+    prompt_tokens_per_second: float = 0.0  # Simulated prompt evaluation; 0 disables the delay
+    tokens_per_second: float = 0.0       # Simulated generation; 0 disables the delay
+
+    @classmethod
+    def from_env(cls) -> "StubSettings":
+        """
+        Read ``DEVCREW_STUB_OUTPUT_TOKENS``, ``DEVCREW_STUB_PROMPT_TPS`` and
+        ``DEVCREW_STUB_TPS``, falling back to the defaults.
+        """
+        defaults = cls()
+        return cls(
+            output_tokens=int(os.getenv("DEVCREW_STUB_OUTPUT_TOKENS", defaults.output_tokens)),
+            prompt_tokens_per_second=float(
+                os.getenv("DEVCREW_STUB_PROMPT_TPS", defaults.prompt_tokens_per_second)
+            ),
+            tokens_per_second=float(os.getenv("DEVCREW_STUB_TPS", defaults.tokens_per_second))
+        )
+
+
+class StubOllamaClient:
+    """
+    Offline replacement for ``OllamaClient`` with the same ``chat_stream`` API.
+
+    Responses are derived from a hash of the model and messages, so the same
+    prompt always yields the same text. They are shaped like the task: a
+    section per deliverable bullet found in the prompt, filled with filler
+    words up to the configured length. When the prompt asks for crewai's
+    ``Final Answer:`` format, the response uses it. With a ``format``, the
+    response is a JSON value shaped like the schema (or a small object for
+    plain ``"json"``), kept within ``num_predict`` when possible. Prompt evaluation and
+    generation are simulated with sleeps at the configured tokens/sec, and the
+    final chunk reports Ollama-style counts and durations. Like a real
+    server, a simulated generation stops when its task is cancelled.
+    """
+
+    def __init__(self, settings: Optional[StubSettings] = None, sleep=cancellation.sleep):
+        self.settings = settings or StubSettings()
+        self.sleep = sleep
+
+    def chat_stream(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[Union[str, int]] = None,
+        format: Optional[Union[str, Dict[str, Any]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Stream a deterministic response in Ollama's chunk format."""
+        options = options or {}
+        prompt = "\n".join(message.get("content", "") for message in messages)
+        prompt_tokens = estimate_tokens(prompt)
+        max_tokens = min(self.settings.output_tokens,
+                         options.get("num_predict") or self.settings.output_tokens)
+
+        if format is not None:
+            tokens = self._json_tokens(model, prompt, format, max_tokens)
+        else:
+            tokens = self._apply_stop(self._response_tokens(model, prompt, max_tokens),
+                                      options.get("stop") or [])
+
+        prompt_eval_time = 0.0
+        if self.settings.prompt_tokens_per_second > 0:
+            prompt_eval_time = prompt_tokens / self.settings.prompt_tokens_per_second
+            self.sleep(prompt_eval_time)
+
+        token_time = 1 / self.settings.tokens_per_second if self.settings.tokens_per_second > 0 else 0.0
+        for index, token in enumerate(tokens):
+            if token_time and index % _TOKENS_PER_SLEEP == 0:
+                self.sleep(token_time * min(_TOKENS_PER_SLEEP, len(tokens) - index))
+            yield {"model": model, "message": {"role": "assistant", "content": token}, "done": False}
+
+        yield {
+            "model": model,
+            "message": {"role": "assistant", "content": ""},
+            "done": True,
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": int(prompt_eval_time * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": int(len(tokens) * token_time * 1e9)
+        }
+
+    def _response_tokens(self, model: str, prompt: str, max_tokens: int) -> List[str]:
+        """Build the response as a list of streamed tokens."""
+        seed = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+        rng = random.Random(seed)
+        sections = _deliverables(prompt) or ["Summary"]
+
+        tokens: List[str] = []
+        if "Final Answer:" in prompt:
+            tokens += ["Thought:", " I", " now", " can", " give", " a", " great", " answer",
+                       "\n", "Final", " Answer:", "\n"]
+        per_section = max(1, (max_tokens - len(tokens)) // len(sections) - 3)
+        for section in sections:
+            if len(tokens) >= max_tokens:
+                break
+            tokens += ["\n## ", section, "\n"]
+            tokens += [" " + rng.choice(_WORDS) for _ in range(per_section)]
+        return tokens[:max_tokens]
+
+    def _json_tokens(
+        self,
+        model: str,
+        prompt: str,
+        format: Union[str, Dict[str, Any]],
+        max_tokens: int
+    ) -> List[str]:
+        """Build a JSON response matching ``format`` as a list of streamed tokens."""
+        schema = format if isinstance(format, dict) else {
+            "type": "object",
+            "properties": {"summary": {"type": "string"}, "items": {"type": "array"}}
+        }
+        tokens: List[str] = []
+        # Shorter strings until the document fits the generation budget
+        for words in (6, 3, 1):
+            seed = hashlib.sha256(f"{model}\n{prompt}".encode("utf-8")).hexdigest()
+            value = _json_value(schema, schema, random.Random(seed), words)
+            tokens = re.findall(r"\s*\S+", json.dumps(value))
+            if len(tokens) <= max_tokens:
+                break
+        return tokens[:max_tokens]
+
+    @staticmethod
+    def _apply_stop(tokens: List[str], stop: List[str]) -> List[str]:
+        """Cut the response where a stop sequence would appear."""
+        if not stop:
+            return tokens
+        window = max(len(sequence) for sequence in stop)
+        text = ""
+        for index, token in enumerate(tokens):
+            # Only the tail can contain a stop sequence completed by this token
+            text = (text + token)[-(window + len(token)):]
+            if any(sequence in text for sequence in stop):
+                return tokens[:index]
+        return tokens
+
+
+def _json_value(schema: Dict[str, Any], root: Dict[str, Any], rng: random.Random, words: int) -> Any:
+    """Deterministic value for a JSON schema, resolving local ``$ref`` definitions."""
+    if "$ref" in schema:
+        node: Any = root
+        for part in schema["$ref"].lstrip("#/").split("/"):
+            node = node[part]
+        return _json_value(node, root, rng, words)
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    kind = schema.get("type", "string")
+    if kind == "object":
+        return {
+            name: _json_value(prop, root, rng, words)
+            for name, prop in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        items = schema.get("items", {"type": "string"})
+        return [_json_value(items, root, rng, words) for _ in range(rng.randint(2, 3))]
+    if kind == "integer":
+        return rng.randint(1, 13)
+    if kind == "number":
+        return round(rng.uniform(0, 100), 1)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(max(1, words // 2), words)))
+
+
+def _deliverables(prompt: str) -> List[str]:
+    """Short section titles from the bullet lists of the prompt's task description."""
+    task_text = prompt.split("Current Task:", 1)[-1]
+    titles = []
+    for line in task_text.splitlines():
+        match = re.match(r"\s*-\s+(.+)", line)
+        if match:
+            title = match.group(1).strip()[:60]
+            if title not in titles:
+                titles.append(title)
+    return titles[:12]
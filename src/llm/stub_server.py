@@ -0,0 +1,353 @@
+"""
+Local Ollama-compatible HTTP server for load testing.
+
+Serves ``/api/chat``, ``/api/generate`` and ``/api/tags`` with the
+deterministic responses of the stub backend, over real HTTP. Latency,
+streaming cadence, error injection and a concurrency limit are configurable,
+so the client's connection handling, timeouts and queueing can be exercised
+without a model.
+
+Usage:
+    python -m src.llm.stub_server --port 11435 --latency lognormal:-2.5,0.5 \\
+        --chunk-interval 0.01 --error-rate 0.01 --max-concurrency 4
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from src.llm.stub_backend import StubOllamaClient, StubSettings
+
+DEFAULT_PORT = 11435
+
+
+@dataclass
+class LatencyDistribution:
+    """
+    Random delay before the first chunk, in seconds.
+
+    Specified as ``kind:params``: ``fixed:S``, ``uniform:LOW,HIGH``,
+    ``exponential:MEAN`` or ``lognormal:MU,SIGMA`` (of the underlying normal).
+    """
+    kind: str = "fixed"
+    params: List[float] = field(default_factory=lambda: [0.0])
+
+    @classmethod
+    def parse(cls, spec: str) -> "LatencyDistribution":
+        """
+        Parse a ``kind:params`` specification.
+
+        Raises:
+            ValueError: If the kind is unknown or has the wrong number of parameters
+        """
+        kind, _, raw = spec.partition(":")
+        params = [float(value) for value in raw.split(",") if value.strip()]
+        expected = {"fixed": 1, "uniform": 2, "exponential": 1, "lognormal": 2}
+        if expected.get(kind) != len(params):
+            raise ValueError(f"Invalid latency distribution: {spec}")
+        return cls(kind=kind, params=params)
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw one delay in seconds."""
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "exponential":
+            return rng.expovariate(1 / self.params[0]) if self.params[0] > 0 else 0.0
+        if self.kind == "lognormal":
+            return rng.lognormvariate(*self.params)
+        return self.params[0]
+
+
+@dataclass
+class StubServerConfig:
+    """Behaviour of the stub server."""
+    latency: LatencyDistribution = field(default_factory=LatencyDistribution)
+    chunk_interval: float = 0.0     # Seconds between streamed chunks
+    tokens_per_chunk: int = 1
+    output_tokens: int = 256
+    error_rate: float = 0.0         # Share of requests answered with HTTP 500
+    disconnect_rate: float = 0.0    # Share of streams cut off halfway
+    max_concurrency: int = 1        # Requests generated at once, like OLLAMA_NUM_PARALLEL
+    max_queue: int = 512            # Waiting requests before HTTP 503, like OLLAMA_MAX_QUEUE
+    seed: Optional[int] = None
+
+
+class StubServerStats:
+    """Counters kept by the server. Safe to share between handler threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.completed = 0
+        self.errors_injected = 0
+        self.disconnects_injected = 0
+        self.rejected = 0
+        self.client_disconnects = 0
+        self.active = 0
+        self.peak_active = 0
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def enter(self) -> None:
+        with self._lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+    def leave(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+    def to_dict(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "completed": self.completed,
+                "errors_injected": self.errors_injected,
+                "disconnects_injected": self.disconnects_injected,
+                "rejected": self.rejected,
+                "client_disconnects": self.client_disconnects,
+                "peak_active": self.peak_active
+            }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: "_StubHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # Keep load tests quiet
+
+    def do_GET(self) -> None:
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": "llama2"}, {"name": "mistral"}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self) -> None:
+        if self.path not in ("/api/chat", "/api/generate"):
+            self._send_json(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.server.stats.increment("requests")
+
+        if not self.server.queue_slots.acquire(blocking=False):
+            self.server.stats.increment("rejected")
+            self._send_json(503, {"error": "server busy, maximum pending requests exceeded"})
+            return
+        try:
+            with self.server.generation_slots:
+                self.server.stats.enter()
+                try:
+                    self._generate(request, chat=self.path == "/api/chat")
+                finally:
+                    self.server.stats.leave()
+        finally:
+            self.server.queue_slots.release()
+
+    def _generate(self, request: Dict[str, Any], chat: bool) -> None:
+        config = self.server.config
+        with self.server.rng_lock:
+            delay = config.latency.sample(self.server.rng)
+            fail = self.server.rng.random() < config.error_rate
+            disconnect = self.server.rng.random() < config.disconnect_rate
+
+        time.sleep(delay)
+        if fail:
+            self.server.stats.increment("errors_injected")
+            self._send_json(500, {"error": "injected failure"})
+            return
+
+        model = request.get("model", "llama2")
+        messages = request.get("messages") if chat else [
+            {"role": "user", "content": request.get("prompt", "")}
+        ]
+        chunks = list(self.server.backend.chat_stream(
+            model, messages or [], options=request.get("options"), format=request.get("format")
+        ))
+        tokens = [chunk["message"]["content"] for chunk in chunks[:-1]]
+        final = dict(chunks[-1])
+        final["prompt_eval_duration"] = int(delay * 1e9)
+
+        if not request.get("stream", True):
+            self._send_json(200, self._chunk(model, "".join(tokens), chat, final))
+            self.server.stats.increment("completed")
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        started = time.perf_counter()
+        step = max(1, config.tokens_per_chunk)
+        cutoff = len(tokens) // 2 if disconnect else None
+        for index in range(0, len(tokens), step):
+            if cutoff is not None and index >= cutoff:
+                self.server.stats.increment("disconnects_injected")
+                self.close_connection = True
+                return  # Drop the stream without the terminating chunk
+            if config.chunk_interval:
+                time.sleep(config.chunk_interval)
+            try:
+                self._write_chunk(self._chunk(model, "".join(tokens[index:index + step]), chat))
+            except (BrokenPipeError, ConnectionResetError):
+                # The client went away: stop generating, like Ollama does
+                self.server.stats.increment("client_disconnects")
+                self.close_connection = True
+                return
+
+        final["eval_duration"] = int((time.perf_counter() - started) * 1e9)
+        self._write_chunk(self._chunk(model, "", chat, final))
+        self.wfile.write(b"0\r\n\r\n")
+        self.server.stats.increment("completed")
+
+    @staticmethod
+    def _chunk(model: str, text: str, chat: bool, final: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        chunk: Dict[str, Any] = {"model": model, "done": final is not None}
+        if chat:
+            chunk["message"] = {"role": "assistant", "content": text}
+        else:
+            chunk["response"] = text
+        if final is not None:
+            for key in ("prompt_eval_count", "prompt_eval_duration", "eval_count", "eval_duration"):
+                chunk[key] = final.get(key, 0)
+        return chunk
+
+    def _write_chunk(self, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8") + b"\n"
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Any, config: StubServerConfig):
+        super().__init__(address, _StubHandler)
+        self.config = config
+        self.stats = StubServerStats()
+        self.backend = StubOllamaClient(StubSettings(output_tokens=config.output_tokens))
+        self.rng = random.Random(config.seed)
+        self.rng_lock = threading.Lock()
+        self.generation_slots = threading.BoundedSemaphore(max(1, config.max_concurrency))
+        self.queue_slots = threading.BoundedSemaphore(
+            max(1, config.max_concurrency) + max(0, config.max_queue)
+        )
+
+
+class StubServer:
+    """
+    Runs the stub server on a background thread.
+
+    Usable as a context manager; ``url`` is the base URL to point clients at.
+    """
+
+    def __init__(self, config: Optional[StubServerConfig] = None,
+                 host: str = "127.0.0.1", port: int = 0):
+        self._httpd = _StubHTTPServer((host, port), config or StubServerConfig())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self) -> StubServerStats:
+        return self._httpd.stats
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="ollama-stub", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the stub server options on a command line parser."""
+    defaults = StubServerConfig()
+    parser.add_argument("--latency", type=LatencyDistribution.parse, default=defaults.latency,
+                        help="Delay before the first chunk, e.g. fixed:0.05 or lognormal:-2.5,0.5")
+    parser.add_argument("--chunk-interval", type=float, default=defaults.chunk_interval,
+                        help="Seconds between streamed chunks")
+    parser.add_argument("--tokens-per-chunk", type=int, default=defaults.tokens_per_chunk)
+    parser.add_argument("--output-tokens", type=int, default=defaults.output_tokens)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate,
+                        help="Share of requests failed with HTTP 500")
+    parser.add_argument("--disconnect-rate", type=float, default=defaults.disconnect_rate,
+                        help="Share of streams dropped halfway")
+    parser.add_argument("--max-concurrency", type=int, default=defaults.max_concurrency,
+                        help="Requests generated in parallel")
+    parser.add_argument("--max-queue", type=int, default=defaults.max_queue,
+                        help="Waiting requests before HTTP 503")
+    parser.add_argument("--seed", type=int, help="Seed for latency and error injection")
+
+
+def config_from_args(args: argparse.Namespace) -> StubServerConfig:
+    """Build a server configuration from parsed ``add_server_arguments`` options."""
+    return StubServerConfig(
+        latency=args.latency,
+        chunk_interval=args.chunk_interval,
+        tokens_per_chunk=args.tokens_per_chunk,
+        output_tokens=args.output_tokens,
+        error_rate=args.error_rate,
+        disconnect_rate=args.disconnect_rate,
+        max_concurrency=args.max_concurrency,
+        max_queue=args.max_queue,
+        seed=args.seed
+    )
+
+
+def main(argv: Any = None) -> int:
+    parser = argparse.ArgumentParser(description="Ollama-compatible stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = StubServer(config_from_args(args), host=args.host, port=args.port)
+    print(f"Ollama stub listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,26 +1,337 @@
-from typing import List, Sequence, Any, cast
-from crewai import Crew, Task, CrewOutput, Agent
-from crewai.agent import BaseAgent
-from src.agents.agent_definitions import DevTeamAgents
-from src.tasks.task_definitions import DevTeamTasks
+import os
+from datetime import datetime
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Sequence, Union
+from src.agents.agent_definitions import DevCrewAgents
+from src.config.config import get_llm, get_model_routing
+from src.config.model_routing import display_tier_report
+from src.llm.resilience import ErrorReporter
+from src.llm.streaming import listener_scope
+from src.tasks.task_definitions import DevTeamTasks, OutputMode, PromptLayout
+from src.utils.context_budget import ContextBudgetManager
+from src.utils.checkpoint import DEFAULT_RUNS_DIR, RunCheckpoint
+from src.utils.error_handler import ErrorHandler, TaskError
+from src.utils.cancellation import CancellationToken
+from src.utils.error_types import TaskCancelledError, TaskExecutionError
+from src.utils.metrics import start_metrics_server_from_env
+from src.utils.monitor import TaskMonitor
+from src.utils.result_cache import CachedTaskRunner, TaskResultCache, resolve_cache
+from src.utils.scheduler import (
+    DEFAULT_MAX_CONCURRENCY,
+    TaskRunner,
+    execute_task,
+    kickoff_tasks,
+    task_output_from_dict,
+    task_output_to_dict
+)
+from src.utils.tracing import get_tracer, trace_file
+from src.utils.validator import StreamingValidator, TaskValidator, create_common_validation_rules
+
+if TYPE_CHECKING:
+    from crewai import CrewOutput, Task
+
+# Phase each development plan task belongs to, used when recording errors
+TASK_PHASES = {
+    "requirements_spec": "Conception",
+    "product_backlog": "Conception",
+    "project_planning": "Project Management",
+    "git_workflow": "Project Management",
+    "sprint_planning": "Project Management",
+    "progress_tracking": "Project Management",
+    "mockups": "Design",
+    "architecture_design": "Design",
+    "development": "Implementation",
+    "qa": "Implementation",
+    "devops": "Implementation",
+    "code_review": "Review and Documentation",
+    "sprint_report": "Review and Documentation",
+    "technical_documentation": "Review and Documentation",
+    "test_documentation": "Review and Documentation",
+    "user_documentation": "Review and Documentation"
+}
+
+TASK_TIMEOUT_ENV = "DEVCREW_TASK_TIMEOUT"
+RUN_TIMEOUT_ENV = "DEVCREW_RUN_TIMEOUT"
+
+def _env_seconds(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
 
 class DevCrew:
-    def __init__(self):
-        self.agents = DevTeamAgents()
-        self.tasks = DevTeamTasks()
+    def __init__(
+        self,
+        cache: Union[TaskResultCache, Literal[False], None] = None,
+        runs_dir: Optional[str] = DEFAULT_RUNS_DIR,
+        context_budget: Optional[ContextBudgetManager] = None,
+        prompt_layout: Optional[PromptLayout] = None,
+        task_timeout: Optional[float] = None,
+        run_timeout: Optional[float] = None,
+        task_timeouts: Optional[Dict[str, float]] = None,
+        output_mode: Optional[OutputMode] = None
+    ):
+        self.agents = DevCrewAgents()
+        # OutputMode.JSON: compact JSON answers; downstream tasks get only the fields they need
+        self.tasks = DevTeamTasks(prompt_layout=prompt_layout, output_mode=output_mode)
+        # cache=False turns caching off; None follows DEVCREW_CACHE_DIR
+        self.cache = resolve_cache(cache, routing=get_model_routing())
+        # Keeps injected upstream outputs inside the model's num_ctx
+        self._context_budget = context_budget
+        self.runs_dir = runs_dir  # None disables checkpointing
+        # Errors past the retention limits are spilled next to the run checkpoints
+        self.error_handler = ErrorHandler(
+            spill_path=os.path.join(runs_dir, "errors.jsonl") if runs_dir is not None else None
+        )
+        self.error_reporter = ErrorReporter(
+            self.error_handler, phase_for=lambda task_name: TASK_PHASES.get(task_name, "Unknown")
+        )
+        self.monitor = TaskMonitor()  # Per-task metrics and trace spans
+        self.validator = TaskValidator()
+        for task_type, rules in create_common_validation_rules().items():
+            for rule in rules:
+                self.validator.add_output_rule(task_type, rule)
+        # Stops degenerate generations, e.g. repetition loops, while they stream
+        self.streaming_validator = StreamingValidator(self.validator, monitor=self.monitor)
+        start_metrics_server_from_env()  # Prometheus exporter, if DEVCREW_METRICS_PORT is set
+        self.last_run_id: Optional[str] = None
         self.should_continue = True  # Flag to control execution
+        # Deadlines in seconds (DEVCREW_TASK_TIMEOUT / DEVCREW_RUN_TIMEOUT by default);
+        # task_timeouts overrides the per-task limit for individual tasks
+        self.task_timeout = task_timeout if task_timeout is not None else _env_seconds(TASK_TIMEOUT_ENV)
+        self.run_timeout = run_timeout if run_timeout is not None else _env_seconds(RUN_TIMEOUT_ENV)
+        self.task_timeouts = dict(task_timeouts or {})
+        self._cancellation: Optional[CancellationToken] = None
         self.error_log = []  # Track errors for each task
 
-    def create_development_plan(self, project_description: str) -> CrewOutput:
+    @property
+    def context_budget(self) -> ContextBudgetManager:
+        """Context budget manager, sized from the LLM when first needed."""
+        if self._context_budget is None:
+            self._context_budget = ContextBudgetManager.from_llm(get_llm())
+        return self._context_budget
+
+    def create_development_plan(
+        self,
+        project_description: str,
+        parallel: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        run_id: Optional[str] = None
+    ) -> "CrewOutput":
         """
         Creates a complete development plan going through conception, implementation, and documentation phases.
+
+        Each task's output is checkpointed under ``runs_dir`` as soon as it finishes,
+        so a failed run can be continued with ``resume``.
         
         Args:
             project_description: Initial project requirements and description
+            parallel: Run every task as soon as its context tasks are done instead
+                of following the sequential crew order
+            max_concurrency: Maximum number of tasks running at once in parallel mode
+            run_id: Optional identifier for the checkpointed run
             
         Returns:
             str: The complete development plan with all phases' outputs
         """
+        tasks = self._create_development_tasks(project_description)
+
+        checkpoint = None
+        if self.runs_dir is not None:
+            checkpoint = RunCheckpoint.create(
+                inputs={"project_description": project_description},
+                task_names=[task.name for task in tasks],
+                runs_dir=self.runs_dir,
+                run_id=run_id,
+                settings={
+                    "output_mode": self.tasks.output_mode.value,
+                    "prompt_layout": self.tasks.prompt_layout.value
+                }
+            )
+            self.last_run_id = checkpoint.run_id
+
+        return self._execute(tasks, checkpoint, parallel, max_concurrency)
+
+    def resume(
+        self,
+        run_id: str,
+        parallel: bool = False,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ) -> "CrewOutput":
+        """
+        Resume a checkpointed development plan run.
+
+        Only tasks without a stored output, and the tasks downstream of them, are
+        executed again. They are built with the output mode and prompt layout
+        the run was started with, so one plan never mixes output formats.
+
+        Args:
+            run_id: Identifier of the run to resume
+            parallel: Run ready tasks concurrently
+            max_concurrency: Maximum number of tasks running at once in parallel mode
+
+        Returns:
+            CrewOutput: The complete development plan
+        """
+        checkpoint = RunCheckpoint.load(run_id, self.runs_dir or DEFAULT_RUNS_DIR)
+        manifest = checkpoint.manifest
+        project_description = manifest["inputs"]["project_description"]
+        settings = manifest.get("settings", {})
+        self.tasks = DevTeamTasks(
+            prompt_layout=PromptLayout(settings.get("prompt_layout", self.tasks.prompt_layout.value)),
+            output_mode=OutputMode(settings.get("output_mode", self.tasks.output_mode.value))
+        )
+        tasks = self._create_development_tasks(project_description)
+        completed = {
+            task_name: task_output_from_dict(payload)
+            for task_name, payload in checkpoint.load_outputs().items()
+        }
+
+        checkpoint.mark_running()
+        self.last_run_id = run_id
+        return self._execute(tasks, checkpoint, parallel, max_concurrency, completed)
+
+    def cancel(self) -> None:
+        """
+        Stop the current run: no new tasks are started and running ones are aborted.
+
+        In-flight model requests are cut off, which frees their Ollama slots.
+        Aborted tasks are recorded as TIMEOUT_ERROR failures together with
+        their partial output, so the run can be continued with ``resume``.
+        Safe to call from another thread.
+        """
+        self.should_continue = False
+        if self._cancellation is not None:
+            self._cancellation.cancel()
+
+    def model_tier_report(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Latency and token counts of the generations so far, grouped by model tier.
+
+        Returns:
+            Dict mapping tier name to its aggregated statistics
+        """
+        return get_model_routing().tier_report(get_llm().stats.get_all_stats())
+
+    def save_trace(self, path: str) -> None:
+        """
+        Write the spans traced so far as Chrome trace-event JSON.
+
+        Tracing must be enabled, e.g. with ``DEVCREW_TRACE_FILE``; runs then
+        write their trace there automatically.
+
+        Args:
+            path: Destination file, viewable in chrome://tracing or Perfetto
+        """
+        get_tracer().save(path)
+
+    def _monitored(self, runner: TaskRunner) -> TaskRunner:
+        """Wrap a task runner so every execution is recorded by the monitor."""
+        def run(task: Any, context: str) -> Any:
+            context_tasks = task.context if isinstance(task.context, list) else []
+            self.monitor.start_task(
+                task.name,
+                model=get_llm().model_for(task.name),
+                phase=TASK_PHASES.get(task.name, "Unknown"),
+                dependencies=[dep.name for dep in context_tasks]
+            )
+            try:
+                return runner(task, context)
+            finally:
+                self.monitor.end_task(task.name)
+        return run
+
+    def _execute(
+        self,
+        tasks: List["Task"],
+        checkpoint: Optional[RunCheckpoint],
+        parallel: bool,
+        max_concurrency: int,
+        completed: Optional[Dict[str, Any]] = None
+    ) -> "CrewOutput":
+        """Run tasks through the scheduler, checkpointing and recording errors."""
+        self.should_continue = True
+        self._cancellation = CancellationToken(timeout=self.run_timeout)
+
+        def on_complete(task_name: str, output: Any) -> None:
+            if checkpoint is not None:
+                checkpoint.save_output(task_name, task_output_to_dict(output))
+                self.monitor.record_checkpoint(task_name, "checkpoint_saved")
+
+        def on_error(task_name: str, error: Exception) -> None:
+            self.should_continue = False
+            phase = TASK_PHASES.get(task_name, "Unknown")
+            category = error.category if isinstance(error, TaskExecutionError) else None
+            task_error = TaskError(
+                task_name=task_name,
+                error_message=str(error),
+                timestamp=datetime.now(),
+                phase=phase,
+                context={
+                    "run_id": checkpoint.run_id if checkpoint is not None else None,
+                    "error_type": type(error).__name__,
+                    "category": category.value if category is not None else "unknown",
+                    "reason": error.reason if isinstance(error, TaskCancelledError) else None
+                },
+                category=category
+            )
+            self.error_handler.log_error(task_error)
+            self.error_log.append(task_error)
+            self.monitor.record_error(task_name, type(error).__name__, task_error.context)
+            if checkpoint is not None:
+                checkpoint.mark_failed(task_name, str(error), phase, category=task_error.category_name)
+                if isinstance(error, TaskCancelledError) and error.partial_output:
+                    checkpoint.save_partial_output(task_name, error.partial_output)
+
+        # Agents allowed to delegate can hand work to the rest of the crew
+        runner: TaskRunner = partial(execute_task, coworkers=self.agents.get_all_agents())
+        if self.cache is not None:
+            runner = CachedTaskRunner(self.cache, runner)
+        source_text = None
+        if self.tasks.output_mode is OutputMode.JSON:
+            from src.tasks.output_schemas import structured_source_text
+            source_text = structured_source_text
+        # Without parallel mode the scheduler runs one task at a time, in crew order
+        try:
+            # Throughput alerts, retried model failures and degenerate generations
+            # of this run only; the LLM is shared by concurrent runs
+            with listener_scope(self.monitor, self.error_reporter, self.streaming_validator):
+                result = kickoff_tasks(
+                    tasks,
+                    max_concurrency=max_concurrency if parallel else 1,
+                    runner=self._monitored(runner),
+                    context_builder=self.context_budget.build_context,
+                    source_text=source_text,
+                    in_order=not parallel,
+                    completed=completed,
+                    on_complete=on_complete,
+                    on_error=on_error,
+                    should_continue=lambda: self.should_continue,
+                    cancellation=self._cancellation,
+                    task_timeout=lambda task_name: self.task_timeouts.get(task_name, self.task_timeout)
+                )
+        except TaskCancelledError as error:
+            if checkpoint is not None:
+                checkpoint.mark_cancelled(error.reason)
+            raise
+        finally:
+            self._cancellation.close()
+            path = trace_file()
+            if path is not None:
+                self.save_trace(path)
+
+        if checkpoint is not None:
+            checkpoint.mark_completed()
+        return result
+
+    def _create_development_tasks(self, project_description: str) -> List["Task"]:
+        """
+        Create all development plan tasks with their context dependencies.
+
+        Args:
+            project_description: Initial project requirements and description
+
+        Returns:
+            List[Task]: Tasks in sequential phase order
+        """
         # Conception Phase
         requirements_spec_task = self.tasks.create_requirements_specification_task(
             self.agents.product_owner,
@@ -169,42 +480,33 @@ class DevCrew:
             code_review_task
         ]
 
-        # Create the crew with ordered phases
-        crew = Crew(
-            agents=cast(List[BaseAgent], self.agents.get_all_agents()),
-            tasks=[
-                # Conception Phase
-                requirements_spec_task,
-                product_backlog_task,
-                
-                # Project Management Phase
-                project_planning_task,
-                git_workflow_task,
-                sprint_planning_task,
-                progress_tracking_task,
-                
-                # Design Phase
-                mockups_task,
-                architecture_task,
-                
-                # Implementation Phase
-                development_task,
-                qa_task,
-                devops_task,
-                
-                # Review and Documentation Phase
-                code_review_task,
-                sprint_report_task,
-                technical_docs_task,
-                test_docs_task,
-                user_docs_task
-            ],
-            verbose=True
-        )
-
-        # Start the crew's work
-        result = crew.kickoff()
-        return result
+        return [
+            # Conception Phase
+            requirements_spec_task,
+            product_backlog_task,
+
+            # Project Management Phase
+            project_planning_task,
+            git_workflow_task,
+            sprint_planning_task,
+            progress_tracking_task,
+
+            # Design Phase
+            mockups_task,
+            architecture_task,
+
+            # Implementation Phase
+            development_task,
+            qa_task,
+            devops_task,
+
+            # Review and Documentation Phase
+            code_review_task,
+            sprint_report_task,
+            technical_docs_task,
+            test_docs_task,
+            user_docs_task
+        ]
 
 
 if __name__ == "__main__":
@@ -220,3 +522,4 @@ if __name__ == "__main__":
     
     result = dev_crew.create_development_plan(project_description)
     print(result)
+    display_tier_report(dev_crew.model_tier_report())
@@ -1,21 +1,24 @@
 """Main interface for AI Development Teams."""
-from typing import Dict, Any, Optional
-from crewai import Crew
+from typing import Dict, Any, Literal, Optional, Union
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 
 from src.agents.agent_definitions import DevTeamAgents, ProjectTeamAgents
+from src.config.config import get_model_routing
 from src.tasks.task_definitions import DevTeamTasks
+from src.utils.result_cache import TaskResultCache, kickoff_crew, resolve_cache
 
 console = Console()
 
 class AIDevelopmentInterface:
     """Interface for interacting with AI development teams."""
     
-    def __init__(self):
+    def __init__(self, cache: Union[TaskResultCache, Literal[False], None] = None):
         self.dev_team = DevTeamAgents()
         self.project_team = ProjectTeamAgents()
         self.tasks = DevTeamTasks()
+        # cache=False turns caching off; None follows DEVCREW_CACHE_DIR
+        self.cache = resolve_cache(cache, routing=get_model_routing())
 
     def get_user_choice(self) -> str:
         """Get the user's choice of action."""
@@ -85,6 +88,8 @@ class AIDevelopmentInterface:
             implementation="[AWAIT DEVELOPMENT TASK]"
         )
 
+        from crewai import Crew
+
         crew = Crew(
             agents=[
                 self.dev_team.developer,
@@ -97,18 +102,24 @@ class AIDevelopmentInterface:
         )
 
         try:
-            result = crew.kickoff()
+            result = kickoff_crew(crew, self.cache)
             return str(result)
         except Exception as e:
             console.print(f"[red]Error during script generation: {str(e)}[/red]")
             return None
 
-    def plan_project(self) -> Optional[str]:
-        """Handle complete project planning using both teams."""
+    def plan_project(self, description: Optional[str] = None) -> Optional[str]:
+        """
+        Handle complete project planning using both teams.
+
+        Args:
+            description: Project description; asked for interactively when omitted
+        """
         console.print("\n[bold green]Project Planning Mode[/bold green]")
         
-        console.print("\n[yellow]Please describe your project:[/yellow]")
-        description = input("> ")
+        if description is None:
+            console.print("\n[yellow]Please describe your project:[/yellow]")
+            description = input("> ")
 
         # Create tasks for the planning phase
         requirements_task = self.tasks.create_requirements_specification_task(
@@ -153,6 +164,8 @@ class AIDevelopmentInterface:
         )
 
         # Create and run the full project crew
+        from crewai import Crew
+
         crew = Crew(
             agents=[
                 self.project_team.product_owner,
@@ -174,7 +187,7 @@ class AIDevelopmentInterface:
         )
 
         try:
-            result = crew.kickoff()
+            result = kickoff_crew(crew, self.cache)
             return str(result)
         except Exception as e:
             console.print(f"[red]Error during project planning: {str(e)}[/red]")
@@ -1,18 +1,21 @@
 """Script generator using AI development team."""
-from typing import Dict, Any
-from crewai import Crew
+from typing import Dict, Any, Literal, Union
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 
 from src.agents.agent_definitions import DevTeamAgents
+from src.config.config import get_model_routing
 from src.tasks.task_definitions import DevTeamTasks
+from src.utils.result_cache import TaskResultCache, kickoff_crew, resolve_cache
 
 console = Console()
 
 class ScriptGenerator:
-    def __init__(self):
+    def __init__(self, cache: Union[TaskResultCache, Literal[False], None] = None):
         self.agents = DevTeamAgents()
         self.tasks = DevTeamTasks()
+        # cache=False turns caching off; None follows DEVCREW_CACHE_DIR
+        self.cache = resolve_cache(cache, routing=get_model_routing())
 
     def get_user_requirements(self) -> Dict[str, Any]:
         """Get script requirements from the user."""
@@ -95,13 +98,15 @@ class ScriptGenerator:
         )
 
         # Create and run the crew
+        from crewai import Crew
+
         crew = Crew(
             agents=[self.agents.developer, self.agents.qa_engineer],
             tasks=[development_task, testing_task]
         )
 
         try:
-            result = crew.kickoff()
+            result = kickoff_crew(crew, self.cache)
             return str(result)  # Convert CrewOutput to string
         except Exception as e:
             return f"Error during script generation: {str(e)}"
@@ -0,0 +1,285 @@
+"""
+Compact JSON output schemas for the structured task mode.
+
+With ``OutputMode.JSON`` every task is created with one of these models as
+its crewai ``output_json``. ``StreamingOllamaLLM`` sends the model's JSON
+schema as Ollama's ``format``, so the answer is a small JSON object instead
+of a long Markdown document; crewai parses it once into
+``TaskOutput.json_dict``.
+``CONTEXT_FIELDS`` then decides which of those fields each downstream task
+receives, see ``structured_source_text``.
+"""
+import json
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel, ConfigDict
+
+
+class _Output(BaseModel):
+    # additionalProperties: false keeps constrained decoding to the listed fields
+    model_config = ConfigDict(extra="forbid")
+
+
+class RequirementsSpec(_Output):
+    summary: str
+    functional: List[str]
+    non_functional: List[str]
+    constraints: List[str]
+    integrations: List[str]
+
+
+class UserStory(_Output):
+    story: str
+    priority: str  # MoSCoW
+    points: int
+    acceptance_criteria: List[str]
+
+
+class ProductBacklog(_Output):
+    epics: List[str]
+    user_stories: List[UserStory]
+    dependencies: List[str]
+
+
+class ProjectPlan(_Output):
+    milestones: List[str]
+    sprints: List[str]
+    risks: List[str]
+    kpis: List[str]
+    critical_path: List[str]
+
+
+class GitWorkflow(_Output):
+    branching_strategy: str
+    branch_naming: List[str]
+    commit_format: str
+    review_checklist: List[str]
+    release_process: List[str]
+
+
+class SprintPlan(_Output):
+    sprint_goals: List[str]
+    sprint_backlog: List[str]
+    capacity: str
+    risks: List[str]
+    definition_of_done: List[str]
+
+
+class ProgressTracking(_Output):
+    metrics: List[str]
+    reports: List[str]
+    impediment_process: str
+    ceremonies: List[str]
+
+
+class Mockups(_Output):
+    screens: List[str]
+    user_flows: List[str]
+    design_guidelines: List[str]
+
+
+class Component(_Output):
+    name: str
+    responsibility: str
+
+
+class ArchitectureDesign(_Output):
+    components: List[Component]
+    interfaces: List[str]
+    data_models: List[str]
+    technology_stack: List[str]
+    deployment: str
+    security: List[str]
+
+
+class Development(_Output):
+    architecture: str
+    technology_stack: List[str]
+    code_structure: List[str]
+    implementation_steps: List[str]
+    challenges: List[str]
+
+
+class QAPlan(_Output):
+    test_scenarios: List[str]
+    integration_tests: List[str]
+    acceptance_criteria: List[str]
+    quality_metrics: List[str]
+
+
+class DevOpsPlan(_Output):
+    pipeline: List[str]
+    monitoring: List[str]
+    scaling: str
+    security_backup: List[str]
+
+
+class ReviewPoint(_Output):
+    area: str
+    finding: str
+    recommendation: str
+
+
+class CodeReview(_Output):
+    summary: str
+    feedback: List[ReviewPoint]
+    technical_debt: List[str]
+
+
+class SprintReport(_Output):
+    achievements: List[str]
+    velocity: str
+    impediments: List[str]
+    recommendations: List[str]
+
+
+class TechnicalDocumentation(_Output):
+    architecture_overview: str
+    api_endpoints: List[str]
+    setup_steps: List[str]
+    maintenance: List[str]
+
+
+class TestDocumentation(_Output):
+    strategy: str
+    test_cases: List[str]
+    results_summary: str
+    bug_process: List[str]
+
+
+class UserDocumentation(_Output):
+    quick_start: List[str]
+    features: List[str]
+    troubleshooting: List[str]
+    faq: List[str]
+
+
+class ProductRequirements(_Output):
+    features: List[str]
+    user_stories: List[str]
+    acceptance_criteria: List[str]
+    constraints: List[str]
+
+
+class DesignSpec(_Output):
+    guidelines: List[str]
+    components: List[str]
+    wireframes: List[str]
+    interactions: List[str]
+
+
+TASK_OUTPUT_SCHEMAS: Dict[str, Type[BaseModel]] = {
+    "requirements_spec": RequirementsSpec,
+    "product_backlog": ProductBacklog,
+    "project_planning": ProjectPlan,
+    "git_workflow": GitWorkflow,
+    "sprint_planning": SprintPlan,
+    "progress_tracking": ProgressTracking,
+    "mockups": Mockups,
+    "architecture_design": ArchitectureDesign,
+    "development": Development,
+    "qa": QAPlan,
+    "devops": DevOpsPlan,
+    "code_review": CodeReview,
+    "sprint_report": SprintReport,
+    "technical_documentation": TechnicalDocumentation,
+    "test_documentation": TestDocumentation,
+    "user_documentation": UserDocumentation,
+    "product_requirements": ProductRequirements,
+    "design": DesignSpec
+}
+
+# Fields each task needs from each of its context tasks; unlisted pairs get every field
+CONTEXT_FIELDS: Dict[str, Dict[str, List[str]]] = {
+    "product_backlog": {
+        "requirements_spec": ["functional", "non_functional", "constraints"]
+    },
+    "project_planning": {
+        "requirements_spec": ["summary", "constraints"],
+        "product_backlog": ["epics", "user_stories"]
+    },
+    "git_workflow": {
+        "project_planning": ["milestones"]
+    },
+    "sprint_planning": {
+        "product_backlog": ["user_stories"],
+        "project_planning": ["milestones", "sprints"]
+    },
+    "progress_tracking": {
+        "project_planning": ["milestones", "kpis"],
+        "sprint_planning": ["sprint_goals"]
+    },
+    "mockups": {
+        "requirements_spec": ["functional"],
+        "product_backlog": ["user_stories"],
+        "project_planning": ["milestones"]
+    },
+    "architecture_design": {
+        "requirements_spec": ["functional", "non_functional", "integrations"],
+        "product_backlog": ["epics"],
+        "project_planning": ["milestones"]
+    },
+    "development": {
+        "mockups": ["screens", "user_flows"],
+        "architecture_design": ["components", "interfaces", "data_models", "technology_stack"],
+        "sprint_planning": ["sprint_goals"],
+        "git_workflow": ["branching_strategy"]
+    },
+    "qa": {
+        "requirements_spec": ["functional", "non_functional"],
+        "development": ["code_structure", "implementation_steps"]
+    },
+    "devops": {
+        "development": ["architecture", "technology_stack"],
+        "git_workflow": ["branching_strategy", "release_process"]
+    },
+    "code_review": {
+        "development": ["code_structure", "challenges"],
+        "git_workflow": ["review_checklist"],
+        "requirements_spec": ["functional", "non_functional"]
+    },
+    "sprint_report": {
+        "progress_tracking": ["metrics"],
+        "code_review": ["summary", "technical_debt"],
+        "development": ["implementation_steps"],
+        "qa": ["quality_metrics"]
+    },
+    "technical_documentation": {
+        "requirements_spec": ["summary"],
+        "development": ["architecture", "code_structure", "technology_stack"],
+        "architecture_design": ["components", "interfaces"],
+        "code_review": ["summary"]
+    },
+    "test_documentation": {
+        "code_review": ["feedback"]
+    },
+    "user_documentation": {
+        "requirements_spec": ["summary", "functional"],
+        "mockups": ["screens", "user_flows"],
+        "development": ["implementation_steps"],
+        "code_review": ["summary"]
+    }
+}
+
+
+def select_fields(task_name: str, source_name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """The part of ``source_name``'s structured output that ``task_name`` needs."""
+    fields = CONTEXT_FIELDS.get(task_name, {}).get(source_name)
+    if fields is None:
+        return data
+    return {field: data[field] for field in fields if field in data}
+
+
+def structured_source_text(task: Any, source_name: str, output: Any) -> str:
+    """
+    Context text of one upstream output, for ``TaskScheduler``'s ``source_text``.
+
+    Structured outputs contribute only the fields the task needs, as compact
+    JSON. Outputs without ``json_dict`` (text mode, or an answer that did not
+    match its schema) are passed on as they are.
+    """
+    data: Optional[Dict[str, Any]] = getattr(output, "json_dict", None)
+    if not data:
+        return output.raw
+    selected = select_fields(getattr(task, "name", None) or "", source_name, data)
+    return f"{source_name}: {json.dumps(selected, ensure_ascii=False, separators=(',', ':'))}"
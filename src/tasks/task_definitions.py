@@ -1,21 +1,118 @@
-from crewai import Task
+import os
+from enum import Enum
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from crewai import Task
+
+# Indentation the original inline prompts carry; kept so INLINE prompts are unchanged
+_INDENT = "            "
+
+class PromptLayout(Enum):
+    INLINE = "inline"              # Inputs interpolated right after the task intro
+    STATIC_FIRST = "static_first"  # Instructions and deliverables first, inputs last
+
+class OutputMode(Enum):
+    TEXT = "text"  # Free-form Markdown documents
+    JSON = "json"  # Compact JSON objects, see src/tasks/output_schemas.py
+
+def get_default_prompt_layout() -> PromptLayout:
+    """Prompt layout configured through ``DEVCREW_PROMPT_LAYOUT`` (default: inline)."""
+    return PromptLayout(os.getenv("DEVCREW_PROMPT_LAYOUT", PromptLayout.INLINE.value))
+
+def get_default_output_mode() -> OutputMode:
+    """Output mode configured through ``DEVCREW_OUTPUT_MODE`` (default: text)."""
+    return OutputMode(os.getenv("DEVCREW_OUTPUT_MODE", OutputMode.TEXT.value))
 
 class DevTeamTasks:
-    @staticmethod
-    def create_project_planning_task(agent, requirements_spec, product_backlog):
+    """
+    Factory for every task the crews can run.
+
+    With ``PromptLayout.STATIC_FIRST`` each description starts with the text that
+    is identical across projects (intro, numbered instructions, deliverables)
+    and ends with the project-specific inputs. Combined with the agent persona
+    in the system prompt, consecutive requests share a long prompt prefix that
+    Ollama can reuse from its KV cache instead of evaluating it again.
+
+    With ``OutputMode.JSON`` each task gets its compact output model as
+    ``output_json``; the model is then constrained to answer with that JSON
+    object, which crewai parses into the task output's ``json_dict``.
+    """
+
+    STATIC_FIRST_EXPECTED_OUTPUT = (
+        "All deliverables listed in the task description, complete and based on its inputs."
+    )
+
+    def __init__(
+        self,
+        prompt_layout: Optional[PromptLayout] = None,
+        output_mode: Optional[OutputMode] = None
+    ):
+        self.prompt_layout = prompt_layout or get_default_prompt_layout()
+        self.output_mode = output_mode or get_default_output_mode()
+
+    def _create_task(
+        self,
+        name: str,
+        agent: Any,
+        intro: str,
+        inputs: List[Tuple[Optional[str], Any]],
+        instructions: str,
+        expected_output: str
+    ) -> "Task":
+        """Render a task's prompt in the configured layout."""
+        from crewai import Task
+
+        input_lines = [f"{label}: {value}" if label else f"{value}" for label, value in inputs]
+        structured = {}
+        if self.output_mode is OutputMode.JSON:
+            from src.tasks.output_schemas import TASK_OUTPUT_SCHEMAS
+            structured["output_json"] = TASK_OUTPUT_SCHEMAS[name]
+
+        if self.prompt_layout is PromptLayout.STATIC_FIRST:
+            lead = intro.rstrip(":")
+            lead += " the inputs listed below." if lead.endswith((" on", " for")) else \
+                " from the inputs listed below."
+            description = "\n\n".join([
+                lead,
+                _dedent(instructions),
+                "Deliverables:\n" + _dedent(expected_output.split("\n", 1)[1]),
+                "Inputs:\n" + "\n".join(input_lines)
+            ])
+            return Task(
+                name=name,
+                description=description,
+                agent=agent,
+                expected_output=self.STATIC_FIRST_EXPECTED_OUTPUT,
+                **structured
+            )
+
+        description = intro + "\n" + "".join(f"{_INDENT}{line}\n" for line in input_lines)
+        description += f"{_INDENT}\n{_INDENT}{instructions}"
         return Task(
-            description=f"""Create a comprehensive project plan based on:
-            Requirements Specification: {requirements_spec}
-            Product Backlog: {product_backlog}
-            
-            1. Define project timeline and milestones
+            name=name,
+            description=description,
+            agent=agent,
+            expected_output=expected_output,
+            **structured
+        )
+
+    def create_project_planning_task(self, agent, requirements_spec, product_backlog):
+        return self._create_task(
+            name="project_planning",
+            agent=agent,
+            intro="Create a comprehensive project plan based on:",
+            inputs=[
+                ("Requirements Specification", requirements_spec),
+                ("Product Backlog", product_backlog)
+            ],
+            instructions="""1. Define project timeline and milestones
             2. Create sprint planning and iterations
             3. Identify project risks and mitigation strategies
             4. Plan resource allocation and team capacity
             5. Define project KPIs and success metrics
             6. Create communication and reporting plan
             """,
-            agent=agent,
             expected_output="""Provide a detailed project management plan including:
             - Project timeline with major milestones
             - Sprint schedule and velocity targets
@@ -27,20 +124,21 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_sprint_planning_task(agent, product_backlog, project_plan):
-        return Task(
-            description=f"""Create detailed sprint plans based on:
-            Product Backlog: {product_backlog}
-            Project Plan: {project_plan}
-            
-            1. Define sprint goals and objectives
+    def create_sprint_planning_task(self, agent, product_backlog, project_plan):
+        return self._create_task(
+            name="sprint_planning",
+            agent=agent,
+            intro="Create detailed sprint plans based on:",
+            inputs=[
+                ("Product Backlog", product_backlog),
+                ("Project Plan", project_plan)
+            ],
+            instructions="""1. Define sprint goals and objectives
             2. Select and prioritize sprint backlog items
             3. Estimate story points and team capacity
             4. Identify sprint dependencies and risks
             5. Plan sprint ceremonies and meetings
             """,
-            agent=agent,
             expected_output="""Provide sprint planning documentation including:
             - Sprint goals and objectives
             - Prioritized sprint backlog
@@ -51,14 +149,16 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_progress_tracking_task(agent, project_plan, sprint_plan):
-        return Task(
-            description=f"""Create progress tracking and reporting framework based on:
-            Project Plan: {project_plan}
-            Sprint Plan: {sprint_plan}
-            
-            1. Define progress tracking metrics
+    def create_progress_tracking_task(self, agent, project_plan, sprint_plan):
+        return self._create_task(
+            name="progress_tracking",
+            agent=agent,
+            intro="Create progress tracking and reporting framework based on:",
+            inputs=[
+                ("Project Plan", project_plan),
+                ("Sprint Plan", sprint_plan)
+            ],
+            instructions="""1. Define progress tracking metrics
             2. Create burndown/burnup charts
             3. Set up progress reporting templates
             4. Define impediment tracking process
@@ -67,7 +167,6 @@ class DevTeamTasks:
             7. Set up automated progress notifications
             8. Define sprint demo guidelines
             """,
-            agent=agent,
             expected_output="""Provide progress tracking framework including:
             - Progress tracking metrics and KPIs
             - Burndown/burnup chart templates
@@ -81,13 +180,15 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_git_workflow_task(agent, project_plan):
-        return Task(
-            description=f"""Create Git workflow and branching strategy based on:
-            Project Plan: {project_plan}
-            
-            1. Define branching strategy (feature, develop, release, hotfix)
+    def create_git_workflow_task(self, agent, project_plan):
+        return self._create_task(
+            name="git_workflow",
+            agent=agent,
+            intro="Create Git workflow and branching strategy based on:",
+            inputs=[
+                ("Project Plan", project_plan)
+            ],
+            instructions="""1. Define branching strategy (feature, develop, release, hotfix)
             2. Set up branch protection rules
             3. Define commit message conventions
             4. Create PR templates and guidelines
@@ -95,7 +196,6 @@ class DevTeamTasks:
             6. Set up automated version tracking
             7. Define emergency hotfix procedures
             """,
-            agent=agent,
             expected_output="""Provide comprehensive Git workflow documentation including:
             - Detailed branching strategy
             - Branch naming conventions
@@ -108,14 +208,16 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_code_review_task(agent, feature_branch, requirements):
-        return Task(
-            description=f"""Perform comprehensive code review for:
-            Feature Branch: {feature_branch}
-            Requirements: {requirements}
-            
-            1. Review code quality and standards
+    def create_code_review_task(self, agent, feature_branch, requirements):
+        return self._create_task(
+            name="code_review",
+            agent=agent,
+            intro="Perform comprehensive code review for:",
+            inputs=[
+                ("Feature Branch", feature_branch),
+                ("Requirements", requirements)
+            ],
+            instructions="""1. Review code quality and standards
             2. Check test coverage and quality
             3. Verify security best practices
             4. Review documentation completeness
@@ -124,7 +226,6 @@ class DevTeamTasks:
             7. Review error handling
             8. Check for technical debt
             """,
-            agent=agent,
             expected_output="""Provide detailed code review report including:
             - Code quality assessment
             - Test coverage analysis
@@ -138,14 +239,16 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_sprint_report_task(agent, sprint_data, progress_metrics):
-        return Task(
-            description=f"""Generate comprehensive sprint report based on:
-            Sprint Data: {sprint_data}
-            Progress Metrics: {progress_metrics}
-            
-            1. Summarize sprint achievements
+    def create_sprint_report_task(self, agent, sprint_data, progress_metrics):
+        return self._create_task(
+            name="sprint_report",
+            agent=agent,
+            intro="Generate comprehensive sprint report based on:",
+            inputs=[
+                ("Sprint Data", sprint_data),
+                ("Progress Metrics", progress_metrics)
+            ],
+            instructions="""1. Summarize sprint achievements
             2. Report on completed user stories
             3. Analyze velocity and burndown
             4. List impediments and solutions
@@ -154,7 +257,6 @@ class DevTeamTasks:
             7. Document customer feedback
             8. Provide next sprint recommendations
             """,
-            agent=agent,
             expected_output="""Provide detailed sprint report including:
             - Sprint goals achievement status
             - Completed user stories and points
@@ -167,13 +269,15 @@ class DevTeamTasks:
             - Updated project timeline
             """
         )
-    @staticmethod
-    def create_requirements_specification_task(agent, project_description):
-        return Task(
-            description=f"""Create a detailed requirements specification document based on:
-            Project Description: {project_description}
-            
-            1. Analyze project objectives and scope
+    def create_requirements_specification_task(self, agent, project_description):
+        return self._create_task(
+            name="requirements_spec",
+            agent=agent,
+            intro="Create a detailed requirements specification document based on:",
+            inputs=[
+                ("Project Description", project_description)
+            ],
+            instructions="""1. Analyze project objectives and scope
             2. Define functional requirements
             3. Define non-functional requirements
             4. Define system constraints and limitations
@@ -181,7 +285,6 @@ class DevTeamTasks:
             6. Specify performance requirements
             7. Document security requirements
             """,
-            agent=agent,
             expected_output="""Provide a comprehensive Software Requirements Specification (SRS) document including:
             - Executive Summary
             - Project Scope and Objectives
@@ -195,20 +298,21 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_product_backlog_task(agent, requirements_spec):
-        return Task(
-            description=f"""Create a prioritized product backlog based on:
-            Requirements Specification: {requirements_spec}
-            
-            1. Break down requirements into user stories
+    def create_product_backlog_task(self, agent, requirements_spec):
+        return self._create_task(
+            name="product_backlog",
+            agent=agent,
+            intro="Create a prioritized product backlog based on:",
+            inputs=[
+                ("Requirements Specification", requirements_spec)
+            ],
+            instructions="""1. Break down requirements into user stories
             2. Prioritize user stories using MoSCoW method
             3. Define acceptance criteria for each story
             4. Estimate story complexity/effort
             5. Group stories into epics
             6. Define story dependencies
             """,
-            agent=agent,
             expected_output="""Provide a structured product backlog including:
             - Prioritized list of user stories
             - Story priorities (Must have, Should have, Could have, Won't have)
@@ -219,20 +323,21 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_mockups_task(agent, requirements_spec, product_backlog):
-        return Task(
-            description=f"""Create detailed mockups and prototypes based on:
-            Requirements Specification: {requirements_spec}
-            Product Backlog: {product_backlog}
-            
-            1. Design user interface mockups
+    def create_mockups_task(self, agent, requirements_spec, product_backlog):
+        return self._create_task(
+            name="mockups",
+            agent=agent,
+            intro="Create detailed mockups and prototypes based on:",
+            inputs=[
+                ("Requirements Specification", requirements_spec),
+                ("Product Backlog", product_backlog)
+            ],
+            instructions="""1. Design user interface mockups
             2. Create interactive prototypes
             3. Design user flows and interactions
             4. Create responsive design specifications
             5. Define animation and transition specs
             """,
-            agent=agent,
             expected_output="""Provide comprehensive design deliverables including:
             - UI mockups for all major screens
             - Interactive prototype specifications
@@ -243,21 +348,22 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_architecture_design_task(agent, requirements_spec, product_backlog):
-        return Task(
-            description=f"""Create detailed architecture diagrams and documentation based on:
-            Requirements Specification: {requirements_spec}
-            Product Backlog: {product_backlog}
-            
-            1. Design system architecture
+    def create_architecture_design_task(self, agent, requirements_spec, product_backlog):
+        return self._create_task(
+            name="architecture_design",
+            agent=agent,
+            intro="Create detailed architecture diagrams and documentation based on:",
+            inputs=[
+                ("Requirements Specification", requirements_spec),
+                ("Product Backlog", product_backlog)
+            ],
+            instructions="""1. Design system architecture
             2. Create component diagrams
             3. Define data models and relationships
             4. Specify API architectures
             5. Design deployment architecture
             6. Define security architecture
             """,
-            agent=agent,
             expected_output="""Provide comprehensive architecture documentation including:
             - High-level system architecture diagram
             - Component interaction diagrams
@@ -270,21 +376,22 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_technical_documentation_task(agent, requirements, implementation, design_spec):
-        return Task(
-            description=f"""Create comprehensive technical documentation based on:
-            Requirements: {requirements}
-            Implementation: {implementation}
-            Design Spec: {design_spec}
-            
-            1. Create system architecture documentation
+    def create_technical_documentation_task(self, agent, requirements, implementation, design_spec):
+        return self._create_task(
+            name="technical_documentation",
+            agent=agent,
+            intro="Create comprehensive technical documentation based on:",
+            inputs=[
+                ("Requirements", requirements),
+                ("Implementation", implementation),
+                ("Design Spec", design_spec)
+            ],
+            instructions="""1. Create system architecture documentation
             2. Document API specifications
             3. Create code documentation guidelines
             4. Document development setup instructions
             5. Create maintenance and troubleshooting guides
             """,
-            agent=agent,
             expected_output="""Provide complete technical documentation including:
             - System architecture overview and diagrams
             - API documentation with endpoints, requests, and responses
@@ -294,20 +401,21 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_test_documentation_task(agent, test_plan, test_results):
-        return Task(
-            description=f"""Create test documentation based on:
-            Test Plan: {test_plan}
-            Test Results: {test_results}
-            
-            1. Document test strategies and methodologies
+    def create_test_documentation_task(self, agent, test_plan, test_results):
+        return self._create_task(
+            name="test_documentation",
+            agent=agent,
+            intro="Create test documentation based on:",
+            inputs=[
+                ("Test Plan", test_plan),
+                ("Test Results", test_results)
+            ],
+            instructions="""1. Document test strategies and methodologies
             2. Create test case documentation
             3. Document test results and coverage
             4. Create test environment setup guides
             5. Document bug reporting procedures
             """,
-            agent=agent,
             expected_output="""Provide comprehensive test documentation including:
             - Detailed test strategies and methodologies
             - Test case documentation with scenarios
@@ -317,21 +425,22 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_user_documentation_task(agent, requirements, design_spec, implementation):
-        return Task(
-            description=f"""Create user documentation based on:
-            Requirements: {requirements}
-            Design Spec: {design_spec}
-            Implementation: {implementation}
-            
-            1. Create user manuals and guides
+    def create_user_documentation_task(self, agent, requirements, design_spec, implementation):
+        return self._create_task(
+            name="user_documentation",
+            agent=agent,
+            intro="Create user documentation based on:",
+            inputs=[
+                ("Requirements", requirements),
+                ("Design Spec", design_spec),
+                ("Implementation", implementation)
+            ],
+            instructions="""1. Create user manuals and guides
             2. Document feature usage instructions
             3. Create troubleshooting guides for users
             4. Document FAQs and common issues
             5. Create quick-start guides
             """,
-            agent=agent,
             expected_output="""Provide complete user documentation including:
             - Comprehensive user manual
             - Feature-specific guides and tutorials
@@ -340,18 +449,19 @@ class DevTeamTasks:
             - Quick-start guide for new users
             """
         )
-    @staticmethod
-    def create_product_requirements_task(agent, project_description):
-        return Task(
-            description=f"""Analyze the following project and create detailed requirements:
-            {project_description}
-            
-            1. Define the core features and functionality
+    def create_product_requirements_task(self, agent, project_description):
+        return self._create_task(
+            name="product_requirements",
+            agent=agent,
+            intro="Analyze the following project and create detailed requirements:",
+            inputs=[
+                (None, project_description)
+            ],
+            instructions="""1. Define the core features and functionality
             2. Prioritize requirements
             3. Create user stories
             4. Define acceptance criteria
             """,
-            agent=agent,
             expected_output="""Provide a detailed document containing:
             - List of core features with priorities
             - User stories in standard format
@@ -360,18 +470,19 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_design_task(agent, requirements):
-        return Task(
-            description=f"""Based on these requirements, create a design specification:
-            {requirements}
-            
-            1. Create UI/UX design guidelines
+    def create_design_task(self, agent, requirements):
+        return self._create_task(
+            name="design",
+            agent=agent,
+            intro="Based on these requirements, create a design specification:",
+            inputs=[
+                (None, requirements)
+            ],
+            instructions="""1. Create UI/UX design guidelines
             2. Define component specifications
             3. Create wireframes description
             4. Define user interactions
             """,
-            agent=agent,
             expected_output="""Provide a comprehensive design document including:
             - UI/UX guidelines (colors, typography, spacing)
             - Component specifications with descriptions
@@ -380,19 +491,20 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_development_task(agent, design_spec, requirements):
-        return Task(
-            description=f"""Implement the solution based on:
-            Requirements: {requirements}
-            Design Spec: {design_spec}
-            
-            1. Plan the technical architecture
+    def create_development_task(self, agent, design_spec, requirements):
+        return self._create_task(
+            name="development",
+            agent=agent,
+            intro="Implement the solution based on:",
+            inputs=[
+                ("Requirements", requirements),
+                ("Design Spec", design_spec)
+            ],
+            instructions="""1. Plan the technical architecture
             2. Write code implementation steps
             3. Define code structure
             4. List potential technical challenges
             """,
-            agent=agent,
             expected_output="""Provide a technical implementation plan including:
             - Detailed architecture design
             - Technology stack specifications
@@ -402,19 +514,20 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_qa_task(agent, requirements, implementation):
-        return Task(
-            description=f"""Create a testing strategy for:
-            Requirements: {requirements}
-            Implementation: {implementation}
-            
-            1. Define test scenarios
+    def create_qa_task(self, agent, requirements, implementation):
+        return self._create_task(
+            name="qa",
+            agent=agent,
+            intro="Create a testing strategy for:",
+            inputs=[
+                ("Requirements", requirements),
+                ("Implementation", implementation)
+            ],
+            instructions="""1. Define test scenarios
             2. Create test cases
             3. Plan integration tests
             4. Define acceptance testing criteria
             """,
-            agent=agent,
             expected_output="""Provide a comprehensive testing plan including:
             - Test scenarios and test cases
             - Integration testing approach
@@ -424,18 +537,19 @@ class DevTeamTasks:
             """
         )
 
-    @staticmethod
-    def create_devops_task(agent, implementation):
-        return Task(
-            description=f"""Create deployment and operations plan for:
-            Implementation: {implementation}
-            
-            1. Define deployment strategy
+    def create_devops_task(self, agent, implementation):
+        return self._create_task(
+            name="devops",
+            agent=agent,
+            intro="Create deployment and operations plan for:",
+            inputs=[
+                ("Implementation", implementation)
+            ],
+            instructions="""1. Define deployment strategy
             2. Create CI/CD pipeline plan
             3. Define monitoring strategy
             4. Plan scaling approach
             """,
-            agent=agent,
             expected_output="""Provide a complete DevOps strategy including:
             - Deployment pipeline architecture
             - CI/CD workflow specifications
@@ -444,3 +558,8 @@ class DevTeamTasks:
             - Security and backup procedures
             """
         )
+
+
+def _dedent(text: str) -> str:
+    """Strip the template indentation from every line of a prompt block."""
+    return "\n".join(line.strip() for line in text.strip().split("\n"))
@@ -0,0 +1,156 @@
+"""
+Cooperative cancellation and deadlines for runs and tasks.
+
+A ``CancellationToken`` is cancelled explicitly with ``cancel`` or when its
+deadline passes, and cancelling a token cancels its children too. The
+scheduler gives every task a child of the run's token. While the task runs,
+its token is the *current* token of the worker thread, so code deep inside
+crewai's agent loop can see it without having it passed through: the LLM
+stops at the next streamed chunk, and the Ollama client closes the HTTP
+connection, which makes the server abort the generation and free its slot.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional
+
+from src.utils.error_types import TaskCancelledError
+
+CANCELLED = "cancelled"  # Reason of an explicit cancel()
+DEADLINE = "deadline"    # Reason of a token whose deadline passed
+
+
+class CancellationToken:
+    """
+    Cancellation flag with an optional deadline. Safe to share between threads.
+
+    Callbacks registered with ``on_cancel`` run once, on the thread that
+    cancels the token (a timer thread for deadlines).
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        parent: Optional["CancellationToken"] = None,
+        name: str = "run",
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name  # Task (or run) reported in TaskCancelledError
+        self.deadline = clock() + timeout if timeout is not None else None
+        self.reason: Optional[str] = None
+        # Text of the generation that was cut off; kept for later checks, since
+        # crewai retries a failed agent step before giving up
+        self.partial_output: Optional[str] = None
+        self._clock = clock
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._detach: Optional[Callable[[], None]] = None
+        if parent is not None:
+            self._detach = parent.on_cancel(lambda: self.cancel(parent.reason or CANCELLED))
+        if timeout is not None and not self.cancelled:
+            self._timer = threading.Timer(timeout, self.cancel, args=(DEADLINE,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds until the deadline, or None without one."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - self._clock())
+
+    def cancel(self, reason: str = CANCELLED) -> None:
+        """Cancel the token and its children; later calls do nothing."""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        if self._timer is not None:
+            self._timer.cancel()
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Run ``callback`` when the token is cancelled, or now if it already is.
+
+        Returns:
+            Function that unregisters the callback
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._unregister(callback)
+        callback()
+        return lambda: None
+
+    def _unregister(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep up to ``seconds``; returns True as soon as the token is cancelled."""
+        return self._event.wait(seconds)
+
+    def raise_if_cancelled(self, partial_output: Optional[str] = None) -> None:
+        """
+        Raises:
+            TaskCancelledError: If the token has been cancelled, carrying any partial output
+        """
+        if self.cancelled:
+            if partial_output:
+                self.partial_output = partial_output
+            raise TaskCancelledError(
+                message=f"Task '{self.name}' was stopped: {self.reason}",
+                task_name=self.name,
+                reason=self.reason or CANCELLED,
+                partial_output=self.partial_output
+            )
+
+    def close(self) -> None:
+        """Stop the deadline timer and detach from the parent once the work is done."""
+        if self._timer is not None:
+            self._timer.cancel()
+        if self._detach is not None:
+            self._detach()
+
+
+_current: ContextVar[Optional[CancellationToken]] = ContextVar("cancellation_token", default=None)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Token of the task running on this thread, if any."""
+    return _current.get()
+
+
+@contextmanager
+def cancellation_scope(token: CancellationToken) -> Iterator[CancellationToken]:
+    """Make ``token`` the current token for the enclosed block."""
+    reset = _current.set(token)
+    try:
+        yield token
+    finally:
+        _current.reset(reset)
+
+
+def sleep(seconds: float) -> None:
+    """
+    ``time.sleep`` that wakes up when the current token is cancelled.
+
+    Raises:
+        TaskCancelledError: If the current token was cancelled while sleeping
+    """
+    token = current_token()
+    if token is None:
+        time.sleep(seconds)
+    elif token.wait(seconds):
+        token.raise_if_cancelled()
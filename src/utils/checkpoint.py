@@ -0,0 +1,158 @@
+"""Checkpoint storage for resumable task runs."""
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+DEFAULT_RUNS_DIR = ".devcrew_runs"
+
+
+class RunStatus:
+    RUNNING = "running"
+    FAILED = "failed"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+def _write_json_atomic(path: str, data: Dict[str, Any]) -> None:
+    """Write JSON so readers never observe a partially written file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class RunCheckpoint:
+    """
+    Persists the outputs of a single run as its tasks complete.
+
+    Layout of a run directory::
+
+        <runs_dir>/<run_id>/manifest.json      run inputs, status and failures
+        <runs_dir>/<run_id>/tasks/<task>.json  one file per finished task
+        <runs_dir>/<run_id>/partial/<task>.txt text of an aborted generation
+    """
+
+    def __init__(self, run_id: str, runs_dir: str = DEFAULT_RUNS_DIR):
+        self.run_id = run_id
+        self.run_dir = os.path.join(runs_dir, run_id)
+        self.tasks_dir = os.path.join(self.run_dir, "tasks")
+        self.partial_dir = os.path.join(self.run_dir, "partial")
+        self.manifest_path = os.path.join(self.run_dir, "manifest.json")
+
+    @classmethod
+    def create(
+        cls,
+        inputs: Dict[str, Any],
+        task_names: List[str],
+        runs_dir: str = DEFAULT_RUNS_DIR,
+        run_id: Optional[str] = None,
+        settings: Optional[Dict[str, Any]] = None
+    ) -> "RunCheckpoint":
+        """
+        Start a new run directory.
+
+        Args:
+            inputs: Everything needed to rebuild the run's tasks
+            task_names: Task identifiers in run order
+            runs_dir: Directory holding all runs
+            run_id: Optional explicit identifier, generated when omitted
+            settings: How the tasks were built (e.g. output mode), restored on resume
+
+        Returns:
+            RunCheckpoint: Checkpoint for the new run
+        """
+        run_id = run_id or f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        checkpoint = cls(run_id, runs_dir)
+        os.makedirs(checkpoint.tasks_dir, exist_ok=True)
+        _write_json_atomic(checkpoint.manifest_path, {
+            "run_id": run_id,
+            "created_at": datetime.now().isoformat(),
+            "inputs": inputs,
+            "settings": settings or {},
+            "tasks": task_names,
+            "status": RunStatus.RUNNING,
+            "failures": {}
+        })
+        return checkpoint
+
+    @classmethod
+    def load(cls, run_id: str, runs_dir: str = DEFAULT_RUNS_DIR) -> "RunCheckpoint":
+        """Open an existing run, raising FileNotFoundError if it does not exist."""
+        checkpoint = cls(run_id, runs_dir)
+        if not os.path.exists(checkpoint.manifest_path):
+            raise FileNotFoundError(f"No checkpointed run '{run_id}' in {runs_dir}")
+        return checkpoint
+
+    @property
+    def manifest(self) -> Dict[str, Any]:
+        """Read the run manifest."""
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _update_manifest(self, **changes: Any) -> None:
+        manifest = self.manifest
+        manifest.update(changes)
+        _write_json_atomic(self.manifest_path, manifest)
+
+    def save_output(self, task_name: str, payload: Dict[str, Any]) -> None:
+        """Persist a finished task's output."""
+        _write_json_atomic(os.path.join(self.tasks_dir, f"{task_name}.json"), payload)
+
+    def load_outputs(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load every persisted task output.
+
+        Unreadable files are skipped so the task simply runs again.
+        """
+        outputs = {}
+        for task_name in self.manifest["tasks"]:
+            path = os.path.join(self.tasks_dir, f"{task_name}.json")
+            try:
+                with open(path, encoding="utf-8") as f:
+                    outputs[task_name] = json.load(f)
+            except (OSError, ValueError):
+                continue
+        return outputs
+
+    def mark_running(self) -> None:
+        """Flag the run as (re)started."""
+        self._update_manifest(status=RunStatus.RUNNING)
+
+    def save_partial_output(self, task_name: str, text: str) -> None:
+        """Keep what a cancelled task generated; it still runs again on resume."""
+        os.makedirs(self.partial_dir, exist_ok=True)
+        path = os.path.join(self.partial_dir, f"{task_name}.txt")
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(f"{path}.tmp", path)
+
+    def load_partial_output(self, task_name: str) -> Optional[str]:
+        """Text saved with ``save_partial_output``, if any."""
+        try:
+            with open(os.path.join(self.partial_dir, f"{task_name}.txt"), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def mark_failed(self, task_name: str, error: str, phase: str,
+                    category: Optional[str] = None) -> None:
+        """Record a task failure in the manifest."""
+        manifest = self.manifest
+        manifest["failures"][task_name] = {
+            "error": error,
+            "phase": phase,
+            "category": category,
+            "timestamp": datetime.now().isoformat()
+        }
+        manifest["status"] = RunStatus.FAILED
+        _write_json_atomic(self.manifest_path, manifest)
+
+    def mark_cancelled(self, reason: str) -> None:
+        """Flag the run as stopped by ``DevCrew.cancel`` or a deadline; it can be resumed."""
+        self._update_manifest(status=RunStatus.CANCELLED, cancel_reason=reason)
+
+    def mark_completed(self) -> None:
+        """Flag the run as finished."""
+        self._update_manifest(status=RunStatus.COMPLETED, completed_at=datetime.now().isoformat())
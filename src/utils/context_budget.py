@@ -0,0 +1,237 @@
+"""Token budgeting for the upstream context injected into task prompts."""
+import hashlib
+import logging
+import math
+import re
+import threading
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tokens taken by crewai's prompt template around role, task and context
+PROMPT_OVERHEAD_TOKENS = 350
+# Never squeeze the context below this, even if the fixed prompt is large
+MIN_CONTEXT_TOKENS = 256
+CHARS_PER_TOKEN = 3.5  # Conservative for llama-family tokenizers on English text
+
+TRUNCATION_MARKER = "\n[...truncated]"
+
+Summarizer = Callable[[str, int], str]
+TokenCounter = Callable[[str], int]
+
+
+class CompactionPolicy(Enum):
+    TRUNCATE = "truncate"    # Keep the beginning of each over-budget source
+    SUMMARIZE = "summarize"  # Summarize over-budget sources once and reuse the summary
+    RELEVANT = "relevant"    # Keep the chunks most related to the task description
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without loading a tokenizer."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def allocate_budget(sizes: Sequence[int], budget: int) -> List[int]:
+    """
+    Split a token budget across sources using max-min fairness.
+
+    Sources smaller than an equal share keep everything; what they leave unused
+    is redistributed among the larger ones.
+
+    Args:
+        sizes: Token count of each source
+        budget: Total tokens available
+
+    Returns:
+        Token allowance for each source, in the same order
+    """
+    allocation = [0] * len(sizes)
+    remaining = budget
+    open_sources = sorted(range(len(sizes)), key=lambda i: sizes[i])
+    while open_sources:
+        share = remaining // len(open_sources)
+        index = open_sources[0]
+        if sizes[index] <= share:
+            allocation[index] = sizes[index]
+            remaining -= sizes[index]
+            open_sources.pop(0)
+        else:
+            for index in open_sources:
+                allocation[index] = share
+            break
+    return allocation
+
+
+def _terms(text: str) -> List[str]:
+    return [term for term in re.findall(r"[a-z0-9]+", text.lower()) if len(term) > 3]
+
+
+class ContextBudgetManager:
+    """
+    Keeps task prompts inside the model's context window.
+
+    Before a task is dispatched, the fixed part of its prompt (agent persona,
+    description, expected output and template overhead) and its generation
+    budget are subtracted from ``num_ctx``. The rest is split across the
+    upstream outputs, and sources over their allowance are compacted with the
+    configured policy.
+    """
+
+    def __init__(
+        self,
+        num_ctx: int = 4096,
+        num_predict: int = 1024,
+        task_num_predict: Optional[Dict[str, int]] = None,
+        task_num_ctx: Optional[Dict[str, int]] = None,
+        policy: CompactionPolicy = CompactionPolicy.RELEVANT,
+        summarizer: Optional[Summarizer] = None,
+        token_counter: TokenCounter = estimate_tokens,
+        divider: str = "\n\n----------\n\n"
+    ):
+        if policy is CompactionPolicy.SUMMARIZE and summarizer is None:
+            raise ValueError("The summarize policy requires a summarizer")
+        self.num_ctx = num_ctx
+        self.num_predict = num_predict
+        self.task_num_predict = dict(task_num_predict or {})
+        self.task_num_ctx = dict(task_num_ctx or {})
+        self.policy = policy
+        self.summarizer = summarizer
+        self.count_tokens = token_counter
+        self.divider = divider
+        self.tokens_saved: Dict[str, int] = {}
+        self._summaries: Dict[Tuple[str, int], str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_llm(cls, llm: Any, **kwargs: Any) -> "ContextBudgetManager":
+        """Take the context windows and generation budgets from a StreamingOllamaLLM."""
+        routing = getattr(llm, "routing", None)
+        return cls(
+            num_ctx=llm.num_ctx_for(None),
+            num_predict=llm.num_predict,
+            task_num_predict=llm.task_num_predict,
+            task_num_ctx=routing.context_lengths(routing.task_tiers) if routing else None,
+            **kwargs
+        )
+
+    def context_budget(self, task: Any) -> int:
+        """Tokens left for upstream context once the fixed prompt is accounted for."""
+        agent = getattr(task, "agent", None)
+        fixed_text = " ".join(filter(None, [
+            getattr(agent, "role", ""),
+            getattr(agent, "goal", ""),
+            getattr(agent, "backstory", ""),
+            getattr(task, "description", ""),
+            getattr(task, "expected_output", "")
+        ]))
+        task_name = getattr(task, "name", None) or ""
+        reserve = self.task_num_predict.get(task_name, self.num_predict)
+        num_ctx = self.task_num_ctx.get(task_name, self.num_ctx)
+        available = num_ctx - reserve - PROMPT_OVERHEAD_TOKENS - self.count_tokens(fixed_text)
+        return max(available, MIN_CONTEXT_TOKENS)
+
+    def build_context(self, task: Any, sources: List[Tuple[str, str]]) -> str:
+        """
+        Assemble a task's context from upstream outputs within its token budget.
+
+        Args:
+            task: Task about to be dispatched
+            sources: ``(task_id, output_text)`` pairs of its context tasks
+
+        Returns:
+            str: Context text to pass to the task
+        """
+        if not sources:
+            return ""
+        task_name = getattr(task, "name", None) or "unknown"
+        divider_tokens = self.count_tokens(self.divider) * (len(sources) - 1)
+        budget = self.context_budget(task) - divider_tokens
+        sizes = [self.count_tokens(text) for _, text in sources]
+
+        if sum(sizes) <= budget:
+            return self.divider.join(text for _, text in sources)
+
+        allowances = allocate_budget(sizes, budget)
+        parts = [
+            text if size <= allowance else self._compact(text, allowance, task)
+            for (_, text), size, allowance in zip(sources, sizes, allowances)
+        ]
+        context = self.divider.join(parts)
+
+        saved = sum(sizes) - sum(self.count_tokens(part) for part in parts)
+        with self._lock:
+            self.tokens_saved[task_name] = self.tokens_saved.get(task_name, 0) + saved
+        logger.info(
+            "Context for %s compacted with %s policy: %d -> %d tokens (saved %d)",
+            task_name, self.policy.value, sum(sizes), sum(sizes) - saved, saved
+        )
+        return context
+
+    def _compact(self, text: str, max_tokens: int, task: Any) -> str:
+        if self.policy is CompactionPolicy.SUMMARIZE:
+            compacted = self._summarize(text, max_tokens)
+        elif self.policy is CompactionPolicy.RELEVANT:
+            compacted = self._select_relevant(text, max_tokens, getattr(task, "description", ""))
+        else:
+            compacted = text
+        return self._truncate(compacted, max_tokens)
+
+    def _truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text down to ``max_tokens``, marking that it was shortened."""
+        if self.count_tokens(text) <= max_tokens:
+            return text
+        marker_tokens = self.count_tokens(TRUNCATION_MARKER)
+        max_chars = max(0, int((max_tokens - marker_tokens) * CHARS_PER_TOKEN))
+        cut = text[:max_chars]
+        while cut and self.count_tokens(cut) + marker_tokens > max_tokens:
+            cut = cut[:int(len(cut) * 0.9)]
+        return cut + TRUNCATION_MARKER
+
+    def _summarize(self, text: str, max_tokens: int) -> str:
+        """Summarize once per distinct source and allowance, reusing the result."""
+        key = (hashlib.sha256(text.encode("utf-8")).hexdigest(), max_tokens)
+        with self._lock:
+            cached = self._summaries.get(key)
+        if cached is not None:
+            return cached
+        summary = self.summarizer(text, max_tokens)
+        with self._lock:
+            self._summaries[key] = summary
+        return summary
+
+    def _select_relevant(self, text: str, max_tokens: int, query: str) -> str:
+        """Keep the paragraphs sharing the most terms with the query, in original order."""
+        chunks = [chunk for chunk in re.split(r"\n\s*\n", text) if chunk.strip()]
+        query_terms = set(_terms(query))
+        scored = []
+        for index, chunk in enumerate(chunks):
+            terms = _terms(chunk)
+            overlap = sum(1 for term in terms if term in query_terms)
+            # Favour dense matches and, on ties, earlier chunks
+            scored.append((overlap / math.sqrt(len(terms) + 1), -index, index))
+
+        selected, used = [], 0
+        for _, _, index in sorted(scored, reverse=True):
+            cost = self.count_tokens(chunks[index]) + 1
+            if used + cost <= max_tokens:
+                selected.append(index)
+                used += cost
+        if not selected:
+            return chunks[0] if chunks else ""
+        return "\n\n".join(chunks[index] for index in sorted(selected))
+
+
+def llm_summarizer(llm: Any) -> Summarizer:
+    """Build a summarizer that asks an LLM to condense a source to a token target."""
+    def summarize(text: str, max_tokens: int) -> str:
+        words = int(max_tokens * 0.7)
+        return llm.call([{
+            "role": "user",
+            "content": (
+                f"Summarize the following document in at most {words} words. "
+                "Keep every requirement, decision, name and number that later "
+                f"work may depend on.\n\n{text}"
+            )
+        }])
+    return summarize
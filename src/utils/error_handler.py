@@ -1,71 +1,253 @@
 """Error handling utilities for the AI Crew system."""
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Optional, Dict, Any
+import json
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from src.utils.error_types import ErrorCategory
+from src.utils.metrics_core import ShardedCounter
+
+DEFAULT_MAX_ERRORS = 10_000
+UNKNOWN_CATEGORY = "unknown"
+
+# One lock per spill file, shared by every handler writing to it (the
+# DevCrews of a batch all spill to their runs dir's errors.jsonl)
+_spill_locks: Dict[str, threading.Lock] = {}
+_spill_locks_guard = threading.Lock()
+
+def _spill_lock(path: str) -> threading.Lock:
+    """Lock serialising access to the spill file at ``path``."""
+    key = os.path.abspath(path)
+    with _spill_locks_guard:
+        return _spill_locks.setdefault(key, threading.Lock())
 
-@dataclass
 class TaskError:
-    task_name: str
-    error_message: str
-    timestamp: datetime
-    phase: str
-    context: Optional[Dict[str, Any]] = None
-    recovery_attempted: bool = False
+    """A task failure as recorded by the ErrorHandler."""
+
+    __slots__ = (
+        "task_name", "error_message", "timestamp", "phase", "context",
+        "recovery_attempted", "category"
+    )
+
+    def __init__(
+        self,
+        task_name: str,
+        error_message: str,
+        timestamp: datetime,
+        phase: str,
+        context: Optional[Dict[str, Any]] = None,
+        recovery_attempted: bool = False,
+        category: Optional[ErrorCategory] = None
+    ):
+        self.task_name = task_name
+        self.error_message = error_message
+        self.timestamp = timestamp
+        self.phase = phase
+        self.context = context
+        self.recovery_attempted = recovery_attempted
+        self.category = category
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TaskError):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"TaskError({fields})"
+
+    @property
+    def category_name(self) -> str:
+        return self.category.value if self.category is not None else UNKNOWN_CATEGORY
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable form, as written to the spill file."""
+        return {
+            "task_name": self.task_name,
+            "error_message": self.error_message,
+            "timestamp": self.timestamp.isoformat(),
+            "phase": self.phase,
+            "context": self.context,
+            "recovery_attempted": self.recovery_attempted,
+            "category": self.category.value if self.category is not None else None
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any]) -> "TaskError":
+        """Rebuild an error from ``to_dict`` data."""
+        category = payload.get("category")
+        return cls(
+            task_name=payload["task_name"],
+            error_message=payload["error_message"],
+            timestamp=datetime.fromisoformat(payload["timestamp"]),
+            phase=payload["phase"],
+            context=payload.get("context"),
+            recovery_attempted=payload.get("recovery_attempted", False),
+            category=ErrorCategory(category) if category else None
+        )
 
 class ErrorHandler:
-    def __init__(self):
-        self.errors = []
+    """
+    Collects task errors and runs recovery strategies. Safe to share between threads.
+
+    Errors are indexed by task name, phase and category when they are logged,
+    and running counts back the summary, so lookups and summaries never scan
+    the whole history. Retention is bounded by ``max_entries`` and, optionally,
+    ``max_age``. Errors that fall out are appended to ``spill_path`` as JSON
+    lines when one is set, and can be read back with ``iter_spilled``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ERRORS,
+        max_age: Optional[timedelta] = None,
+        spill_path: Optional[str] = None,
+        clock: Callable[[], datetime] = datetime.now
+    ):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.spill_path = spill_path
+        self._clock = clock
+        self.errors: Deque[TaskError] = deque()
+        self._by_task: Dict[str, Deque[TaskError]] = {}
+        self._by_phase: Dict[str, Deque[TaskError]] = {}
+        self._by_category: Dict[str, Deque[TaskError]] = {}
         self.recovery_strategies = {}
+        self.counts = ShardedCounter()
+        self._lock = threading.Lock()
+
+    def _indexes(self, error: TaskError) -> List[Deque[TaskError]]:
+        return [
+            self._by_task.setdefault(error.task_name, deque()),
+            self._by_phase.setdefault(error.phase, deque()),
+            self._by_category.setdefault(error.category_name, deque())
+        ]
 
     def log_error(self, task_error: TaskError) -> None:
         """Log a task error with context."""
-        self.errors.append(task_error)
+        with self._lock:
+            self.errors.append(task_error)
+            for index in self._indexes(task_error):
+                index.append(task_error)
+            evicted = self._evict()
+        self.counts.inc("total")
+        self.counts.inc(("phase", task_error.phase))
+        self.counts.inc(("category", task_error.category_name))
+        self._spill(evicted)
+
+    def _evict(self) -> List[TaskError]:
+        """Drop errors beyond the retention limits. Caller holds the lock."""
+        evicted = []
+        cutoff = self._clock() - self.max_age if self.max_age is not None else None
+        while self.errors and (
+            len(self.errors) > self.max_entries
+            or (cutoff is not None and self.errors[0].timestamp < cutoff)
+        ):
+            error = self.errors.popleft()
+            # Indexes hold errors in logging order, so the oldest is at the front
+            for index in self._indexes(error):
+                if index and index[0] is error:
+                    index.popleft()
+            evicted.append(error)
+        return evicted
+
+    def _spill(self, errors: List[TaskError]) -> None:
+        if not errors or self.spill_path is None:
+            return
+        directory = os.path.dirname(self.spill_path)
+        lines = "".join(json.dumps(error.to_dict(), default=str) + "\n" for error in errors)
+        with _spill_lock(self.spill_path):
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def expire(self) -> None:
+        """Apply the age limit now rather than on the next logged error."""
+        with self._lock:
+            evicted = self._evict()
+        self._spill(evicted)
+
+    def iter_spilled(self) -> Iterator[TaskError]:
+        """Errors previously spilled to disk, oldest first."""
+        if self.spill_path is None or not os.path.exists(self.spill_path):
+            return
+        with _spill_lock(self.spill_path), open(self.spill_path, encoding="utf-8") as f:
+            lines = f.readlines()
+        for line in lines:
+            if line.strip():
+                yield TaskError.from_dict(json.loads(line))
 
     def get_task_errors(self, task_name: str) -> list[TaskError]:
-        """Get all errors for a specific task."""
-        return [error for error in self.errors if error.task_name == task_name]
+        """Get the retained errors of a specific task."""
+        with self._lock:
+            return list(self._by_task.get(task_name, ()))
+
+    def get_phase_errors(self, phase: str) -> list[TaskError]:
+        """Get the retained errors of a phase."""
+        with self._lock:
+            return list(self._by_phase.get(phase, ()))
+
+    def get_category_errors(self, category: Optional[ErrorCategory]) -> list[TaskError]:
+        """Get the retained errors of a category; None returns uncategorised errors."""
+        key = category.value if category is not None else UNKNOWN_CATEGORY
+        with self._lock:
+            return list(self._by_category.get(key, ()))
 
     def add_recovery_strategy(self, task_name: str, strategy_func) -> None:
         """Register a recovery strategy for a specific task."""
-        self.recovery_strategies[task_name] = strategy_func
+        with self._lock:
+            self.recovery_strategies[task_name] = strategy_func
 
     def attempt_recovery(self, task_name: str, error: TaskError) -> bool:
         """Attempt to recover from a task error."""
-        if task_name in self.recovery_strategies and not error.recovery_attempted:
-            try:
-                self.recovery_strategies[task_name](error)
-                error.recovery_attempted = True
-                return True
-            except Exception as e:
-                error.context = error.context or {}
-                error.context['recovery_error'] = str(e)
+        with self._lock:
+            strategy = self.recovery_strategies.get(task_name)
+            if strategy is None or error.recovery_attempted:
                 return False
-        return False
+            # Claimed under the lock so concurrent callers recover an error only once
+            error.recovery_attempted = True
+        try:
+            strategy(error)
+            self.record_recovery(error, successful=True)
+            return True
+        except Exception as e:
+            error.recovery_attempted = False  # A failed recovery may be retried
+            error.context = error.context or {}
+            error.context['recovery_error'] = str(e)
+            return False
+
+    def record_recovery(self, error: TaskError, successful: bool) -> None:
+        """Record the outcome of a recovery made elsewhere, e.g. by retrying a model call."""
+        error.recovery_attempted = True
+        if successful:
+            self.counts.inc("recovered")
 
     def get_error_summary(self) -> dict:
-        """Get a summary of all errors encountered."""
+        """
+        Get a summary of all errors encountered, including those no longer retained.
+
+        Built from running counts, so its cost does not depend on how many
+        errors were logged. Use ``get_phase_errors`` for the errors themselves.
+        """
+        counts = self.counts.totals()
         return {
-            'total_errors': len(self.errors),
-            'errors_by_phase': self._group_errors_by_phase(),
-            'recovery_attempts': self._count_recovery_attempts()
+            'total_errors': int(counts.get("total", 0)),
+            'retained_errors': len(self.errors),
+            'errors_by_phase': self._group_counts(counts, "phase"),
+            'errors_by_category': self._group_counts(counts, "category"),
+            'recovery_attempts': {
+                'attempted': int(counts.get("recovered", 0)),
+                'total': int(counts.get("total", 0))
+            }
         }
 
-    def _group_errors_by_phase(self) -> dict:
-        """Group errors by their phase."""
-        phases = {}
-        for error in self.errors:
-            if error.phase not in phases:
-                phases[error.phase] = []
-            phases[error.phase].append({
-                'task': error.task_name,
-                'message': error.error_message,
-                'timestamp': error.timestamp.isoformat()
-            })
-        return phases
-
-    def _count_recovery_attempts(self) -> dict:
-        """Count successful and failed recovery attempts."""
+    @staticmethod
+    def _group_counts(counts: Dict[Any, float], kind: str) -> Dict[str, int]:
+        """Error counts of one kind of key, e.g. per phase."""
         return {
-            'attempted': len([e for e in self.errors if e.recovery_attempted]),
-            'total': len(self.errors)
+            key[1]: int(count) for key, count in counts.items()
+            if isinstance(key, tuple) and key[0] == kind
         }
@@ -100,3 +100,32 @@ class ContextError(TaskExecutionError):
             context={"missing_dependencies": missing_dependencies},
             recovery_hint=recovery_hint
         )
+
+class TaskCancelledError(TaskExecutionError):
+    """Raised when a task is cancelled or runs past its deadline."""
+    
+    def __init__(
+        self,
+        message: str,
+        task_name: str,
+        reason: str,
+        partial_output: Optional[str] = None,
+        severity: ErrorSeverity = ErrorSeverity.MEDIUM,
+        recovery_hint: Optional[str] = "Resume the run to execute the task again"
+    ):
+        super().__init__(
+            message=message,
+            task_name=task_name,
+            severity=severity,
+            category=ErrorCategory.TIMEOUT_ERROR,
+            context={"reason": reason, "partial_output": partial_output},
+            recovery_hint=recovery_hint
+        )
+
+    @property
+    def reason(self) -> str:
+        return self.context["reason"]
+
+    @property
+    def partial_output(self) -> Optional[str]:
+        return self.context["partial_output"]
@@ -0,0 +1,359 @@
+"""
+Prometheus metrics for task execution and LLM throughput.
+
+Counters, gauges and histograms are recorded into per-thread cells (see
+``metrics_core``): a writer only ever touches its own thread's cell, so
+increments on the hot path take no lock. A scrape sums the cells, and values
+are never recomputed from task history. ``MetricsServer`` serves the registry
+in the Prometheus text format on a local port. ``DEVCREW_METRICS_PORT``
+starts it for DevCrew runs.
+
+Ratios such as recovery and validation pass rates are exported as
+outcome-labelled counters, to be divided in PromQL.
+"""
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.llm.streaming import GenerationStats, StreamListener
+from src.utils.metrics_core import ThreadCells
+
+METRICS_PORT_ENV = "DEVCREW_METRICS_PORT"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; tasks range from quick summaries to long generations on CPU
+TASK_DURATION_BUCKETS = (1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1200.0)
+TIME_TO_FIRST_TOKEN_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Metric:
+    """Base for labelled metric families."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: Any) -> Any:
+        """Child metric for one combination of label values."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> Any:
+        raise NotImplementedError
+
+    def _samples(self, labels: Tuple[str, ...], child: Any) -> Iterator[str]:
+        raise NotImplementedError
+
+    def collect(self) -> Iterator[str]:
+        """Exposition lines for this metric family."""
+        yield f"# HELP {self.name} {_escape(self.documentation)}"
+        yield f"# TYPE {self.name} {self.kind}"
+        with self._lock:
+            children = sorted(self._children.items())
+        for labels, child in children:
+            yield from self._samples(labels, child)
+
+
+class _CounterChild:
+    __slots__ = ("_cells",)
+
+    def __init__(self):
+        self._cells = ThreadCells(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._cells.cell()[0] += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._cells.cell()[0] -= amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. errors or tokens."""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment an unlabelled counter."""
+        self.labels().inc(amount)
+
+    def _samples(self, labels: Tuple[str, ...], child: _CounterChild) -> Iterator[str]:
+        yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(child.value)}"
+
+
+class Gauge(Counter):
+    """Value that goes up and down, e.g. tasks in flight. Only additive updates are supported."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement an unlabelled gauge."""
+        self.labels().dec(amount)
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_cells")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # One slot per bucket (not cumulative), then +Inf, sum and count
+        self._cells = ThreadCells(len(bounds) + 3)
+
+    def observe(self, value: float) -> None:
+        cell = self._cells.cell()
+        index = 0
+        for bound in self._bounds:
+            if value <= bound:
+                break
+            index += 1
+        cell[index] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        """Cumulative bucket counts (ending with +Inf), sum and count."""
+        totals = self._cells.totals()
+        cumulative, running = [], 0.0
+        for count in totals[:-2]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-2], totals[-1]
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = TASK_DURATION_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Record a value in an unlabelled histogram."""
+        self.labels().observe(value)
+
+    def _samples(self, labels: Tuple[str, ...], child: _HistogramChild) -> Iterator[str]:
+        cumulative, total, count = child.snapshot()
+        names = self.labelnames + ("le",)
+        for bound, value in zip(self.buckets + (float("inf"),), cumulative):
+            label_text = _format_labels(names, labels + (_format_value(bound),))
+            yield f"{self.name}_bucket{label_text} {_format_value(value)}"
+        label_text = _format_labels(self.labelnames, labels)
+        yield f"{self.name}_sum{label_text} {_format_value(total)}"
+        yield f"{self.name}_count{label_text} {_format_value(count)}"
+
+
+class MetricsRegistry:
+    """Ordered collection of metric families rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> Any:
+        """Add a metric family and return it."""
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = [line for metric in metrics for line in metric.collect()]
+        return "\n".join(lines) + "\n"
+
+
+class DevCrewMetrics:
+    """The metric families recorded by TaskMonitor and the streaming LLM."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        register = self.registry.register
+        self.task_duration = register(Histogram(
+            "devcrew_task_duration_seconds", "Wall time of finished tasks",
+            ("task",), TASK_DURATION_BUCKETS
+        ))
+        self.tasks_in_flight = register(Gauge(
+            "devcrew_tasks_in_flight", "Tasks currently executing"
+        ))
+        self.task_errors = register(Counter(
+            "devcrew_task_errors_total", "Task errors by error category",
+            ("task", "category")
+        ))
+        self.recoveries = register(Counter(
+            "devcrew_task_recoveries_total", "Recovery attempts by outcome",
+            ("task", "outcome")
+        ))
+        self.validations = register(Counter(
+            "devcrew_task_validations_total", "Validation attempts by result",
+            ("task", "result")
+        ))
+        self.llm_tokens = register(Counter(
+            "devcrew_llm_tokens_total", "Tokens processed by the model",
+            ("model", "kind")
+        ))
+        self.llm_generation_seconds = register(Counter(
+            "devcrew_llm_generation_seconds_total",
+            "Time spent generating completion tokens; divide tokens by it for throughput",
+            ("model",)
+        ))
+        self.llm_time_to_first_token = register(Histogram(
+            "devcrew_llm_time_to_first_token_seconds", "Latency until the first streamed token",
+            ("model",), TIME_TO_FIRST_TOKEN_BUCKETS
+        ))
+        self.llm_listener = MetricsListener(self)
+
+    def render(self) -> str:
+        return self.registry.render()
+
+
+class MetricsListener(StreamListener):
+    """Records token counts and generation timing of every streamed response."""
+
+    def __init__(self, metrics: DevCrewMetrics):
+        self.metrics = metrics
+
+    def on_complete(self, task_name: Optional[str], stats: GenerationStats) -> None:
+        metrics = self.metrics
+        metrics.llm_tokens.labels(stats.model, "prompt").inc(stats.prompt_tokens)
+        metrics.llm_tokens.labels(stats.model, "completion").inc(stats.completion_tokens)
+        generation_time = stats.generation_time
+        if generation_time <= 0 and stats.time_to_first_token is not None:
+            generation_time = stats.total_time - stats.time_to_first_token
+        metrics.llm_generation_seconds.labels(stats.model).inc(max(0.0, generation_time))
+        if stats.time_to_first_token is not None:
+            metrics.llm_time_to_first_token.labels(stats.model).observe(stats.time_to_first_token)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    server: "_MetricsHTTPServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.metrics.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _MetricsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Any, metrics: DevCrewMetrics):
+        super().__init__(address, _MetricsHandler)
+        self.metrics = metrics
+
+
+class MetricsServer:
+    """Serves ``/metrics`` on a background thread. Usable as a context manager."""
+
+    def __init__(self, metrics: DevCrewMetrics, host: str = "127.0.0.1", port: int = 0):
+        self._httpd = _MetricsHTTPServer((host, port), metrics)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="metrics-exporter", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MetricsServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+
+_metrics: Optional[DevCrewMetrics] = None
+_server: Optional[MetricsServer] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> DevCrewMetrics:
+    """The process-wide metrics, created on first use."""
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = DevCrewMetrics()
+        return _metrics
+
+
+def start_metrics_server_from_env() -> Optional[MetricsServer]:
+    """
+    Start the exporter once if ``DEVCREW_METRICS_PORT`` is set.
+
+    Returns:
+        The running server, or None when no port is configured
+    """
+    global _server
+    port = os.getenv(METRICS_PORT_ENV)
+    if not port:
+        return None
+    metrics = get_metrics()
+    with _metrics_lock:
+        if _server is None:
+            host = os.getenv("DEVCREW_METRICS_HOST", "127.0.0.1")
+            _server = MetricsServer(metrics, host=host, port=int(port)).start()
+        return _server
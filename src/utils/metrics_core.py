@@ -0,0 +1,132 @@
+"""
+Thread-safe counters for metrics recorded from many threads at once.
+
+Every thread writes only to its own shard, so recording takes no lock and
+never loses an increment to a race. Reads merge the shards. Shards of
+threads that have exited are folded into a retired total on the next read
+or when another thread registers its shard, which keeps memory bounded when
+worker threads come and go, also in a process whose metrics are never read.
+
+``ThreadCells`` holds a fixed-size vector per thread and backs the Prometheus
+metric types. ``ShardedCounter`` holds counts keyed by arbitrary hashable
+keys, such as ``(task_name, "errors")``. TaskMonitor, ErrorHandler and
+ProgressManager all use it.
+"""
+import threading
+from typing import Dict, Hashable, List, Tuple
+
+
+class ThreadCells:
+    """Fixed-size vector of values sharded by thread and summed on read."""
+
+    __slots__ = ("_size", "_local", "_cells", "_retired", "_lock")
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._cells: List[Tuple[threading.Thread, List[float]]] = []
+        self._retired = [0.0] * size
+        self._lock = threading.Lock()
+
+    def cell(self) -> List[float]:
+        """The calling thread's cell; only that thread may write to it."""
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = [0.0] * self._size
+            with self._lock:
+                self._retire_dead_cells()
+                self._cells.append((threading.current_thread(), cell))
+            self._local.cell = cell
+            return cell
+
+    def _retire_dead_cells(self) -> None:
+        """Fold cells of exited threads into the retired totals. Caller holds the lock."""
+        live = []
+        for thread, cell in self._cells:
+            if thread.is_alive():
+                live.append((thread, cell))
+            else:
+                for index, value in enumerate(cell):
+                    self._retired[index] += value
+        self._cells = live
+
+    def totals(self) -> List[float]:
+        """Sum of every thread's cell."""
+        with self._lock:
+            self._retire_dead_cells()
+            live = list(self._cells)
+            totals = list(self._retired)
+        for _, cell in live:
+            for index, value in enumerate(cell):
+                totals[index] += value
+        return totals
+
+
+class ShardedCounter:
+    """
+    Counts keyed by hashable keys, sharded by thread and merged on read.
+
+    ``inc`` touches only the calling thread's dict. The lock is only taken the
+    first time a thread records, and by readers.
+    """
+
+    __slots__ = ("_local", "_shards", "_retired", "_lock")
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[Hashable, float]]] = []
+        self._retired: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[Hashable, float]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Dict[Hashable, float] = {}
+            with self._lock:
+                self._retire_dead_shards()
+                self._shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+            return shard
+
+    def inc(self, key: Hashable, amount: float = 1) -> None:
+        """Add ``amount`` to ``key``."""
+        shard = self._shard()
+        shard[key] = shard.get(key, 0) + amount
+
+    def _retire_dead_shards(self) -> None:
+        """Fold shards of exited threads into the retired totals. Caller holds the lock."""
+        live = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+            else:
+                for key, value in shard.items():
+                    self._retired[key] = self._retired.get(key, 0) + value
+        self._shards = live
+
+    def value(self, key: Hashable) -> float:
+        """Merged count of one key."""
+        with self._lock:
+            self._retire_dead_shards()
+            return self._retired.get(key, 0) + sum(shard.get(key, 0) for _, shard in self._shards)
+
+    def totals(self) -> Dict[Hashable, float]:
+        """Merged counts of every key."""
+        with self._lock:
+            self._retire_dead_shards()
+            merged = dict(self._retired)
+            # dict.copy() is atomic, so a shard can be read while its thread writes
+            snapshots = [shard.copy() for _, shard in self._shards]
+        for snapshot in snapshots:
+            for key, value in snapshot.items():
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def clear(self) -> None:
+        """Reset every count. Increments racing with the reset may survive it."""
+        with self._lock:
+            self._retired.clear()
+            for _, shard in self._shards:
+                shard.clear()
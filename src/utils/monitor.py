@@ -1,30 +1,129 @@
 """Monitoring system for task execution and error patterns."""
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
-from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass
 from enum import Enum
 
+from src.llm.streaming import GenerationStats, StreamListener
+from src.utils.cancellation import CancellationToken, current_token
+from src.utils.metrics import DevCrewMetrics, get_metrics
+from src.utils.error_types import TaskExecutionError
+from src.utils.metrics_core import ShardedCounter
+from src.utils.stats import LatencySketch, SlidingWindow
+from src.utils.tracing import Span, Tracer, get_tracer
+
 class MetricType(Enum):
-    DURATION = "duration"
+    DURATION = "duration"  # Alerts on a task's p99 duration, in seconds
     ERROR_COUNT = "error_count"
     SUCCESS_RATE = "success_rate"
     RECOVERY_RATE = "recovery_rate"
     VALIDATION_RATE = "validation_rate"
+    THROUGHPUT = "throughput"  # Generated tokens per second, see ThroughputSLO
 
 @dataclass
+class LatencySLO:
+    """
+    Objective on task duration, e.g. p95 of ``architecture_design`` at most 120s.
+
+    Evaluated over a sliding window of the latest executions of each matching
+    task, optionally limited to those finished in the last ``window_seconds``.
+    """
+    threshold: float                      # Seconds
+    task_name: Optional[str] = None       # None applies to every task separately
+    percentile: float = 95.0
+    window_size: int = 20
+    window_seconds: Optional[float] = None
+    min_samples: int = 1                  # Observations needed before alerting
+
+    @property
+    def name(self) -> str:
+        return f"p{self.percentile:g}_duration:{self.task_name or '*'}"
+
+    def matches(self, task_name: str, model: Optional[str]) -> Optional[str]:
+        """Window key for an observation, or None if the objective does not apply."""
+        return task_name if self.task_name in (None, task_name) else None
+
+@dataclass
+class ThroughputSLO:
+    """
+    Objective on generation speed: a model's tokens/sec must stay above a floor.
+
+    Throughput is total tokens over total generation time across a sliding
+    window of the model's latest responses, so one slow response on a degraded
+    node is enough to alert when ``window_size`` is small.
+    """
+    min_tokens_per_second: float
+    model: Optional[str] = None           # None applies to every model separately
+    window_size: int = 10
+    window_seconds: Optional[float] = None
+    min_samples: int = 1
+
+    @property
+    def name(self) -> str:
+        return f"throughput:{self.model or '*'}"
+
+    def matches(self, task_name: Optional[str], model: str) -> Optional[str]:
+        """Window key for an observation, or None if the objective does not apply."""
+        return model if self.model in (None, model) else None
+
+AlertHandler = Callable[[Dict[str, Any]], None]
+
 class TaskMetrics:
-    """Metrics for a specific task."""
-    task_name: str
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
-    error_count: int = 0
-    recovery_attempts: int = 0
-    successful_recoveries: int = 0
-    validation_attempts: int = 0
-    validation_passes: int = 0
-    checkpoint_times: Dict[str, datetime] = field(default_factory=dict)
-    error_patterns: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    """
+    Metrics for a specific task.
+
+    Counts are kept in a ShardedCounter so any thread can record them without
+    losing increments; the count attributes read the merged values.
+    """
+
+    __slots__ = ("task_name", "model", "start_time", "end_time", "checkpoint_times", "counters")
+
+    def __init__(
+        self,
+        task_name: str,
+        model: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ):
+        self.task_name = task_name
+        self.model = model
+        self.start_time = start_time
+        self.end_time = end_time
+        self.checkpoint_times: Dict[str, datetime] = {}
+        self.counters = ShardedCounter()
+
+    @property
+    def error_count(self) -> int:
+        return int(self.counters.value("errors"))
+
+    @property
+    def recovery_attempts(self) -> int:
+        return int(self.counters.value("recovery_attempts"))
+
+    @property
+    def successful_recoveries(self) -> int:
+        return int(self.counters.value("successful_recoveries"))
+
+    @property
+    def validation_attempts(self) -> int:
+        return int(self.counters.value("validation_attempts"))
+
+    @property
+    def validation_passes(self) -> int:
+        return int(self.counters.value("validation_passes"))
+
+    @property
+    def validation_aborts(self) -> int:
+        return int(self.counters.value("validation_aborts"))
+
+    @property
+    def error_patterns(self) -> Dict[str, int]:
+        """Error count per error type."""
+        return {
+            key[1]: int(count) for key, count in self.counters.totals().items()
+            if isinstance(key, tuple) and key[0] == "error"
+        }
 
     @property
     def duration(self) -> Optional[timedelta]:
@@ -48,25 +147,176 @@ class TaskMetrics:
             return 1.0
         return self.validation_passes / self.validation_attempts
 
-class TaskMonitor:
-    """Monitor and analyze task execution patterns."""
+class TaskMonitor(StreamListener):
+    """
+    Monitor and analyze task execution patterns.
+
+    Each monitored task is also traced: ``start_task`` and ``end_task`` bound a
+    span on the calling thread, and errors, recoveries, validations and
+    checkpoints are recorded as instant events on the task's track.
+
+    The same events update the Prometheus ``metrics`` as they happen.
+
+    ``task_metrics`` describes the latest execution of each task. Durations of
+    every execution are also kept in a ``LatencySketch`` per task name and per
+    model, giving p50/p90/p99 across runs in bounded memory. Snapshots of the
+    sketches from other processes can be merged in.
+
+    Alerts are evaluated incrementally: each event only re-checks the rules
+    for the task or model it concerns. Besides the per-metric thresholds,
+    ``add_slo`` registers sliding-window latency and throughput objectives.
+    Added to its run's ``listener_scope``, the monitor sees every response of
+    its running tasks, so a slow model is flagged mid-task. A model event
+    counts only if it comes from the execution that ``start_task`` was called
+    for (the same cancellation token), never from another run's task of the
+    same name.
+    Handlers added with ``add_alert_handler`` receive each alert when it starts
+    firing and again, with ``state`` set to ``"resolved"``, when it clears.
+    """
     
-    def __init__(self):
+    def __init__(self, tracer: Optional[Tracer] = None, metrics: Optional[DevCrewMetrics] = None):
         self.task_metrics: Dict[str, TaskMetrics] = {}
-        self.global_patterns: Dict[str, int] = defaultdict(int)
+        self.global_patterns = ShardedCounter()  # Error count per error type
         self.alert_thresholds: Dict[str, float] = {}
+        self.tracer = tracer or get_tracer()
+        self.metrics = metrics or get_metrics()
+        self._spans: Dict[str, Optional[Span]] = {}
+        # Token of each running task's execution, telling its model calls from other runs'
+        self._owners: Dict[str, Optional[CancellationToken]] = {}
+        self.task_durations: Dict[str, LatencySketch] = {}
+        self.model_durations: Dict[str, LatencySketch] = {}
+        self._sketch_lock = threading.Lock()
+        self.slos: List[Union[LatencySLO, ThroughputSLO]] = []
+        self._slo_windows: Dict[Tuple[int, str], Tuple[SlidingWindow, ...]] = {}
+        self._active_alerts: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._alert_handlers: List[AlertHandler] = []
+        self._alert_lock = threading.Lock()
+
+    def start_task(self, task_name: str, model: Optional[str] = None, **trace_args: Any) -> None:
+        """
+        Start monitoring a task.
 
-    def start_task(self, task_name: str) -> None:
-        """Start monitoring a task."""
+        Args:
+            task_name: Name of the task
+            model: Model the task runs on, for per-model duration percentiles
+            **trace_args: Attached to the task's trace span
+        """
         self.task_metrics[task_name] = TaskMetrics(
             task_name=task_name,
+            model=model,
             start_time=datetime.now()
         )
+        if model is not None:
+            trace_args["model"] = model
+        self._spans[task_name] = self.tracer.begin(task_name, "task", **trace_args)
+        self._owners[task_name] = current_token()
+        self.metrics.tasks_in_flight.inc()
+        self._evaluate_task_thresholds(task_name)  # Counts start again from zero
 
-    def end_task(self, task_name: str) -> None:
+    def end_task(self, task_name: str, **trace_args: Any) -> None:
         """End task monitoring."""
         if task_name in self.task_metrics:
-            self.task_metrics[task_name].end_time = datetime.now()
+            metrics = self.task_metrics[task_name]
+            metrics.end_time = datetime.now()
+            self.tracer.end(self._spans.pop(task_name, None), **trace_args)
+            self._owners.pop(task_name, None)
+            self.metrics.tasks_in_flight.dec()
+            seconds = metrics.duration.total_seconds()
+            self.metrics.task_duration.labels(task_name).observe(seconds)
+            self.record_duration(task_name, seconds, metrics.model)
+
+    def record_duration(self, task_name: str, seconds: float, model: Optional[str] = None) -> None:
+        """Add one execution's duration to the task's and model's sketches."""
+        with self._sketch_lock:
+            self.task_durations.setdefault(task_name, LatencySketch()).add(seconds)
+            if model is not None:
+                self.model_durations.setdefault(model, LatencySketch()).add(seconds)
+        self._evaluate_duration_threshold(task_name)
+        for index, slo in enumerate(self.slos):
+            if isinstance(slo, LatencySLO):
+                self._observe_slo(index, slo, slo.matches(task_name, model), seconds)
+
+    def record_generation(
+        self,
+        task_name: Optional[str],
+        model: str,
+        tokens: int,
+        seconds: float
+    ) -> None:
+        """Feed one model response into the throughput objectives."""
+        for index, slo in enumerate(self.slos):
+            if isinstance(slo, ThroughputSLO):
+                self._observe_slo(index, slo, slo.matches(task_name, model), tokens, seconds)
+
+    def _is_own_call(self, task_name: Optional[str]) -> bool:
+        """Whether a model event on this thread belongs to one of this monitor's running tasks."""
+        return task_name in self._spans and self._owners.get(task_name) is current_token()
+
+    def on_complete(self, task_name: Optional[str], stats: GenerationStats) -> None:
+        """Record the throughput of responses generated for this monitor's running tasks."""
+        if not self._is_own_call(task_name):
+            return
+        seconds = stats.generation_time
+        if seconds <= 0 and stats.time_to_first_token is not None:
+            seconds = stats.total_time - stats.time_to_first_token
+        if seconds > 0:
+            self.record_generation(task_name, stats.model, stats.completion_tokens, seconds)
+
+    def on_error(self, task_name: Optional[str], model: str, error: TaskExecutionError,
+                 attempt: int, will_retry: bool) -> None:
+        """Record retried model failures; a final failure is reported by the task itself."""
+        if will_retry and self._is_own_call(task_name):
+            self.record_error(task_name, type(error).__name__, {
+                **error.context, "category": error.category.value, "attempt": attempt
+            })
+
+    def on_recovery(self, task_name: Optional[str], model: str, attempts: int,
+                    successful: bool) -> None:
+        """Count retried model calls as recovery attempts of their task."""
+        if self._is_own_call(task_name):
+            self.record_recovery_attempt(task_name, successful)
+
+    def get_duration_percentiles(
+        self,
+        task_name: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> Dict[str, float]:
+        """
+        Duration percentiles across every recorded execution.
+
+        Args:
+            task_name: Task to report on
+            model: Model to report on, when no task is given
+
+        Returns:
+            Dict with count, mean, p50, p90, p99 and max in seconds; empty if
+            nothing was recorded
+        """
+        with self._sketch_lock:
+            if task_name is not None:
+                sketch = self.task_durations.get(task_name)
+            else:
+                sketch = self.model_durations.get(model or "")
+            return sketch.summary() if sketch is not None else {}
+
+    def duration_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """JSON-serialisable copy of the duration sketches, for merging elsewhere."""
+        with self._sketch_lock:
+            return {
+                "tasks": {name: sketch.to_dict() for name, sketch in self.task_durations.items()},
+                "models": {name: sketch.to_dict() for name, sketch in self.model_durations.items()}
+            }
+
+    def merge_duration_snapshot(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        """Merge sketches from ``duration_snapshot``, e.g. of another worker process."""
+        with self._sketch_lock:
+            for key, sketches in (("tasks", self.task_durations), ("models", self.model_durations)):
+                for name, payload in snapshot.get(key, {}).items():
+                    incoming = LatencySketch.from_dict(payload)
+                    if name in sketches:
+                        sketches[name].merge(incoming)
+                    else:
+                        sketches[name] = incoming
 
     def record_error(
         self,
@@ -74,12 +324,17 @@ class TaskMonitor:
         error_type: str,
         error_context: Dict[str, Any]
     ) -> None:
-        """Record an error occurrence."""
+        """Record an error occurrence; ``error_context['category']`` labels the error metric."""
         if task_name in self.task_metrics:
-            metrics = self.task_metrics[task_name]
-            metrics.error_count += 1
-            metrics.error_patterns[error_type] += 1
-            self.global_patterns[error_type] += 1
+            counters = self.task_metrics[task_name].counters
+            counters.inc("errors")
+            counters.inc(("error", error_type))
+            self.global_patterns.inc(error_type)
+            self.tracer.instant(f"error:{error_type}", "error", task=task_name)
+            self.metrics.task_errors.labels(
+                task_name, error_context.get("category", "unknown")
+            ).inc()
+            self._evaluate_task_thresholds(task_name)
 
     def record_recovery_attempt(
         self,
@@ -88,22 +343,31 @@ class TaskMonitor:
     ) -> None:
         """Record a recovery attempt."""
         if task_name in self.task_metrics:
-            metrics = self.task_metrics[task_name]
-            metrics.recovery_attempts += 1
+            counters = self.task_metrics[task_name].counters
+            counters.inc("recovery_attempts")
             if successful:
-                metrics.successful_recoveries += 1
+                counters.inc("successful_recoveries")
+            self.tracer.instant("recovery", "error", task=task_name, successful=successful)
+            self.metrics.recoveries.labels(task_name, "success" if successful else "failure").inc()
+            self._evaluate_task_thresholds(task_name)
 
     def record_validation(
         self,
         task_name: str,
-        passed: bool
+        passed: bool,
+        aborted_rule: Optional[str] = None
     ) -> None:
-        """Record a validation attempt."""
+        """Record a validation attempt; ``aborted_rule`` names the rule that stopped a generation."""
         if task_name in self.task_metrics:
-            metrics = self.task_metrics[task_name]
-            metrics.validation_attempts += 1
+            counters = self.task_metrics[task_name].counters
+            counters.inc("validation_attempts")
             if passed:
-                metrics.validation_passes += 1
+                counters.inc("validation_passes")
+            if aborted_rule is not None:
+                counters.inc("validation_aborts")
+            self.tracer.instant("validation", "validation", task=task_name, passed=passed,
+                                aborted_rule=aborted_rule)
+            self.metrics.validations.labels(task_name, "pass" if passed else "fail").inc()
 
     def record_checkpoint(
         self,
@@ -113,6 +377,7 @@ class TaskMonitor:
         """Record a task checkpoint."""
         if task_name in self.task_metrics:
             self.task_metrics[task_name].checkpoint_times[checkpoint_name] = datetime.now()
+            self.tracer.instant(checkpoint_name, "checkpoint", task=task_name)
 
     def get_task_summary(self, task_name: str) -> Dict[str, Any]:
         """Get summary metrics for a task."""
@@ -126,16 +391,18 @@ class TaskMonitor:
             "success_rate": metrics.success_rate,
             "validation_rate": metrics.validation_success_rate,
             "checkpoints": metrics.checkpoint_times,
-            "error_patterns": dict(metrics.error_patterns)
+            "error_patterns": metrics.error_patterns,
+            "duration_percentiles": self.get_duration_percentiles(task_name)
         }
 
     def get_global_patterns(self) -> Dict[str, Any]:
         """Get global error patterns."""
+        patterns = {error_type: int(count) for error_type, count in self.global_patterns.totals().items()}
         return {
-            "total_errors": sum(self.global_patterns.values()),
-            "error_types": dict(self.global_patterns),
+            "total_errors": sum(patterns.values()),
+            "error_types": patterns,
             "most_common_errors": sorted(
-                self.global_patterns.items(),
+                patterns.items(),
                 key=lambda x: x[1],
                 reverse=True
             )[:5]
@@ -146,31 +413,127 @@ class TaskMonitor:
         metric_type: MetricType,
         threshold: float
     ) -> None:
-        """Set an alert threshold for a metric."""
+        """Set an alert threshold for a metric and evaluate it against what was recorded so far."""
         self.alert_thresholds[metric_type.value] = threshold
+        for task_name in list(self.task_metrics):
+            self._evaluate_task_thresholds(task_name)
+        with self._sketch_lock:
+            task_names = list(self.task_durations)
+        for task_name in task_names:
+            self._evaluate_duration_threshold(task_name)
+
+    def add_slo(self, slo: Union[LatencySLO, ThroughputSLO]) -> None:
+        """Register a sliding-window objective; it sees observations from now on."""
+        self.slos.append(slo)
+
+    def add_alert_handler(self, handler: AlertHandler) -> None:
+        """Call ``handler`` whenever an alert starts firing or resolves."""
+        self._alert_handlers.append(handler)
 
     def check_alerts(self) -> List[Dict[str, Any]]:
-        """Check for metric threshold violations."""
-        alerts = []
-        for task_name, metrics in self.task_metrics.items():
-            if MetricType.ERROR_COUNT.value in self.alert_thresholds:
-                threshold = self.alert_thresholds[MetricType.ERROR_COUNT.value]
-                if metrics.error_count > threshold:
-                    alerts.append({
-                        "task_name": task_name,
-                        "metric": MetricType.ERROR_COUNT.value,
-                        "current_value": metrics.error_count,
-                        "threshold": threshold
-                    })
-
-            if MetricType.SUCCESS_RATE.value in self.alert_thresholds:
-                threshold = self.alert_thresholds[MetricType.SUCCESS_RATE.value]
-                if metrics.success_rate < threshold:
-                    alerts.append({
-                        "task_name": task_name,
-                        "metric": MetricType.SUCCESS_RATE.value,
-                        "current_value": metrics.success_rate,
-                        "threshold": threshold
-                    })
-
-        return alerts
+        """Alerts currently firing. Kept up to date as events arrive, so this does not scan."""
+        with self._alert_lock:
+            return [dict(alert) for alert in self._active_alerts.values()]
+
+    def _evaluate_task_thresholds(self, task_name: str) -> None:
+        """Re-check the error count and success rate thresholds of one task."""
+        metrics = self.task_metrics.get(task_name)
+        if metrics is None or not (MetricType.ERROR_COUNT.value in self.alert_thresholds
+                                   or MetricType.SUCCESS_RATE.value in self.alert_thresholds):
+            return
+        checks = (
+            (MetricType.ERROR_COUNT, metrics.error_count, lambda value, limit: value > limit),
+            (MetricType.SUCCESS_RATE, metrics.success_rate, lambda value, limit: value < limit)
+        )
+        for metric_type, value, breached in checks:
+            threshold = self.alert_thresholds.get(metric_type.value)
+            alert = None
+            if threshold is not None and breached(value, threshold):
+                alert = {
+                    "task_name": task_name,
+                    "metric": metric_type.value,
+                    "current_value": value,
+                    "threshold": threshold
+                }
+            self._update_alert((metric_type.value, task_name), alert)
+
+    def _evaluate_duration_threshold(self, task_name: str) -> None:
+        """Re-check the p99 duration threshold of one task."""
+        threshold = self.alert_thresholds.get(MetricType.DURATION.value)
+        if threshold is None:
+            return
+        with self._sketch_lock:
+            p99 = self.task_durations[task_name].quantile(0.99)
+        alert = None
+        if p99 > threshold:
+            alert = {
+                "task_name": task_name,
+                "metric": MetricType.DURATION.value,
+                "current_value": p99,
+                "threshold": threshold
+            }
+        self._update_alert((MetricType.DURATION.value, task_name), alert)
+
+    def _observe_slo(
+        self,
+        index: int,
+        slo: Union[LatencySLO, ThroughputSLO],
+        subject: Optional[str],
+        *values: float
+    ) -> None:
+        """Add an observation to one objective's window and re-evaluate it."""
+        if subject is None:
+            return
+        key = (index, subject)
+        with self._alert_lock:
+            windows = self._slo_windows.get(key)
+            if windows is None:
+                windows = tuple(
+                    SlidingWindow(slo.window_size, slo.window_seconds) for _ in values
+                )
+                self._slo_windows[key] = windows
+            for window, value in zip(windows, values):
+                window.add(value)
+            samples = len(windows[0])
+            if isinstance(slo, LatencySLO):
+                current = windows[0].percentile(slo.percentile)
+                breached = current > slo.threshold
+                threshold = slo.threshold
+            else:
+                tokens, seconds = windows
+                current = tokens.sum / seconds.sum if seconds.sum > 0 else 0.0
+                breached = current < slo.min_tokens_per_second
+                threshold = slo.min_tokens_per_second
+
+        alert = None
+        if breached and samples >= slo.min_samples:
+            alert = {
+                "task_name": subject if isinstance(slo, LatencySLO) else None,
+                "model": subject if isinstance(slo, ThroughputSLO) else None,
+                "metric": (MetricType.DURATION if isinstance(slo, LatencySLO)
+                           else MetricType.THROUGHPUT).value,
+                "slo": slo.name,
+                "current_value": current,
+                "threshold": threshold,
+                "samples": samples
+            }
+        self._update_alert((slo.name, subject), alert)
+
+    def _update_alert(self, key: Tuple[str, str], alert: Optional[Dict[str, Any]]) -> None:
+        """Store or clear an alert, notifying handlers when its state changes."""
+        with self._alert_lock:
+            previous = self._active_alerts.get(key)
+            if alert is not None:
+                alert["state"] = "firing"
+                self._active_alerts[key] = alert
+                event = dict(alert) if previous is None else None
+            elif previous is not None:
+                del self._active_alerts[key]
+                event = dict(previous, state="resolved")
+            else:
+                event = None
+        if event is None:
+            return
+        self.tracer.instant(f"alert:{event['metric']}", "alert", **event)
+        for handler in list(self._alert_handlers):
+            handler(event)
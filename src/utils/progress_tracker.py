@@ -2,6 +2,7 @@
 Progress tracking utilities for monitoring and reporting task execution.
 """
 
+import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, Optional
@@ -10,6 +11,9 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.text import Text
 
+from src.llm.streaming import GenerationStats, StreamListener
+from src.utils.metrics_core import ShardedCounter
+
 console = Console()
 
 class TaskTracker:
@@ -22,14 +26,43 @@ class TaskTracker:
         start_time (datetime, optional): When the task started
         end_time (datetime, optional): When the task completed
         actual_duration (float, optional): Actual time taken in seconds
+        token_budget (int, optional): Tokens the model may generate (num_predict)
+        tokens_generated (int): Tokens streamed so far, as counted by the server
+            once each response completes
+        time_to_first_token (float, optional): Seconds until the first token of the
+            last response arrived
+        tokens_per_second (float, optional): Generation throughput of the last response
+
+    Streamed tokens are counted in a ShardedCounter, keyed by task name, so
+    several threads may stream for the same task.
     """
+
+    __slots__ = (
+        "start_time", "end_time", "task_name", "estimated_duration", "actual_duration",
+        "token_budget", "token_counts", "time_to_first_token", "tokens_per_second"
+    )
     
-    def __init__(self, task_name: str, estimated_duration: int):
+    def __init__(
+        self,
+        task_name: str,
+        estimated_duration: int,
+        token_budget: Optional[int] = None,
+        token_counts: Optional[ShardedCounter] = None
+    ):
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
         self.task_name = task_name
         self.estimated_duration = estimated_duration  # in seconds
         self.actual_duration: Optional[float] = None
+        self.token_budget = token_budget
+        self.token_counts = token_counts if token_counts is not None else ShardedCounter()
+        self.time_to_first_token: Optional[float] = None
+        self.tokens_per_second: Optional[float] = None
+
+    @property
+    def tokens_generated(self) -> int:
+        """Tokens streamed so far."""
+        return int(self.token_counts.value(self.task_name))
 
     def start(self) -> None:
         """Start tracking the task execution time."""
@@ -46,17 +79,36 @@ class TaskTracker:
         """Check if the task is currently running."""
         return self.start_time is not None and self.end_time is None
 
+    def record_tokens(self, token_count: int) -> None:
+        """Add streamed tokens towards the token budget."""
+        self.token_counts.inc(self.task_name, token_count)
+
+    def record_generation(self, stats: GenerationStats) -> None:
+        """Keep time-to-first-token, throughput and token count of a finished response."""
+        # Chunks were counted as one token each while streaming
+        self.record_tokens(stats.completion_tokens - stats.chunk_count)
+        if stats.time_to_first_token is not None:
+            self.time_to_first_token = stats.time_to_first_token
+        self.tokens_per_second = stats.tokens_per_second
+
     @property
     def progress(self) -> float:
-        """Calculate the current progress as a percentage (0.0 to 1.0)."""
+        """
+        Calculate the current progress as a percentage (0.0 to 1.0).
+
+        With a token budget, progress is the share of the budget streamed so far;
+        otherwise it is estimated from elapsed time.
+        """
         if not self.start_time:
             return 0.0
         if self.end_time:
             return 1.0
+        if self.token_budget:
+            return min(self.tokens_generated / self.token_budget, 0.99)
         elapsed = (datetime.now() - self.start_time).total_seconds()
         return min(elapsed / self.estimated_duration, 0.95)  # Cap at 95% until complete
 
-class ProgressManager:
+class ProgressManager(StreamListener):
     """
     Manages progress tracking for multiple tasks with rich console output.
     
@@ -65,6 +117,10 @@ class ProgressManager:
     - Estimated time remaining
     - Task completion statistics
     - Duration analysis
+    - Token-level progress when registered as a listener on a streaming LLM
+
+    Safe to use from several threads: the task table is guarded by a lock and
+    token counts are sharded per thread.
     """
     
     def __init__(self):
@@ -78,14 +134,23 @@ class ProgressManager:
         )
         self.tasks: Dict[str, tuple] = {}  # (progress_id, TaskTracker)
         self.current_phase: Optional[str] = None
+        self.token_counts = ShardedCounter()
+        self._lock = threading.Lock()
 
-    def add_task(self, description: str, estimated_duration: int) -> str:
+    def add_task(
+        self,
+        description: str,
+        estimated_duration: int,
+        token_budget: Optional[int] = None
+    ) -> str:
         """
         Add a new task with estimated duration.
         
         Args:
-            description: Task name/description
+            description: Task name/description; use the crew task name to receive
+                streamed tokens for it
             estimated_duration: Expected duration in seconds
+            token_budget: Optional num_predict budget used to measure progress
             
         Returns:
             description: Task identifier
@@ -95,8 +160,9 @@ class ProgressManager:
             total=100,
             start=False
         )
-        tracker = TaskTracker(description, estimated_duration)
-        self.tasks[description] = (task_id, tracker)
+        tracker = TaskTracker(description, estimated_duration, token_budget, self.token_counts)
+        with self._lock:
+            self.tasks[description] = (task_id, tracker)
         return description
 
     def start_task(self, description: str) -> None:
@@ -106,11 +172,16 @@ class ProgressManager:
         Args:
             description: Task identifier
         """
-        if description in self.tasks:
-            task_id, tracker = self.tasks[description]
-            tracker.start()
-            self.progress.start_task(task_id)
+        self._start(description, restart=True)
+
+    def _start(self, description: str, restart: bool) -> None:
+        with self._lock:
+            entry = self.tasks.get(description)
+            if entry is None or (entry[1].start_time is not None and not restart):
+                return
+            entry[1].start()
             self.current_phase = description
+        self.progress.start_task(entry[0])
 
     def complete_task(self, description: str) -> None:
         """
@@ -119,18 +190,42 @@ class ProgressManager:
         Args:
             description: Task identifier
         """
-        if description in self.tasks:
-            task_id, tracker = self.tasks[description]
-            tracker.complete()
-            self.progress.update(task_id, completed=100)
+        with self._lock:
+            entry = self.tasks.get(description)
+            if entry is None:
+                return
+            entry[1].complete()
+        self.progress.update(entry[0], completed=100)
 
     def update_progress(self) -> None:
         """Update progress for all running tasks."""
-        for description, (task_id, tracker) in self.tasks.items():
+        with self._lock:
+            entries = list(self.tasks.values())
+        for task_id, tracker in entries:
             if tracker.is_running:
                 progress = tracker.progress * 100
                 self.progress.update(task_id, completed=progress)
 
+    def on_start(self, task_name: Optional[str], model: str) -> None:
+        """Start the matching task when the model receives its first request."""
+        if task_name in self.tasks:
+            self._start(task_name, restart=False)
+
+    def on_token(self, task_name: Optional[str], text: str, token_count: int) -> None:
+        """Advance the matching task's bar as tokens stream in."""
+        entry = self.tasks.get(task_name)
+        if entry is not None:
+            task_id, tracker = entry
+            tracker.record_tokens(token_count)
+            if tracker.is_running:
+                self.progress.update(task_id, completed=tracker.progress * 100)
+
+    def on_complete(self, task_name: Optional[str], stats: GenerationStats) -> None:
+        """Keep generation statistics for the report."""
+        entry = self.tasks.get(task_name)
+        if entry is not None:
+            entry[1].record_generation(stats)
+
     def generate_report(self) -> Text:
         """
         Generate a detailed timing report.
@@ -145,7 +240,9 @@ class ProgressManager:
         total_estimated = 0
         total_actual = 0
         
-        for description, (_, tracker) in self.tasks.items():
+        with self._lock:
+            entries = list(self.tasks.items())
+        for description, (_, tracker) in entries:
             if tracker.actual_duration:
                 total_estimated += tracker.estimated_duration
                 total_actual += tracker.actual_duration
@@ -153,6 +250,11 @@ class ProgressManager:
                 report.append(f"\nTask: {description}\n", style="cyan")
                 report.append(f"Estimated: {tracker.estimated_duration:.1f}s\n")
                 report.append(f"Actual: {tracker.actual_duration:.1f}s\n")
+                if tracker.time_to_first_token is not None:
+                    report.append(f"Time to first token: {tracker.time_to_first_token:.2f}s\n")
+                if tracker.tokens_per_second:
+                    report.append(f"Tokens/sec: {tracker.tokens_per_second:.1f} "
+                                  f"({tracker.tokens_generated} tokens)\n")
                 
                 diff = tracker.actual_duration - tracker.estimated_duration
                 if abs(diff) > tracker.estimated_duration * 0.1:  # More than 10% off
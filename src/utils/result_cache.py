@@ -0,0 +1,219 @@
+"""Content-addressed on-disk cache for task execution results."""
+import hashlib
+import json
+import os
+from dataclasses import asdict
+from enum import Enum
+from typing import Any, Dict, Literal, Optional, Union
+
+from diskcache import Cache
+
+from src.config.model_config import ModelConfig, get_recommended_model
+from src.config.model_routing import ModelRouting
+from src.utils.scheduler import (
+    TaskRunner,
+    execute_task,
+    kickoff_tasks,
+    task_output_from_dict,
+    task_output_to_dict
+)
+from src.utils.tracing import get_tracer
+
+# Bump when the key layout or stored payload changes
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = ".devcrew_cache/results"
+DEFAULT_MAX_SIZE_BYTES = 512 * 1024 * 1024  # 512 MB
+
+
+def _model_config_fingerprint(model_config: ModelConfig) -> Dict[str, Any]:
+    """Convert a ModelConfig into a JSON-serialisable dict."""
+    return {
+        key: value.value if isinstance(value, Enum) else value
+        for key, value in asdict(model_config).items()
+    }
+
+
+def _output_schema(task: Any) -> Optional[Dict[str, Any]]:
+    """JSON schema a task's output is structured by, or None for free text."""
+    for attribute in ("output_json", "output_pydantic"):
+        output_model = getattr(task, attribute, None)
+        if output_model is not None:
+            return {"kind": attribute, "schema": output_model.model_json_schema()}
+    return None
+
+
+class TaskResultCache:
+    """
+    Persistent cache of task outputs keyed by everything that determines them.
+
+    The key is a SHA-256 hash of the rendered task description and expected
+    output, the resolved context passed to the task, the agent's role and
+    backstory, the model configuration (the task's tier when a routing
+    table is given) and the schema of structured outputs, so text and JSON
+    runs of a task never share results. Entries are evicted least recently
+    used first once the cache grows beyond ``max_size_bytes``.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES,
+        model_config: Optional[ModelConfig] = None,
+        routing: Optional[ModelRouting] = None
+    ):
+        self.cache_dir = cache_dir
+        self.model_config = model_config or get_recommended_model()
+        self.routing = routing
+        self._cache = Cache(
+            cache_dir,
+            size_limit=max_size_bytes,
+            eviction_policy="least-recently-used",
+            tag_index=True
+        )
+        self._cache.stats(enable=True)
+
+    @classmethod
+    def from_env(cls, routing: Optional[ModelRouting] = None) -> Optional["TaskResultCache"]:
+        """
+        Build a cache from environment settings.
+
+        Caching is enabled by setting ``DEVCREW_CACHE_DIR``; the size bound can be
+        tuned with ``DEVCREW_CACHE_MAX_MB``.
+
+        Args:
+            routing: Optional routing table deciding each task's model
+
+        Returns:
+            TaskResultCache if caching is enabled, otherwise None
+        """
+        cache_dir = os.getenv("DEVCREW_CACHE_DIR")
+        if not cache_dir:
+            return None
+        max_mb = int(os.getenv("DEVCREW_CACHE_MAX_MB", DEFAULT_MAX_SIZE_BYTES // (1024 * 1024)))
+        return cls(cache_dir=cache_dir, max_size_bytes=max_mb * 1024 * 1024, routing=routing)
+
+    def make_key(
+        self,
+        description: str,
+        expected_output: str,
+        context: str,
+        agent_role: str,
+        agent_backstory: str,
+        model_config: Optional[ModelConfig] = None,
+        output_schema: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Compute the content hash identifying a task execution."""
+        payload = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "description": description,
+                "expected_output": expected_output,
+                "context": context,
+                "agent_role": agent_role,
+                "agent_backstory": agent_backstory,
+                "model": _model_config_fingerprint(model_config or self.model_config),
+                "output_schema": output_schema
+            },
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def key_for_task(self, task: Any, context: str) -> str:
+        """Compute the cache key for a crewai task and its resolved context."""
+        agent = task.agent
+        return self.make_key(
+            description=task.description,
+            expected_output=task.expected_output,
+            context=context,
+            agent_role=agent.role if agent is not None else "",
+            agent_backstory=agent.backstory if agent is not None else "",
+            model_config=self.routing.config_for(task.name) if self.routing is not None else None,
+            output_schema=_output_schema(task)
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached output payload for a key, marking it recently used."""
+        return self._cache.get(key)
+
+    def put(self, key: str, payload: Dict[str, Any], task_name: Optional[str] = None) -> None:
+        """Store an output payload, tagged with its task name for invalidation."""
+        self._cache.set(key, payload, tag=task_name)
+
+    def invalidate(self, key: str) -> bool:
+        """
+        Remove a single cached result.
+
+        Returns:
+            bool: True if an entry was removed
+        """
+        return self._cache.delete(key)
+
+    def invalidate_task(self, task_name: str) -> int:
+        """
+        Remove every cached result produced by a task.
+
+        Returns:
+            int: Number of entries removed
+        """
+        return self._cache.evict(task_name)
+
+    def clear(self) -> int:
+        """Remove all cached results and return how many were removed."""
+        return self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get entry count, size on disk and hit/miss counters."""
+        hits, misses = self._cache.stats()
+        return {
+            "entries": len(self._cache),
+            "size_bytes": self._cache.volume(),
+            "hits": hits,
+            "misses": misses
+        }
+
+    def close(self) -> None:
+        """Close the underlying cache database."""
+        self._cache.close()
+
+
+class CachedTaskRunner:
+    """Task runner that serves repeated executions from a TaskResultCache."""
+
+    def __init__(self, cache: TaskResultCache, runner: Optional[TaskRunner] = None):
+        self.cache = cache
+        self.runner = runner or execute_task
+
+    def __call__(self, task: Any, context: str) -> Any:
+        with get_tracer().span("cache_lookup", "cache", task=getattr(task, "name", None)) as span:
+            key = self.cache.key_for_task(task, context)
+            payload = self.cache.get(key)
+            span.set(hit=payload is not None)
+        if payload is not None:
+            return task_output_from_dict(payload)
+
+        output = self.runner(task, context)
+        self.cache.put(key, task_output_to_dict(output), task_name=output.name)
+        return output
+
+
+def resolve_cache(
+    cache: Union[TaskResultCache, Literal[False], None],
+    routing: Optional[ModelRouting] = None
+) -> Optional[TaskResultCache]:
+    """
+    Cache selected by a ``cache`` argument.
+
+    ``None`` follows ``DEVCREW_CACHE_DIR`` (see ``TaskResultCache.from_env``);
+    ``False`` turns caching off even when that variable is set.
+    """
+    if cache is None:
+        return TaskResultCache.from_env(routing=routing)
+    return cache if cache is not False else None
+
+
+def kickoff_crew(crew: Any, cache: Optional[TaskResultCache]) -> Any:
+    """Run a sequential crew, serving unchanged tasks from ``cache`` when one is given."""
+    if cache is None:
+        return crew.kickoff()
+    return kickoff_tasks(crew.tasks, max_concurrency=1, in_order=True,
+                         runner=CachedTaskRunner(cache))
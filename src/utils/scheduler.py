@@ -0,0 +1,428 @@
+"""Dependency-aware parallel scheduler for crew tasks."""
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from src.utils.cancellation import CancellationToken, cancellation_scope
+from src.utils.error_types import (
+    ContextError,
+    ErrorCategory,
+    ErrorSeverity,
+    TaskCancelledError,
+    TaskExecutionError
+)
+from src.utils.tracing import get_tracer
+
+# Same divider crewai uses when it aggregates upstream outputs into a context
+CONTEXT_DIVIDER = "\n\n----------\n\n"
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+TaskRunner = Callable[[Any, str], Any]
+CompletionHook = Callable[[str, Any], None]
+# Builds a task's context from (task_id, raw output) pairs of its dependencies
+ContextBuilder = Callable[[Any, List[Tuple[str, str]]], str]
+# Text a dependency's output contributes to a task's context: (task, dep id, dep output)
+SourceText = Callable[[Any, str, Any], str]
+ErrorHook = Callable[[str, Exception], None]
+# Seconds a task may run, by task id; None means no limit
+TaskTimeout = Callable[[str], Optional[float]]
+
+
+def get_task_id(task: Any, index: int) -> str:
+    """Return the identifier used for a task inside the scheduler."""
+    return getattr(task, "name", None) or f"task_{index}"
+
+
+def build_dependency_graph(tasks: Sequence[Any]) -> Dict[str, List[str]]:
+    """
+    Derive the task DAG from each task's ``context`` list.
+
+    Tasks with an explicit ``context`` list depend on exactly those tasks. Tasks
+    without one follow crewai's sequential semantics and depend on every task
+    listed before them.
+
+    Args:
+        tasks: Tasks in their sequential crew order
+
+    Returns:
+        Dict mapping each task id to the ids it depends on, in task order
+
+    Raises:
+        ContextError: If a dependency is not part of the run or the graph has a cycle
+    """
+    ids_by_object = {id(task): get_task_id(task, index) for index, task in enumerate(tasks)}
+    if len(set(ids_by_object.values())) != len(tasks):
+        raise ValueError("Task names must be unique to build a dependency graph")
+
+    graph: Dict[str, List[str]] = {}
+    ordered_ids: List[str] = []
+    for index, task in enumerate(tasks):
+        task_id = get_task_id(task, index)
+        context = getattr(task, "context", None)
+        if isinstance(context, list):
+            missing = [
+                getattr(dep, "name", None) or repr(dep)
+                for dep in context
+                if id(dep) not in ids_by_object
+            ]
+            if missing:
+                raise ContextError(
+                    message=f"Task '{task_id}' depends on tasks outside this run",
+                    task_name=task_id,
+                    missing_dependencies=missing
+                )
+            graph[task_id] = [ids_by_object[id(dep)] for dep in context]
+        elif context is None:
+            graph[task_id] = []
+        else:
+            # crewai's NOT_SPECIFIED sentinel: receive every previous output
+            graph[task_id] = list(ordered_ids)
+        ordered_ids.append(task_id)
+
+    _check_acyclic(graph)
+    return graph
+
+
+def _check_acyclic(graph: Dict[str, List[str]]) -> None:
+    """Raise a ContextError if the dependency graph contains a cycle."""
+    visiting, visited = set(), set()
+
+    def visit(node: str) -> None:
+        if node in visited:
+            return
+        if node in visiting:
+            raise ContextError(
+                message=f"Circular task dependency involving '{node}'",
+                task_name=node,
+                missing_dependencies=[]
+            )
+        visiting.add(node)
+        for dep in graph[node]:
+            visit(dep)
+        visiting.discard(node)
+        visited.add(node)
+
+    for node in graph:
+        visit(node)
+
+
+def critical_path_lengths(graph: Dict[str, List[str]]) -> Dict[str, int]:
+    """Length of the longest chain of dependents starting at each task."""
+    dependents: Dict[str, List[str]] = {node: [] for node in graph}
+    for node, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(node)
+
+    lengths: Dict[str, int] = {}
+
+    def length(node: str) -> int:
+        if node not in lengths:
+            lengths[node] = 1 + max((length(d) for d in dependents[node]), default=0)
+        return lengths[node]
+
+    for node in graph:
+        length(node)
+    return lengths
+
+
+def raw_source_text(task: Any, source_name: str, output: Any) -> str:
+    """Default source text: the dependency's full raw output."""
+    return output.raw
+
+
+def join_context(task: Any, sources: List[Tuple[str, str]]) -> str:
+    """Default context builder: join upstream outputs like crewai does."""
+    return CONTEXT_DIVIDER.join(text for _, text in sources)
+
+
+def downstream_tasks(graph: Dict[str, List[str]], roots: Iterable[str]) -> Set[str]:
+    """Return the given tasks plus every task that transitively depends on them."""
+    dependents: Dict[str, List[str]] = {node: [] for node in graph}
+    for node, deps in graph.items():
+        for dep in deps:
+            dependents[dep].append(node)
+
+    result: Set[str] = set()
+    stack = list(roots)
+    while stack:
+        node = stack.pop()
+        if node not in result:
+            result.add(node)
+            stack.extend(dependents[node])
+    return result
+
+
+def task_output_to_dict(output: Any) -> Dict[str, Any]:
+    """Serialise the persistent fields of a crewai TaskOutput."""
+    return {
+        "name": output.name,
+        "description": output.description,
+        "expected_output": output.expected_output,
+        "raw": output.raw,
+        "json_dict": output.json_dict,
+        "agent": output.agent
+    }
+
+
+def task_output_from_dict(payload: Dict[str, Any]) -> Any:
+    """Rebuild a crewai TaskOutput from ``task_output_to_dict`` data."""
+    from crewai.tasks.task_output import TaskOutput
+
+    return TaskOutput(**payload)
+
+
+def execute_task(task: Any, context: str, coworkers: Sequence[Any] = ()) -> Any:
+    """
+    Execute a single crewai task outside of a Crew, with the tools a sequential
+    Crew would give it.
+
+    Agents keep per-execution state (their agent executor), so each run gets its
+    own copy of the agent to stay safe when tasks sharing an agent run at once.
+    Agents allowed to delegate also get crewai's delegation tools for
+    ``coworkers``, the other agents of the crew.
+    """
+    agent = task.agent.copy() if task.agent is not None else None
+    tools = list(task.tools or (agent.tools if agent is not None else None) or [])
+    if agent is not None and agent.allow_delegation:
+        others = [coworker.copy() for coworker in coworkers if coworker is not task.agent]
+        if others:
+            delegation_tools = agent.get_delegation_tools(others)
+            replaced = {tool.name for tool in delegation_tools}
+            tools = [tool for tool in tools if tool.name not in replaced] + delegation_tools
+    output = task.execute_sync(agent=agent, context=context or None, tools=tools)
+    return output
+
+
+class TaskScheduler:
+    """
+    Run tasks as soon as their dependencies are satisfied.
+
+    Ready tasks are dispatched together, bounded by ``max_concurrency``. When more
+    tasks are ready than there are slots, the ones heading the longest chain of
+    dependents go first, or the earliest in the task list with ``in_order`` (the
+    order a sequential Crew runs them in).
+
+    A task's context is built by ``context_builder`` from the text each
+    dependency contributes, as chosen by ``source_text`` (the raw output by
+    default).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        runner: Optional[TaskRunner] = None,
+        context_builder: Optional[ContextBuilder] = None,
+        source_text: Optional[SourceText] = None,
+        in_order: bool = False
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.runner = runner or execute_task
+        self.context_builder = context_builder or join_context
+        self.source_text = source_text or raw_source_text
+        self.in_order = in_order
+
+    def run(
+        self,
+        tasks: Sequence[Any],
+        completed: Optional[Dict[str, Any]] = None,
+        on_complete: Optional[CompletionHook] = None,
+        on_error: Optional[ErrorHook] = None,
+        should_continue: Optional[Callable[[], bool]] = None,
+        cancellation: Optional[CancellationToken] = None,
+        task_timeout: Optional[TaskTimeout] = None
+    ) -> List[Any]:
+        """
+        Execute all tasks respecting their dependencies.
+
+        When a task fails no new tasks are started, but tasks already running are
+        allowed to finish so their outputs reach ``on_complete`` before the error
+        is raised.
+
+        Each task runs under its own cancellation token, a child of
+        ``cancellation`` that also expires after the task's timeout. Cancelling
+        the run's token stops scheduling and aborts the running tasks; they fail
+        with a TaskCancelledError.
+
+        Args:
+            tasks: Tasks in their sequential crew order
+            completed: Outputs of tasks that already ran, keyed by task id. Such
+                tasks are skipped unless something they depend on must run again.
+            on_complete: Called with the task id and output as each task finishes
+            on_error: Called with the task id and exception when a task fails
+            should_continue: Checked before dispatching; returning False stops
+                scheduling new tasks
+            cancellation: Token of the whole run, e.g. with a run deadline
+            task_timeout: Seconds each task may run, by task id
+
+        Returns:
+            List of task outputs in the same order as ``tasks``
+
+        Raises:
+            TaskCancelledError: If the run was cancelled before all tasks ran
+            TaskExecutionError: If scheduling was stopped before all tasks ran
+        """
+        graph = build_dependency_graph(tasks)
+        tasks_by_id = {get_task_id(task, index): task for index, task in enumerate(tasks)}
+        priority = ({task_id: 0 for task_id in graph} if self.in_order
+                    else critical_path_lengths(graph))
+        order = {task_id: index for index, task_id in enumerate(graph)}
+
+        completed = completed or {}
+        unfinished = [task_id for task_id in graph if task_id not in completed]
+        rerun = downstream_tasks(graph, unfinished)
+        outputs: Dict[str, Any] = {
+            task_id: output for task_id, output in completed.items()
+            if task_id in graph and task_id not in rerun
+        }
+        pending = {task_id: graph[task_id] for task_id in graph if task_id in rerun}
+        running: Dict[Future, str] = {}
+        failure: Optional[Exception] = None
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            while pending or running:
+                halted = (failure is not None
+                          or (should_continue is not None and not should_continue())
+                          or (cancellation is not None and cancellation.cancelled))
+                if not halted:
+                    ready = [
+                        task_id for task_id, deps in pending.items()
+                        if all(dep in outputs for dep in deps)
+                    ]
+                    ready.sort(key=lambda task_id: (-priority[task_id], order[task_id]))
+                    for task_id in ready[:self.max_concurrency - len(running)]:
+                        deps = pending.pop(task_id)
+                        task = tasks_by_id[task_id]
+                        with get_tracer().span("build_context", "scheduler",
+                                               task=task_id, dependencies=deps):
+                            context = self.context_builder(
+                                task, [(dep, self.source_text(task, dep, outputs[dep]))
+                                       for dep in deps]
+                            )
+                        timeout = task_timeout(task_id) if task_timeout is not None else None
+                        # The task sees this thread's context, e.g. the run's listener scope
+                        future = pool.submit(copy_context().run, self._run_task, task,
+                                             task_id, context, cancellation, timeout)
+                        running[future] = task_id
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task_id = running.pop(future)
+                    try:
+                        outputs[task_id] = future.result()
+                    except Exception as e:
+                        if on_error is not None:
+                            on_error(task_id, e)
+                        failure = failure or e
+                        continue
+                    if on_complete is not None:
+                        on_complete(task_id, outputs[task_id])
+
+        if failure is not None:
+            raise failure
+        if pending and cancellation is not None and cancellation.cancelled:
+            cancellation.raise_if_cancelled()
+        if pending:
+            raise TaskExecutionError(
+                message=f"Run stopped with {len(pending)} task(s) not started",
+                task_name=next(iter(pending)),
+                severity=ErrorSeverity.HIGH,
+                category=ErrorCategory.LOGIC_ERROR,
+                context={"pending_tasks": list(pending)}
+            )
+
+        return [outputs[task_id] for task_id in graph]
+
+    def _run_task(
+        self,
+        task: Any,
+        task_id: str,
+        context: str,
+        cancellation: Optional[CancellationToken],
+        timeout: Optional[float]
+    ) -> Any:
+        """Run one task under its own cancellation token."""
+        token = CancellationToken(timeout=timeout, parent=cancellation, name=task_id)
+        try:
+            with cancellation_scope(token):
+                return self.runner(task, context)
+        except TaskCancelledError:
+            raise
+        except Exception as e:
+            # Code that does not know about cancellation sees an aborted connection
+            if not token.cancelled:
+                raise
+            raise TaskCancelledError(
+                message=f"Task '{task_id}' was stopped: {token.reason}",
+                task_name=task_id,
+                reason=token.reason,
+                partial_output=token.partial_output
+            ) from e
+        finally:
+            token.close()
+
+
+def kickoff_tasks(
+    tasks: Sequence[Any],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    runner: Optional[TaskRunner] = None,
+    context_builder: Optional[ContextBuilder] = None,
+    source_text: Optional[SourceText] = None,
+    in_order: bool = False,
+    **run_options: Any
+) -> Any:
+    """
+    Run tasks through the scheduler and wrap the results like ``Crew.kickoff()``.
+
+    As in a Crew, the final output is the last task output with any text, and
+    ``token_usage`` totals the model calls made by this run.
+
+    Args:
+        tasks: Tasks in their sequential crew order
+        max_concurrency: Maximum number of tasks running at once
+        runner: Optional task runner, e.g. a caching runner
+        context_builder: Optional builder for each task's upstream context
+        source_text: Optional choice of what each upstream output contributes
+        in_order: Dispatch ready tasks in list order instead of critical path first
+        **run_options: Passed through to ``TaskScheduler.run``
+
+    Returns:
+        CrewOutput: Final task output plus every task's output
+    """
+    from crewai import CrewOutput
+    from crewai.types.usage_metrics import UsageMetrics
+
+    from src.llm.streaming import GenerationStatsRecorder, listener_scope
+
+    scheduler = TaskScheduler(
+        max_concurrency=max_concurrency,
+        runner=runner,
+        context_builder=context_builder,
+        source_text=source_text,
+        in_order=in_order
+    )
+    usage = GenerationStatsRecorder()
+    with listener_scope(usage):
+        outputs = scheduler.run(tasks, **run_options)
+    final_output = next((output for output in reversed(outputs) if output.raw), outputs[-1])
+
+    stats = usage.get_all_stats().values()
+    prompt_tokens = sum(entry["prompt_tokens"] for entry in stats)
+    completion_tokens = sum(entry["completion_tokens"] for entry in stats)
+    return CrewOutput(
+        raw=final_output.raw,
+        pydantic=final_output.pydantic,
+        json_dict=final_output.json_dict,
+        tasks_output=outputs,
+        token_usage=UsageMetrics(
+            total_tokens=prompt_tokens + completion_tokens,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            successful_requests=sum(entry["calls"] for entry in stats)
+        )
+    )
@@ -0,0 +1,222 @@
+"""Small statistics helpers for latency reporting."""
+import bisect
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """
+    Nearest-rank percentile of a sequence.
+
+    Args:
+        values: Observed values, in any order
+        q: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile value, or 0.0 for an empty sequence
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize_latencies(values: Sequence[float]) -> Dict[str, float]:
+    """Summarise latencies in seconds as count, mean, p50/p95/p99 and max."""
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values)
+    }
+
+
+class LatencySketch:
+    """
+    Mergeable quantile sketch with bounded relative error, in the style of DDSketch.
+
+    Values fall into logarithmic buckets whose width is ``relative_accuracy`` of
+    their value, so any quantile is reported within that relative error of the
+    true value. Memory is bounded by ``max_buckets``; beyond it the lowest
+    buckets are collapsed, which only affects the smallest quantiles. Sketches
+    with the same accuracy merge exactly, also across processes through
+    ``to_dict``/``from_dict``.
+    """
+
+    MIN_VALUE = 1e-9  # Smaller values, including zero, are counted separately
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Record ``value`` ``count`` times."""
+        if value <= self.MIN_VALUE:
+            self.zero_count += count
+        else:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        self.count += count
+        self.sum += value * count
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def _collapse(self) -> None:
+        """Fold the lowest buckets together until the bucket limit holds."""
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.buckets[target] += self.buckets.pop(key)
+
+    def _bucket_value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            float: Estimated value, or 0.0 for an empty sketch
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return max(self.min, 0.0)
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                return min(max(self._bucket_value(key), self.min), self.max)
+        return self.max
+
+    def merge(self, other: "LatencySketch") -> None:
+        """
+        Add every value recorded in ``other`` to this sketch.
+
+        Raises:
+            ValueError: If the sketches use different relative accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def summary(self) -> Dict[str, float]:
+        """Count, mean, p50/p90/p99 and max."""
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.quantile(0.50),
+            "p90": self.quantile(0.90),
+            "p99": self.quantile(0.99),
+            "max": self.max if self.count else 0.0
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisable snapshot of the sketch."""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(key): count for key, count in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None
+        }
+
+    @classmethod
+    def from_dict(cls, payload: Dict[str, Any], max_buckets: int = 2048) -> "LatencySketch":
+        """Rebuild a sketch from ``to_dict`` data."""
+        sketch = cls(payload["relative_accuracy"], max_buckets)
+        sketch.buckets = {int(key): count for key, count in payload["buckets"].items()}
+        sketch.zero_count = payload["zero_count"]
+        sketch.count = payload["count"]
+        sketch.sum = payload["sum"]
+        if sketch.count:
+            sketch.min = payload["min"]
+            sketch.max = payload["max"]
+        return sketch
+
+
+class SlidingWindow:
+    """
+    The most recent observations, bounded by count and optionally by age.
+
+    Values are also kept sorted, so adding one costs a binary search and
+    percentiles are read without sorting.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 20,
+        max_age: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.max_age = max_age
+        self._clock = clock
+        self._entries: Deque[Tuple[float, float]] = deque()
+        self._sorted: List[float] = []
+        self.sum = 0.0
+
+    def add(self, value: float) -> None:
+        """Add an observation, evicting those that fell out of the window."""
+        now = self._clock()
+        self._entries.append((now, value))
+        bisect.insort(self._sorted, value)
+        self.sum += value
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_size
+            or (self.max_age is not None and self._entries[0][0] < now - self.max_age)
+        ):
+            _, value = self._entries.popleft()
+            del self._sorted[bisect.bisect_left(self._sorted, value)]
+            self.sum -= value
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile (0-100) of the values in the window, 0.0 if empty."""
+        self._evict(self._clock())
+        if not self._sorted:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * len(self._sorted)))
+        return self._sorted[min(rank, len(self._sorted)) - 1]
+
+    def __len__(self) -> int:
+        self._evict(self._clock())
+        return len(self._entries)
@@ -1,11 +1,11 @@
 """Tool definitions for AI agents."""
-from typing import List, Callable, Any, Dict, Optional, Union
-from crewai.tools import BaseTool
 import subprocess
-import os
-from rich.console import Console
+import threading
+from typing import Any, Dict, List, Optional
+
+from crewai.tools import BaseTool
 
-console = Console()
+from src.utils.tracing import get_tracer
 
 def github_search(repo: str, query: str) -> str:
     """Search for code in a GitHub repository."""
@@ -24,14 +24,6 @@ def github_search(repo: str, query: str) -> str:
         return stdout.decode()
     except Exception as e:
         return f"Error: {str(e)}"
-from typing import List, Callable, Any, Dict, Optional, Union
-from crewai.tools import BaseTool
-import subprocess
-import os
-
-from functions import (
-    github_repo as mcp_github_search_code
-)
 
 def run_command(command: str) -> str:
     """Run a shell command and return its output."""
@@ -65,7 +57,14 @@ def file_operation(command: str) -> str:
         return run_command(command)
     return "Error: Unauthorized command"
 
-class CodeAnalysisTool(BaseTool):
+class TracedTool(BaseTool):
+    """Base class for the team's tools; every call is recorded as a trace span."""
+
+    def run(self, *args: Any, **kwargs: Any) -> Any:
+        with get_tracer().span(f"tool:{self.name}", "tool", arguments=kwargs or list(args)):
+            return super().run(*args, **kwargs)
+
+class CodeAnalysisTool(TracedTool):
     name: str = "code_analysis"
     description: str = "Analyzes code structure and quality using pylint"
 
@@ -76,28 +75,28 @@ class CodeAnalysisTool(BaseTool):
     ) -> str:
         return analyze_code(filename)
 
-class TestRunnerTool(BaseTool):
+class TestRunnerTool(TracedTool):
     name: str = "test_runner"
     description: str = "Runs pytest tests and returns results"
 
     def _run(self, path: str = "tests/") -> str:
         return run_tests(path)
 
-class DocGeneratorTool(BaseTool):
+class DocGeneratorTool(TracedTool):
     name: str = "doc_generator"
     description: str = "Generates documentation from code using pdoc"
 
     def _run(self, path: str = "src/") -> str:
         return generate_docs(path)
 
-class FileSystemTool(BaseTool):
+class FileSystemTool(TracedTool):
     name: str = "file_system"
     description: str = "Manages project files and directories safely"
 
     def _run(self, command: str) -> str:
         return file_operation(command)
 
-class Context7Tool(BaseTool):
+class Context7Tool(TracedTool):
     name: str = "context7"
     description: str = "Get documentation and code examples from libraries"
 
@@ -125,66 +124,102 @@ class Context7Tool(BaseTool):
         except Exception as e:
             return f"Error fetching documentation: {str(e)}"
 
-# Create tool instances
-code_analysis_tool = CodeAnalysisTool()
-test_runner_tool = TestRunnerTool()
-doc_generator_tool = DocGeneratorTool()
-file_system_tool = FileSystemTool()
-context7_tool = Context7Tool()
+TOOL_CLASSES = {
+    "code_analysis": CodeAnalysisTool,
+    "test_runner": TestRunnerTool,
+    "doc_generator": DocGeneratorTool,
+    "file_system": FileSystemTool,
+    "context7": Context7Tool
+}
+
+# Tool instances are created on first use and shared between agents
+_tool_instances: Dict[str, BaseTool] = {}
+_tool_lock = threading.Lock()
+
+def get_tool(name: str) -> BaseTool:
+    """Get the shared instance of a tool, creating it on first use."""
+    with _tool_lock:
+        if name not in _tool_instances:
+            _tool_instances[name] = TOOL_CLASSES[name]()
+        return _tool_instances[name]
 
 class DevTeamTools:
     """Collection of tools for development team agents."""
-    
+
+    # Tools of each agent role, by tool name
+    TOOLSETS = {
+        "developer": [
+            "code_analysis",  # For code quality checks
+            "file_system",    # For file operations
+            "test_runner",    # For running unit tests
+            "context7",       # For accessing documentation
+            "doc_generator"   # For generating code documentation
+        ],
+        "qa": [
+            "test_runner",    # For running tests
+            "code_analysis",  # For code quality analysis
+            "file_system"     # For accessing test files and results
+        ],
+        "documentation": [
+            "doc_generator",  # For generating documentation
+            "file_system",    # For file operations
+            "code_analysis"   # For code inspection
+        ],
+        "product_owner": [
+            "doc_generator",  # For requirements documentation
+            "file_system"     # For file operations
+        ],
+        "architect": [
+            "code_analysis",  # For code analysis
+            "doc_generator",  # For architecture documentation
+            "file_system"     # For file operations
+        ],
+        "designer": [
+            "doc_generator",  # For design specifications
+            "file_system"     # For design assets
+        ],
+        "devops": [
+            "file_system",    # For system operations
+            "code_analysis"   # For code quality checks
+        ]
+    }
+
+    @staticmethod
+    def get_toolset(role: str) -> List[BaseTool]:
+        """Get the tools for an agent role."""
+        return [get_tool(name) for name in DevTeamTools.TOOLSETS[role]]
+
     @staticmethod
     def get_developer_tools() -> List[BaseTool]:
         """Get tools for the developer agent."""
-        return [
-            code_analysis_tool,  # For code quality checks
-            file_system_tool,    # For file operations
-            test_runner_tool,    # For running unit tests
-            context7_tool,       # For accessing documentation
-            doc_generator_tool   # For generating code documentation
-        ]
-    
+        return DevTeamTools.get_toolset("developer")
+
     @staticmethod
     def get_qa_tools() -> List[BaseTool]:
         """Get tools for the QA engineer agent."""
-        return [
-            test_runner_tool,    # For running tests
-            code_analysis_tool,  # For code quality analysis
-            file_system_tool     # For accessing test files and results
-        ]
+        return DevTeamTools.get_toolset("qa")
 
     @staticmethod
     def get_documentation_tools() -> List[BaseTool]:
         """Get tools for the documentation specialist agent."""
-        return [
-            doc_generator_tool,  # For generating documentation
-            file_system_tool,    # For file operations
-            code_analysis_tool   # For code inspection
-        ]
+        return DevTeamTools.get_toolset("documentation")
 
     @staticmethod
     def get_product_owner_tools() -> List[BaseTool]:
         """Get tools for the product owner agent."""
-        return [
-            doc_generator_tool,  # For requirements documentation
-            file_system_tool     # For file operations
-        ]
+        return DevTeamTools.get_toolset("product_owner")
 
     @staticmethod
     def get_architect_tools() -> List[BaseTool]:
         """Get tools for the architect agent."""
-        return [
-            code_analysis_tool,  # For code analysis
-            doc_generator_tool,  # For architecture documentation
-            file_system_tool     # For file operations
-        ]
+        return DevTeamTools.get_toolset("architect")
+
+    @staticmethod
+    def get_designer_tools() -> List[BaseTool]:
+        """Get tools for the UI/UX designer agent."""
+        return DevTeamTools.get_toolset("designer")
 
     @staticmethod
     def get_devops_tools() -> List[BaseTool]:
         """Get tools for the DevOps engineer agent."""
-        return [
-            file_system_tool,    # For system operations
-            code_analysis_tool   # For code quality checks
-        ]
+        return DevTeamTools.get_toolset("devops")
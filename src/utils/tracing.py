@@ -0,0 +1,213 @@
+"""
+Span-based tracing of a run, exported in Chrome trace-event format.
+
+Spans are recorded around task execution, LLM calls, tool calls and
+validation. ``Tracer.save`` writes a JSON file that opens in
+``chrome://tracing`` or https://ui.perfetto.dev, with one track per worker
+thread. That makes it easy to see where a plan's wall time goes and which
+tasks sit on the critical path.
+
+Tracing is off unless ``DEVCREW_TRACE_FILE`` is set or a tracer is installed
+with ``set_tracer``. A disabled tracer's ``span`` costs one attribute check.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+TRACE_FILE_ENV = "DEVCREW_TRACE_FILE"
+
+DEFAULT_MAX_EVENTS = 200_000  # Events kept before new ones are dropped
+
+
+class Span:
+    """An open span. Arguments added with ``set`` end up in the exported event."""
+
+    __slots__ = ("name", "category", "start", "tid", "args")
+
+    def __init__(self, name: str, category: str, start: float, tid: int, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.start = start
+        self.tid = tid
+        self.args = args
+
+    def set(self, **args: Any) -> None:
+        """Attach arguments to the span, e.g. token counts known only at the end."""
+        self.args.update(args)
+
+
+class _NullSpan:
+    """Stand-in yielded by a disabled tracer."""
+
+    __slots__ = ()
+
+    def set(self, **args: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects spans and instant events from any number of threads.
+
+    Timestamps come from ``clock`` (seconds, monotonic) and are exported in
+    microseconds relative to the tracer's creation.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_events: int = DEFAULT_MAX_EVENTS,
+        clock: Callable[[], float] = time.perf_counter
+    ):
+        self.enabled = enabled
+        self.max_events = max_events
+        self.dropped = 0
+        self._clock = clock
+        self._origin = clock()
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+
+    def _timestamp(self, seconds: float) -> float:
+        return round((seconds - self._origin) * 1e6, 3)
+
+    def _record(self, event: Dict[str, Any]) -> None:
+        with self._lock:
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._events.append(event)
+            if event["tid"] not in self._thread_names:
+                self._thread_names[event["tid"]] = threading.current_thread().name
+
+    def begin(self, name: str, category: str, **args: Any) -> Optional[Span]:
+        """
+        Open a span on the calling thread.
+
+        Returns:
+            The span to pass to ``end``, or None when tracing is disabled
+        """
+        if not self.enabled:
+            return None
+        return Span(name, category, self._clock(), threading.get_ident(), args)
+
+    def end(self, span: Optional[Span], **args: Any) -> None:
+        """Close a span opened with ``begin`` and record it as a complete event."""
+        if span is None:
+            return
+        end = self._clock()
+        span.args.update(args)
+        self._record({
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": self._timestamp(span.start),
+            "dur": round((end - span.start) * 1e6, 3),
+            "pid": self._pid,
+            "tid": span.tid,
+            "args": span.args
+        })
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[Any]:
+        """
+        Trace the enclosed block. Exceptions are recorded in the span's ``error`` argument.
+
+        Yields:
+            The open span, whose ``set`` method adds arguments
+        """
+        if not self.enabled:
+            yield _NULL_SPAN
+            return
+        span = self.begin(name, category, **args)
+        try:
+            yield span
+        except BaseException as e:
+            span.args["error"] = type(e).__name__
+            raise
+        finally:
+            self.end(span)
+
+    def instant(self, name: str, category: str, **args: Any) -> None:
+        """Record a point-in-time event on the calling thread's track."""
+        if not self.enabled:
+            return
+        self._record({
+            "name": name,
+            "cat": category,
+            "ph": "i",
+            "s": "t",
+            "ts": self._timestamp(self._clock()),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+            "args": args
+        })
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Recorded events in the order they completed."""
+        with self._lock:
+            return list(self._events)
+
+    def clear(self) -> None:
+        """Drop every recorded event."""
+        with self._lock:
+            self._events.clear()
+            self.dropped = 0
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Build the trace-event document, including thread name metadata."""
+        with self._lock:
+            events = sorted(self._events, key=lambda event: event["ts"])
+            metadata = [
+                {"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid,
+                 "args": {"name": thread_name}}
+                for tid, thread_name in self._thread_names.items()
+            ]
+            dropped = self.dropped
+        metadata.append({"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0,
+                         "args": {"name": "devcrew"}})
+        return {
+            "traceEvents": metadata + events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": dropped}
+        }
+
+    def save(self, path: str) -> None:
+        """Write the Chrome trace JSON to ``path``."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+
+_tracer: Optional[Tracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer, enabled when ``DEVCREW_TRACE_FILE`` is set."""
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = Tracer(enabled=bool(os.getenv(TRACE_FILE_ENV)))
+        return _tracer
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Install the process-wide tracer; None restores the environment default."""
+    global _tracer
+    with _tracer_lock:
+        _tracer = tracer
+
+
+def trace_file() -> Optional[str]:
+    """Path the trace of a run is written to, if configured."""
+    return os.getenv(TRACE_FILE_ENV) or None
@@ -0,0 +1,162 @@
+"""Memo of validation results keyed by rule set and content."""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from diskcache import Cache
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_STORE_SIZE_BYTES = 64 * 1024 * 1024  # 64 MB
+STORE_DIR_ENV = "DEVCREW_VALIDATION_CACHE_DIR"
+
+
+def content_hash(data: Any) -> Optional[str]:
+    """
+    SHA-256 of a validated value.
+
+    Text is hashed as is, other values as canonical JSON.
+
+    Returns:
+        The hex digest, or None for values that cannot be serialised
+    """
+    if isinstance(data, str):
+        encoded = b"s" + data.encode("utf-8")
+    else:
+        try:
+            encoded = b"j" + json.dumps(data, sort_keys=True).encode("utf-8")
+        except (TypeError, ValueError):
+            return None
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ValidationMemo:
+    """
+    Bounded LRU memo of validation results, optionally backed by a disk store.
+
+    Keys combine the task type, the version of its compiled rule set and the
+    hash of the validated content, so a result is reused only for the same
+    content under the same rules. Results are kept as plain dicts. Entries
+    past ``max_entries`` are evicted least recently used first; the disk
+    store, when configured, outlives the process and has its own size bound.
+    Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        store_dir: Optional[str] = None,
+        store_size_bytes: int = DEFAULT_STORE_SIZE_BYTES
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._store = Cache(
+            store_dir,
+            size_limit=store_size_bytes,
+            eviction_policy="least-recently-used",
+            tag_index=True
+        ) if store_dir is not None else None
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ValidationMemo":
+        """In-memory memo, persisted under ``DEVCREW_VALIDATION_CACHE_DIR`` if it is set."""
+        return cls(store_dir=os.getenv(STORE_DIR_ENV) or None)
+
+    @staticmethod
+    def make_key(kind: str, task_type: str, version: str, data: Any) -> Optional[str]:
+        """
+        Key of a validation, or None if the data cannot be hashed.
+
+        Args:
+            kind: "input" or "output"
+            task_type: Task type whose rules apply
+            version: Version of the compiled rule set
+            data: Validated value
+        """
+        digest = content_hash(data)
+        if digest is None:
+            return None
+        return f"{kind}:{task_type}:{version}:{digest}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the memoised result for a key, marking it recently used."""
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return payload
+        payload = self._store.get(key) if self._store is not None else None
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, payload)
+        return payload
+
+    def put(self, key: str, payload: Dict[str, Any]) -> None:
+        """Memoise a result; persisted entries are tagged with their task for invalidation."""
+        with self._lock:
+            self._remember(key, payload)
+        if self._store is not None:
+            self._store.set(key, payload, tag=key.rsplit(":", 2)[0])
+
+    def _remember(self, key: str, payload: Dict[str, Any]) -> None:
+        self._entries[key] = payload
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, kind: str, task_type: str, persistent: bool = False) -> int:
+        """
+        Forget every result for a task type, e.g. after its rules changed.
+
+        Stored results of other rule set versions are never read, so by
+        default they are left on disk, where another process with those rules
+        may still use them, until the store's size bound evicts them.
+
+        Args:
+            kind: "input" or "output"
+            task_type: Task type whose results to forget
+            persistent: Also remove the task type's results from the disk store
+
+        Returns:
+            int: Number of entries removed
+        """
+        prefix = f"{kind}:{task_type}:"
+        with self._lock:
+            stale = [key for key in self._entries if key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+        removed = len(stale)
+        if persistent and self._store is not None:
+            removed += self._store.evict(prefix[:-1])
+        return removed
+
+    def clear(self) -> None:
+        """Forget all results."""
+        with self._lock:
+            self._entries.clear()
+        if self._store is not None:
+            self._store.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get entry counts and hit/miss counters."""
+        with self._lock:
+            stats = {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+        if self._store is not None:
+            stats["stored_entries"] = len(self._store)
+        return stats
+
+    def close(self) -> None:
+        """Close the disk store, if any."""
+        if self._store is not None:
+            self._store.close()
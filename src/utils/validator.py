@@ -1,15 +1,51 @@
 """Validation system for task inputs and outputs."""
-from typing import Any, Callable, Dict, List, Optional, TypeVar
-from dataclasses import dataclass
+import hashlib
+import json
+import pickle
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar
+)
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 
+from src.llm.streaming import GenerationStats, StreamListener
+from src.utils.cancellation import CancellationToken, current_token
+from src.utils.error_types import ValidationError
+from src.utils.tracing import get_tracer
+from src.utils.validation_memo import ValidationMemo
+
+if TYPE_CHECKING:
+    from src.utils.monitor import TaskMonitor
+
 T = TypeVar('T')
 
+DEFAULT_CHECK_INTERVAL = 64  # Characters streamed between rule checks
+
 class ValidationSeverity(Enum):
     WARNING = "warning"   # Issue that should be noted but doesn't invalidate the result
     ERROR = "error"      # Issue that makes the result invalid
     CRITICAL = "critical" # Issue that affects the entire process
 
+class StreamBehavior(Enum):
+    """How a rule behaves on a partial (still streaming) output."""
+    FINAL_ONLY = "final_only"            # Only meaningful on the complete output
+    SATISFIED_EARLY = "satisfied_early"  # Once it passes, more text cannot make it fail
+    FAILS_EARLY = "fails_early"          # Once it fails, more text cannot make it pass
+
 @dataclass
 class ValidationRule:
     """Definition of a validation rule."""
@@ -18,6 +54,7 @@ class ValidationRule:
     validator: Callable[[Any], bool]
     error_message: str
     severity: ValidationSeverity
+    streaming: StreamBehavior = StreamBehavior.FINAL_ONLY
 
 @dataclass
 class ValidationResult:
@@ -25,71 +62,617 @@ class ValidationResult:
     is_valid: bool
     errors: List[Dict[str, Any]]
     warnings: List[Dict[str, Any]]
+    aborted_at: Optional[int] = None  # Characters streamed when validation stopped a generation
+
+def _issue(rule: ValidationRule, message: Optional[str] = None) -> Dict[str, Any]:
+    return {"rule_name": rule.name, "message": message or rule.error_message}
+
+class KeywordMatcher:
+    """
+    Finds which of a rule set's keywords occur in a text.
+
+    Keywords are lowercased and deduplicated across rules, so each is looked
+    up once per document however many rules use it. Lookups use ``str``'s
+    substring search: on CPython it beats a single ``re`` alternation over
+    the same keywords at every size we measured.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = tuple(sorted({keyword.lower() for keyword in keywords}))
+
+    def find(self, lower_text: str) -> FrozenSet[str]:
+        """Keywords that occur in ``lower_text``, which must already be lowercased."""
+        return frozenset(keyword for keyword in self.keywords if keyword in lower_text)
+
+class DocumentFeatures:
+    """
+    Features of one text shared by every rule that checks it.
+
+    Each feature is computed on first use, so a rule set pays for the
+    lowercasing, word split and keyword scan once per document, and only if
+    one of its rules needs them.
+    """
+
+    def __init__(self, text: str, matcher: Optional[KeywordMatcher] = None):
+        self.text = text
+        self.matcher = matcher
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+    @cached_property
+    def keywords(self) -> FrozenSet[str]:
+        """Keywords of the matcher found in the text, case-insensitively."""
+        return self.matcher.find(self.lower) if self.matcher is not None else frozenset()
+
+class FeatureCheck:
+    """
+    Rule check that reads DocumentFeatures instead of the raw text.
+
+    Compiled rule sets hand every check the document's shared features.
+    Called directly with a string, as ``ValidationRule.validator``, a check
+    computes the features it needs itself. Checks are plain objects, so rule
+    sets made of them can be sent to worker processes.
+    """
+    keywords: Sequence[str] = ()
+
+    @cached_property
+    def matcher(self) -> Optional[KeywordMatcher]:
+        return KeywordMatcher(self.keywords) if self.keywords else None
+
+    def __call__(self, data: Any) -> bool:
+        if not isinstance(data, str):
+            raise TypeError(f"expected text, got {type(data).__name__}")
+        return self.evaluate(DocumentFeatures(data, self.matcher))
+
+    def evaluate(self, features: DocumentFeatures) -> bool:
+        raise NotImplementedError
+
+class NonEmpty(FeatureCheck):
+    """Passes when the text has non-whitespace content."""
+
+    def __call__(self, data: Any) -> bool:
+        return bool(data) and super().__call__(data)
+
+    def evaluate(self, features: DocumentFeatures) -> bool:
+        return bool(features.text.strip())
+
+class MinWords(FeatureCheck):
+    """Passes when the text has at least ``count`` words."""
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def evaluate(self, features: DocumentFeatures) -> bool:
+        return features.word_count >= self.count
+
+class ContainsKeyword(FeatureCheck):
+    """Passes when ``keyword`` occurs in the text, ignoring case."""
+
+    def __init__(self, keyword: str):
+        self.keyword = keyword.lower()
+        self.keywords = (self.keyword,)
+
+    def evaluate(self, features: DocumentFeatures) -> bool:
+        return self.keyword in features.keywords
+
+def _keywords_of(rules: Iterable[ValidationRule]) -> List[str]:
+    return [keyword for rule in rules for keyword in getattr(rule.validator, "keywords", ())]
+
+def rule_fingerprint(rule: ValidationRule) -> str:
+    """
+    Stable description of what a rule checks, for versioning rule sets.
+
+    FeatureChecks are described by their class and parameters, functions by
+    their code and the values they close over.
+    """
+    check = rule.validator
+    if isinstance(check, FeatureCheck):
+        params = {key: value for key, value in vars(check).items() if key != "matcher"}
+        body = f"{type(check).__module__}.{type(check).__qualname__}{sorted(params.items())!r}"
+    elif hasattr(check, "__code__"):
+        code = check.__code__
+        cells = [cell.cell_contents for cell in check.__closure__ or ()]
+        body = f"{check.__module__}.{check.__qualname__}:{code.co_code.hex()}:{code.co_consts!r}:{cells!r}"
+    else:
+        body = repr(check)
+    return f"{rule.name}|{rule.severity.value}|{rule.error_message}|{body}"
+
+def _check_rule(rule: ValidationRule, data: Any, features: Optional[DocumentFeatures]) -> bool:
+    if features is not None and isinstance(rule.validator, FeatureCheck):
+        return bool(rule.validator.evaluate(features))
+    return bool(rule.validator(data))
+
+class CompiledRuleSet:
+    """
+    A task type's rules prepared for validating many documents.
+
+    The keywords of all rules are merged into one matcher and every document's
+    features are computed once for all rules. CRITICAL rules run first: the
+    first one that fails ends the validation with that single error.
+    ``version`` changes whenever the rules do, so memoised results of an
+    older rule set are never reused.
+    """
+
+    def __init__(self, rules: Sequence[ValidationRule]):
+        self.rules = list(rules)
+        self.version = hashlib.sha256(
+            "\n".join(rule_fingerprint(rule) for rule in self.rules).encode("utf-8")
+        ).hexdigest()[:16]
+        self.matcher = KeywordMatcher(_keywords_of(self.rules))
+        self._critical = [rule for rule in self.rules if rule.severity is ValidationSeverity.CRITICAL]
+        self._others = [rule for rule in self.rules if rule.severity is not ValidationSeverity.CRITICAL]
+
+    def features(self, text: str) -> DocumentFeatures:
+        return DocumentFeatures(text, self.matcher)
+
+    def validate(self, data: Any) -> ValidationResult:
+        """Validate one document."""
+        features = self.features(data) if isinstance(data, str) else None
+        errors = []
+        warnings = []
+        for rule in self._critical + self._others:
+            try:
+                if _check_rule(rule, data, features):
+                    continue
+                validation_issue = _issue(rule)
+            except Exception as e:
+                validation_issue = _issue(rule, f"Validation error: {str(e)}")
+            else:
+                if rule.severity is ValidationSeverity.WARNING:
+                    warnings.append(validation_issue)
+                    continue
+            errors.append(validation_issue)
+            if rule.severity is ValidationSeverity.CRITICAL:
+                break
+        return ValidationResult(is_valid=len(errors) == 0, errors=errors, warnings=warnings)
+
+    def validate_batch(
+        self,
+        documents: Iterable[Any],
+        processes: Optional[int] = None,
+        chunksize: int = 64
+    ) -> List[ValidationResult]:
+        """
+        Validate many documents, in order.
+
+        Args:
+            documents: Documents to validate
+            processes: Worker processes to spread the batch over; validated
+                in this process when None or 1
+            chunksize: Documents sent to a worker at a time
+
+        Returns:
+            One ValidationResult per document
+
+        Raises:
+            ValueError: If ``processes`` is set but a rule cannot be pickled,
+                e.g. a lambda; build such rules from FeatureCheck objects
+        """
+        if not processes or processes <= 1:
+            return [self.validate(document) for document in documents]
+        try:
+            pickle.dumps(self)
+        except (pickle.PickleError, AttributeError, TypeError) as e:
+            raise ValueError(f"Rules must be picklable to validate in processes: {e}") from e
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                 initargs=(self,)) as pool:
+            return list(pool.map(_validate_in_worker, documents, chunksize=chunksize))
+
+_worker_rules: Optional[CompiledRuleSet] = None  # Rule set of a validation worker process
+
+def _init_worker(rules: CompiledRuleSet) -> None:
+    global _worker_rules
+    _worker_rules = rules
+
+def _validate_in_worker(document: Any) -> ValidationResult:
+    return _worker_rules.validate(document)
+
+class IncrementalValidation:
+    """
+    Validation of one output while it is being generated.
+
+    ``feed`` appends streamed text and re-checks the streaming rules every
+    ``check_interval`` characters. Rules that are satisfied early are not
+    evaluated again. A FAILS_EARLY rule of ERROR or CRITICAL severity that
+    fails is final, so ``feed`` reports it and the generation can be stopped.
+    """
+
+    def __init__(self, rules: List[ValidationRule], check_interval: int = DEFAULT_CHECK_INTERVAL):
+        self.rules = rules
+        self.check_interval = check_interval
+        self.satisfied: List[str] = []
+        self.violation: Optional[Dict[str, Any]] = None
+        self._parts: List[str] = []
+        self._length = 0
+        self._checked_at = 0
+        self._pending = [rule for rule in rules if rule.streaming is not StreamBehavior.FINAL_ONLY]
+        self._matcher = KeywordMatcher(_keywords_of(self._pending))
+
+    @property
+    def text(self) -> str:
+        if len(self._parts) > 1:
+            self._parts = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def feed(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Append streamed text.
+
+        Returns:
+            The violation that should abort the generation, if one was found
+        """
+        if self.violation is not None:
+            return self.violation
+        self._parts.append(text)
+        self._length += len(text)
+        if self._length - self._checked_at >= self.check_interval:
+            self._check()
+        return self.violation
+
+    def _check(self) -> None:
+        self._checked_at = self._length
+        buffer = self.text
+        features = DocumentFeatures(buffer, self._matcher)
+        remaining = []
+        for rule in self._pending:
+            try:
+                passed = _check_rule(rule, buffer, features)
+            except Exception:
+                passed = False
+                if rule.streaming is StreamBehavior.FAILS_EARLY:
+                    remaining.append(rule)  # Judged again on the complete output
+                    continue
+            if rule.streaming is StreamBehavior.SATISFIED_EARLY:
+                if passed:
+                    self.satisfied.append(rule.name)
+                else:
+                    remaining.append(rule)
+            elif passed or rule.severity is ValidationSeverity.WARNING:
+                remaining.append(rule)
+            else:
+                self.violation = _issue(rule)
+                return
+        self._pending = remaining
+
+    def finish(self) -> ValidationResult:
+        """Validate the complete output, skipping rules already satisfied."""
+        if self.violation is not None:
+            return ValidationResult(False, [self.violation], [], aborted_at=self._checked_at)
+        satisfied = set(self.satisfied)
+        rules = [rule for rule in self.rules if rule.name not in satisfied]
+        return CompiledRuleSet(rules).validate(self.text)
+
+def _result_from_payload(payload: Dict[str, Any]) -> ValidationResult:
+    """Rebuild a memoised result; callers get their own copies of the issue lists."""
+    return ValidationResult(
+        is_valid=payload["is_valid"],
+        errors=[dict(issue) for issue in payload["errors"]],
+        warnings=[dict(issue) for issue in payload["warnings"]],
+        aborted_at=payload.get("aborted_at")
+    )
 
 class TaskValidator:
-    """Validator for task inputs and outputs."""
-    
-    def __init__(self):
+    """
+    Validator for task inputs and outputs.
+
+    Results are memoised by task type, rule set version and content hash, so
+    an output validated again on retry, resume or in a report is not
+    re-checked. Adding a rule invalidates the memo of its task type.
+    """
+
+    def __init__(self, memo: Optional[ValidationMemo] = None):
         self.input_rules: Dict[str, List[ValidationRule]] = {}
         self.output_rules: Dict[str, List[ValidationRule]] = {}
+        # Compiled forms of the rule lists above by (kind, task type), rebuilt when a rule is added
+        self._compiled: Dict[Tuple[str, str], CompiledRuleSet] = {}
+        self.memo = memo if memo is not None else ValidationMemo.from_env()
 
     def add_input_rule(self, task_type: str, rule: ValidationRule) -> None:
         """Add a validation rule for task input."""
         if task_type not in self.input_rules:
             self.input_rules[task_type] = []
         self.input_rules[task_type].append(rule)
+        self._rules_changed("input", task_type)
 
     def add_output_rule(self, task_type: str, rule: ValidationRule) -> None:
         """Add a validation rule for task output."""
         if task_type not in self.output_rules:
             self.output_rules[task_type] = []
         self.output_rules[task_type].append(rule)
+        self._rules_changed("output", task_type)
+
+    def _rules_changed(self, kind: str, task_type: str) -> None:
+        self._compiled.pop((kind, task_type), None)
+        self.memo.invalidate(kind, task_type)
+
+    def compiled_rules(self, task_type: str, kind: str = "output") -> CompiledRuleSet:
+        """The input or output rules of ``task_type`` in compiled form."""
+        if (kind, task_type) not in self._compiled:
+            rules = self.input_rules if kind == "input" else self.output_rules
+            self._compiled[(kind, task_type)] = CompiledRuleSet(rules.get(task_type, []))
+        return self._compiled[(kind, task_type)]
 
     def validate_input(self, task_type: str, input_data: Any) -> ValidationResult:
         """Validate task input data."""
-        return self._validate(task_type, input_data, self.input_rules)
+        with get_tracer().span(f"validate_input:{task_type}", "validation") as span:
+            result, cached = self._validate("input", task_type, input_data)
+            span.set(is_valid=result.is_valid, errors=len(result.errors), cached=cached)
+        return result
 
     def validate_output(self, task_type: str, output_data: Any) -> ValidationResult:
         """Validate task output data."""
-        return self._validate(task_type, output_data, self.output_rules)
+        with get_tracer().span(f"validate_output:{task_type}", "validation") as span:
+            result, cached = self._validate("output", task_type, output_data)
+            span.set(is_valid=result.is_valid, errors=len(result.errors), cached=cached)
+        return result
 
-    def _validate(
+    def validate_outputs(
+        self,
+        task_type: str,
+        outputs: Iterable[Any],
+        processes: Optional[int] = None
+    ) -> List[ValidationResult]:
+        """
+        Validate a batch of task outputs, e.g. stored outputs for analytics.
+
+        Args:
+            task_type: Task type whose output rules apply
+            outputs: Outputs to validate
+            processes: Worker processes to spread the batch over, see
+                ``CompiledRuleSet.validate_batch``
+
+        Returns:
+            One ValidationResult per output, in order
+        """
+        with get_tracer().span(f"validate_outputs:{task_type}", "validation") as span:
+            outputs = list(outputs)
+            rules = self.compiled_rules(task_type)
+            keys = [self.memo.make_key("output", task_type, rules.version, output)
+                    for output in outputs]
+            results: List[Optional[ValidationResult]] = []
+            for key in keys:
+                payload = self.memo.get(key) if key is not None else None
+                results.append(_result_from_payload(payload) if payload is not None else None)
+            misses = [index for index, result in enumerate(results) if result is None]
+            fresh = rules.validate_batch([outputs[index] for index in misses], processes)
+            for index, result in zip(misses, fresh):
+                results[index] = result
+                if keys[index] is not None:
+                    self.memo.put(keys[index], asdict(result))
+            span.set(documents=len(results), cached=len(results) - len(misses),
+                     invalid=sum(not result.is_valid for result in results))
+        return results
+
+    def begin_stream(
         self,
         task_type: str,
-        data: Any,
-        rules: Dict[str, List[ValidationRule]]
+        check_interval: int = DEFAULT_CHECK_INTERVAL
+    ) -> IncrementalValidation:
+        """Start validating a task output that is still being generated."""
+        return IncrementalValidation(list(self.output_rules.get(task_type, [])), check_interval)
+
+    def validate_stream(
+        self,
+        task_type: str,
+        chunks: Iterable[str],
+        check_interval: int = DEFAULT_CHECK_INTERVAL
     ) -> ValidationResult:
-        """Perform validation using specified rules."""
-        errors = []
-        warnings = []
+        """
+        Validate a task output from its stream of text chunks.
 
-        if task_type not in rules:
-            return ValidationResult(True, [], [])
+        Consumption stops at the first ERROR or CRITICAL violation that more
+        text cannot fix, e.g. a repetition loop; the result's ``aborted_at``
+        tells how far the stream got.
+        """
+        with get_tracer().span(f"validate_stream:{task_type}", "validation") as span:
+            validation = self.begin_stream(task_type, check_interval)
+            for chunk in chunks:
+                if validation.feed(chunk) is not None:
+                    break
+            result = validation.finish()
+            span.set(is_valid=result.is_valid, errors=len(result.errors), aborted_at=result.aborted_at)
+        return result
 
-        for rule in rules[task_type]:
-            try:
-                is_valid = rule.validator(data)
-                if not is_valid:
-                    validation_issue = {
-                        "rule_name": rule.name,
-                        "message": rule.error_message
-                    }
-                    if rule.severity == ValidationSeverity.WARNING:
-                        warnings.append(validation_issue)
-                    else:
-                        errors.append(validation_issue)
-            except Exception as e:
-                errors.append({
-                    "rule_name": rule.name,
-                    "message": f"Validation error: {str(e)}"
-                })
-
-        return ValidationResult(
-            is_valid=len(errors) == 0,
-            errors=errors,
-            warnings=warnings
+    def _validate(
+        self,
+        kind: str,
+        task_type: str,
+        data: Any
+    ) -> Tuple[ValidationResult, bool]:
+        """Perform validation using the input or output rules, via the memo."""
+        if task_type not in (self.input_rules if kind == "input" else self.output_rules):
+            return ValidationResult(True, [], []), False
+        rules = self.compiled_rules(task_type, kind)
+        key = self.memo.make_key(kind, task_type, rules.version, data)
+        payload = self.memo.get(key) if key is not None else None
+        if payload is not None:
+            return _result_from_payload(payload), True
+        result = rules.validate(data)
+        if key is not None:
+            self.memo.put(key, asdict(result))
+        return result, False
+
+class StreamingValidator(StreamListener):
+    """
+    Validates model responses while they stream, aborting degenerate ones.
+
+    Add it to a run with ``listener_scope``, so it only sees that run's
+    generations. Responses are validated against the output rules of the
+    task type named like the task; each task execution has its own buffer.
+    When a FAILS_EARLY rule of ERROR or CRITICAL severity fails, ``on_token``
+    raises a ValidationError: the stream is closed, so the server stops
+    generating, and crewai may retry the step. Aborts and clean completions
+    are recorded with ``TaskMonitor.record_validation``. Only streaming rules
+    are checked; the complete task output is still a job for
+    ``validate_output``.
+    """
+
+    def __init__(
+        self,
+        validator: TaskValidator,
+        monitor: Optional["TaskMonitor"] = None,
+        check_interval: int = DEFAULT_CHECK_INTERVAL
+    ):
+        self.validator = validator
+        self.monitor = monitor
+        self.check_interval = check_interval
+        # Keyed by the task's cancellation token too: every execution has its own token
+        self._streams: Dict[Tuple[Optional[CancellationToken], str], IncrementalValidation] = {}
+        self._lock = threading.Lock()
+
+    def _has_streaming_rules(self, task_name: str) -> bool:
+        return any(rule.streaming is StreamBehavior.FAILS_EARLY
+                   for rule in self.validator.output_rules.get(task_name, []))
+
+    @staticmethod
+    def _key(task_name: Optional[str]) -> Tuple[Optional[CancellationToken], str]:
+        return current_token(), task_name or ""
+
+    def on_start(self, task_name: Optional[str], model: str) -> None:
+        if task_name is not None and self._has_streaming_rules(task_name):
+            validation = self.validator.begin_stream(task_name, self.check_interval)
+            with self._lock:
+                self._streams[self._key(task_name)] = validation
+
+    def on_token(self, task_name: Optional[str], text: str, token_count: int) -> None:
+        key = self._key(task_name)
+        with self._lock:
+            validation = self._streams.get(key)
+        if validation is None:
+            return
+        violation = validation.feed(text)
+        if violation is None:
+            return
+        with self._lock:
+            self._streams.pop(key, None)
+        if self.monitor is not None:
+            self.monitor.record_validation(task_name, passed=False,
+                                           aborted_rule=violation["rule_name"])
+        raise ValidationError(
+            message=f"Generation stopped by validation: {violation['message']}",
+            task_name=task_name,
+            validation_errors={violation["rule_name"]: violation["message"]},
+            recovery_hint="Retry the generation, e.g. with a higher repeat_penalty"
         )
 
+    def on_complete(self, task_name: Optional[str], stats: GenerationStats) -> None:
+        with self._lock:
+            validation = self._streams.pop(self._key(task_name), None)
+        if validation is not None and self.monitor is not None:
+            self.monitor.record_validation(task_name, passed=True)
+
+def find_repetition(text: str, min_repeats: int = 4, max_period: int = 64,
+                    min_words: int = 48) -> Optional[str]:
+    """
+    Detect a generation stuck in a loop.
+
+    Looks at the words at the end of ``text`` for a block of up to
+    ``max_period`` words repeated at least ``min_repeats`` times in a row,
+    covering at least ``min_words`` words. The floor keeps short legitimate
+    repeats, such as table separators, from counting.
+
+    Returns:
+        The repeated block, or None
+    """
+    words = text[-(max_period * min_repeats * 16):].split()
+    if not words:
+        return None
+    # A loop of period p ends with the same word p words apart
+    candidates = words[-(max_period + 1):-1]
+    for offset, word in enumerate(reversed(candidates)):
+        if word != words[-1]:
+            continue
+        period = offset + 1
+        span = period * max(min_repeats, -(-min_words // period))
+        if span > len(words):
+            break
+        tail = words[-span:]
+        block = tail[-period:]
+        if all(tail[index:index + period] == block for index in range(0, span - period, period)):
+            return " ".join(block)
+    return None
+
+class NoRepetition(FeatureCheck):
+    """Passes unless the text ends in a loop; see ``find_repetition``."""
+
+    def __init__(self, **options: Any):
+        self.options = options
+
+    def evaluate(self, features: DocumentFeatures) -> bool:
+        return find_repetition(features.text, **self.options) is None
+
+class EarlyMatch(FeatureCheck):
+    """Passes when ``pattern`` occurs within the first ``within_chars`` of a text that long."""
+
+    def __init__(self, pattern: str, within_chars: int):
+        self.pattern = re.compile(pattern, re.MULTILINE)
+        self.within_chars = within_chars
+
+    def evaluate(self, features: DocumentFeatures) -> bool:
+        return (len(features.text) < self.within_chars
+                or self.pattern.search(features.text, 0, self.within_chars) is not None)
+
+class HasFeedback(FeatureCheck):
+    """
+    Passes when a review has feedback points.
+
+    Accepts the structured review (its ``feedback`` list, as a dict or JSON
+    text) or a text review with bullet or numbered points.
+    """
+    _POINT = re.compile(r"^\s*(?:[-*\u2022]|\d+[.)])\s+\S", re.MULTILINE)
+
+    def __call__(self, data: Any) -> bool:
+        if isinstance(data, dict):
+            return bool(data.get("feedback"))
+        return super().__call__(data)
+
+    def evaluate(self, features: DocumentFeatures) -> bool:
+        text = features.text.strip()
+        if text.startswith("{"):
+            try:
+                data = json.loads(text)
+            except ValueError:
+                data = None
+            if isinstance(data, dict):
+                return bool(data.get("feedback"))
+        return self._POINT.search(text) is not None
+
+def repetition_rule(severity: ValidationSeverity = ValidationSeverity.ERROR,
+                    **options: Any) -> ValidationRule:
+    """Rule that fails on degenerate, looping output; see ``find_repetition`` for options."""
+    return ValidationRule(
+        name="no_repetition_loop",
+        description="Check that the output does not repeat the same text over and over",
+        validator=NoRepetition(**options),
+        error_message="Output is stuck repeating the same text",
+        severity=severity,
+        streaming=StreamBehavior.FAILS_EARLY
+    )
+
+def format_rule(pattern: str, within_chars: int = 2000,
+                severity: ValidationSeverity = ValidationSeverity.ERROR,
+                name: str = "expected_format") -> ValidationRule:
+    """
+    Rule that fails when ``pattern`` does not occur within the first ``within_chars``.
+
+    Useful to catch off-format output early, e.g. ``r"^#{1,3} "`` for
+    Markdown sections. The pattern is matched in multiline mode.
+    """
+    return ValidationRule(
+        name=name,
+        description=f"Check that the output matches {pattern!r} early on",
+        validator=EarlyMatch(pattern, within_chars),
+        error_message=f"Output does not follow the expected format ({pattern})",
+        severity=severity,
+        streaming=StreamBehavior.FAILS_EARLY
+    )
+
 # Example validation rules
 def create_common_validation_rules() -> Dict[str, List[ValidationRule]]:
     """Create common validation rules for different task types."""
@@ -98,39 +681,45 @@ def create_common_validation_rules() -> Dict[str, List[ValidationRule]]:
             ValidationRule(
                 name="non_empty_requirements",
                 description="Check if requirements specification is not empty",
-                validator=lambda x: bool(x and x.strip()),
+                validator=NonEmpty(),
                 error_message="Requirements specification cannot be empty",
-                severity=ValidationSeverity.ERROR
+                severity=ValidationSeverity.ERROR,
+                streaming=StreamBehavior.SATISFIED_EARLY
             ),
             ValidationRule(
                 name="min_requirements_length",
                 description="Check if requirements have sufficient detail",
-                validator=lambda x: len(x.split()) >= 50,
+                validator=MinWords(50),
                 error_message="Requirements specification seems too brief",
-                severity=ValidationSeverity.WARNING
-            )
+                severity=ValidationSeverity.WARNING,
+                streaming=StreamBehavior.SATISFIED_EARLY
+            ),
+            repetition_rule()
         ],
         "architecture_design": [
             ValidationRule(
                 name="has_components",
                 description="Check if architecture design includes component definitions",
-                validator=lambda x: "components" in x.lower(),
+                validator=ContainsKeyword("components"),
                 error_message="Architecture design must include component definitions",
-                severity=ValidationSeverity.ERROR
+                severity=ValidationSeverity.ERROR,
+                streaming=StreamBehavior.SATISFIED_EARLY
             ),
             ValidationRule(
                 name="has_interfaces",
                 description="Check if architecture design includes interface definitions",
-                validator=lambda x: "interface" in x.lower(),
+                validator=ContainsKeyword("interface"),
                 error_message="Architecture design should include interface definitions",
-                severity=ValidationSeverity.WARNING
-            )
+                severity=ValidationSeverity.WARNING,
+                streaming=StreamBehavior.SATISFIED_EARLY
+            ),
+            repetition_rule()
         ],
         "code_review": [
             ValidationRule(
                 name="has_feedback",
                 description="Check if code review includes specific feedback",
-                validator=lambda x: len(x.get("feedback", [])) > 0,
+                validator=HasFeedback(),
                 error_message="Code review must include specific feedback points",
                 severity=ValidationSeverity.ERROR
             )
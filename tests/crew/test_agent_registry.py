@@ -0,0 +1,46 @@
+"""
+Tests for lazy agent construction through the agent registry.
+"""
+import subprocess
+import sys
+
+from src.agents.agent_definitions import AGENT_SPECS, AgentRegistry, DevCrewAgents, DevTeamAgents
+
+
+def make_registry():
+    built = []
+
+    def factory(spec):
+        built.append(spec.role)
+        return object()
+
+    return AgentRegistry(factory=factory), built
+
+
+def test_agents_are_built_on_first_access_and_shared():
+    registry, built = make_registry()
+    team = DevTeamAgents(registry)
+
+    assert len(team) == 2
+    assert built == []
+
+    developer = team.developer
+    assert team.developer is developer
+    assert built == ["Software Developer"]
+    assert not registry.is_built("qa_engineer")
+
+
+def test_dev_crew_agents_cover_every_registered_agent():
+    registry, _ = make_registry()
+    team = DevCrewAgents(registry)
+
+    assert sorted(team.MEMBERS) == sorted(AGENT_SPECS)
+    assert len(team.get_all_agents()) == len(AGENT_SPECS)
+
+
+def test_importing_entry_points_does_not_import_crewai():
+    code = (
+        "import sys, src.main, src.main_interface, src.script_generator; "
+        "sys.exit('crewai' in sys.modules)"
+    )
+    assert subprocess.run([sys.executable, "-c", code], check=False).returncode == 0
@@ -0,0 +1,62 @@
+"""
+Tests for headless batch planning.
+"""
+import json
+import threading
+import time
+
+from src.batch_planner import BatchItem, BatchPlanner, load_batch_items
+
+
+class FakeCrew:
+    calls = []
+    lock = threading.Lock()
+
+    def __init__(self):
+        self.last_run_id = None
+
+    def create_development_plan(self, description, parallel=False, max_concurrency=4):
+        with self.lock:
+            self.calls.append(description)
+        time.sleep(0.01)
+        if "explode" in description:
+            raise RuntimeError("model unavailable")
+        self.last_run_id = f"run-{len(description)}"
+        return f"plan for {description.strip()}"
+
+
+def test_load_batch_items_supports_request_layout(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    path.write_text(
+        json.dumps({"request_id": "user-001", "title": "Todo app", "body": "With login"}) + "\n"
+        + "\n"
+        + json.dumps({"id": 7, "project_description": "Image editor"}) + "\n"
+    )
+    items = load_batch_items(str(path))
+    assert [(item.item_id, item.description) for item in items] == [
+        ("user-001", "Todo app\n\nWith login"),
+        ("7", "Image editor")
+    ]
+
+
+def test_batch_coalesces_identical_descriptions(tmp_path):
+    FakeCrew.calls = []
+    items = [
+        BatchItem("a", "Todo app"),
+        BatchItem("b", "  Todo   app "),
+        BatchItem("c", "Chat app"),
+        BatchItem("d", "explode please")
+    ]
+    output = tmp_path / "plans.jsonl"
+    report = BatchPlanner(workers=2, crew_factory=FakeCrew).run(items, str(output))
+
+    assert sorted(FakeCrew.calls) == ["Chat app", "Todo app", "explode please"]
+    records = {record["id"]: record for record in map(json.loads, output.read_text().splitlines())}
+    assert records["b"]["coalesced_with"] == "a"
+    assert records["b"]["result"] == records["a"]["result"]
+    assert records["d"]["status"] == "error"
+
+    assert (report.total_items, report.unique_plans) == (4, 3)
+    assert (report.succeeded, report.failed) == (3, 1)
+    assert report.plans_per_hour > 0
+    assert report.to_dict()["latency_s"]["count"] == 3
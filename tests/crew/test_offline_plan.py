@@ -0,0 +1,193 @@
+"""
+Runs a complete development plan against the stub backend, without Ollama.
+"""
+import src.config.config as config
+from src.agents.agent_definitions import AgentRegistry, DevCrewAgents
+from src.llm.crew_llm import StreamingOllamaLLM
+from src.llm.stub_backend import StubOllamaClient, StubSettings
+from src.main import DevCrew
+
+
+def test_development_plan_runs_offline(monkeypatch, tmp_path):
+    llm = StreamingOllamaLLM(
+        model="llama2",
+        routing=config.get_model_routing(),
+        client=StubOllamaClient(StubSettings(output_tokens=96))
+    )
+    monkeypatch.setattr(config, "_llm", llm)
+
+    crew = DevCrew(cache=False, runs_dir=str(tmp_path))
+    crew.agents = DevCrewAgents(AgentRegistry())
+    result = crew.create_development_plan("A bakery ordering site", parallel=True)
+
+    assert len(result.tasks_output) == 16
+    assert all(output.raw.startswith("## ") for output in result.tasks_output)
+    assert llm.stats.get_task_stats("development")["calls"] == 1
+
+
+def test_development_plan_trace(monkeypatch, tmp_path):
+    import json
+    from src.utils import tracing
+
+    llm = StreamingOllamaLLM(
+        model="llama2",
+        routing=config.get_model_routing(),
+        client=StubOllamaClient(StubSettings(output_tokens=32))
+    )
+    monkeypatch.setattr(config, "_llm", llm)
+    monkeypatch.setattr(tracing, "_tracer", tracing.Tracer())
+    trace_path = tmp_path / "trace.json"
+    monkeypatch.setenv(tracing.TRACE_FILE_ENV, str(trace_path))
+
+    crew = DevCrew(cache=False, runs_dir=None)
+    crew.agents = DevCrewAgents(AgentRegistry())
+    crew.create_development_plan("A bakery ordering site", parallel=True)
+
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    tasks = {event["name"]: event for event in events if event.get("cat") == "task"}
+    llm_calls = [event for event in events if event.get("cat") == "llm"]
+    assert len(tasks) == 16
+    assert tasks["qa"]["args"]["dependencies"] == ["requirements_spec", "development"]
+    assert tasks["qa"]["ts"] >= tasks["development"]["ts"] + tasks["development"]["dur"]
+    assert len(llm_calls) >= 16
+    # Every model call is nested inside the span of the task that made it
+    for call in llm_calls:
+        task = tasks[call["args"]["task"]]
+        assert call["tid"] == task["tid"]
+        assert task["ts"] <= call["ts"] <= task["ts"] + task["dur"]
+
+
+def test_task_deadline_cancels_run_and_resume_finishes_it(monkeypatch, tmp_path):
+    import pytest
+    from src.utils.checkpoint import RunCheckpoint
+    from src.utils.error_types import TaskCancelledError
+
+    llm = StreamingOllamaLLM(
+        model="llama2",
+        routing=config.get_model_routing(),
+        client=StubOllamaClient(StubSettings(output_tokens=400, tokens_per_second=200))
+    )
+    monkeypatch.setattr(config, "_llm", llm)
+
+    crew = DevCrew(cache=False, runs_dir=str(tmp_path), task_timeouts={"requirements_spec": 0.2})
+    crew.agents = DevCrewAgents(AgentRegistry())
+    with pytest.raises(TaskCancelledError):
+        crew.create_development_plan("A bakery ordering site")
+
+    checkpoint = RunCheckpoint.load(crew.last_run_id, str(tmp_path))
+    manifest = checkpoint.manifest
+    assert manifest["status"] == "cancelled"
+    assert manifest["failures"]["requirements_spec"]["category"] == "timeout_error"
+    assert checkpoint.load_partial_output("requirements_spec")
+
+    crew.task_timeouts = {}
+    llm.client.settings.tokens_per_second = 0.0
+    result = crew.resume(crew.last_run_id)
+    assert len(result.tasks_output) == 16
+
+
+def test_json_output_mode_passes_selected_fields(monkeypatch, tmp_path):
+    import json
+    import src.main as main
+    from src.tasks.output_schemas import TASK_OUTPUT_SCHEMAS
+    from src.tasks.task_definitions import OutputMode
+    from src.utils.scheduler import CONTEXT_DIVIDER
+
+    llm = StreamingOllamaLLM(
+        model="llama2",
+        routing=config.get_model_routing(),
+        client=StubOllamaClient(StubSettings(output_tokens=400))
+    )
+    monkeypatch.setattr(config, "_llm", llm)
+    contexts = {}
+    execute_task = main.execute_task
+
+    def recording_runner(task, context, **kwargs):
+        contexts[task.name] = context
+        return execute_task(task, context, **kwargs)
+
+    monkeypatch.setattr(main, "execute_task", recording_runner)
+
+    crew = DevCrew(cache=False, runs_dir=str(tmp_path), output_mode=OutputMode.JSON)
+    crew.agents = DevCrewAgents(AgentRegistry())
+    result = crew.create_development_plan("A bakery ordering site", parallel=True)
+
+    assert len(result.tasks_output) == 16
+    for output in result.tasks_output:
+        schema = TASK_OUTPUT_SCHEMAS[output.name]
+        assert output.json_dict is not None
+        schema.model_validate(output.json_dict)
+        assert json.loads(output.raw) == output.json_dict
+    sources = dict(part.split(": ", 1) for part in contexts["qa"].split(CONTEXT_DIVIDER))
+    assert set(json.loads(sources["development"])) == {"code_structure", "implementation_steps"}
+    assert set(json.loads(sources["requirements_spec"])) == {"functional", "non_functional"}
+
+
+def test_resume_keeps_the_runs_output_mode(monkeypatch, tmp_path):
+    import pytest
+    from src.tasks.task_definitions import OutputMode, PromptLayout
+    from src.utils.error_types import TaskCancelledError
+
+    llm = StreamingOllamaLLM(
+        model="llama2",
+        routing=config.get_model_routing(),
+        client=StubOllamaClient(StubSettings(output_tokens=400, tokens_per_second=400))
+    )
+    monkeypatch.setattr(config, "_llm", llm)
+
+    crew = DevCrew(cache=False, runs_dir=str(tmp_path), output_mode=OutputMode.JSON,
+                   prompt_layout=PromptLayout.STATIC_FIRST, task_timeouts={"qa": 0.05})
+    crew.agents = DevCrewAgents(AgentRegistry())
+    with pytest.raises(TaskCancelledError):
+        crew.create_development_plan("A bakery ordering site", parallel=True)
+
+    llm.client.settings.tokens_per_second = 0.0
+    resumed = DevCrew(cache=False, runs_dir=str(tmp_path))  # Text mode by default
+    resumed.agents = DevCrewAgents(AgentRegistry())
+    result = resumed.resume(crew.last_run_id)
+
+    assert resumed.tasks.output_mode is OutputMode.JSON
+    assert resumed.tasks.prompt_layout is PromptLayout.STATIC_FIRST
+    assert all(output.json_dict is not None for output in result.tasks_output)
+
+
+def test_sequential_plan_matches_crew_kickoff(monkeypatch, tmp_path):
+    from crewai import Crew
+    from crewai.types.usage_metrics import UsageMetrics
+
+    llm = StreamingOllamaLLM(
+        model="llama2",
+        routing=config.get_model_routing(),
+        client=StubOllamaClient(StubSettings(output_tokens=48))
+    )
+    monkeypatch.setattr(config, "_llm", llm)
+    callbacks = []
+
+    def with_callbacks(tasks):
+        for task in tasks:
+            task.callback = lambda output, name=task.name: callbacks.append(name)
+        return tasks
+
+    # Kickoff binds the agents to its crew, so each path gets agents of its own
+    crew = DevCrew(cache=False, runs_dir=None)
+    crew.agents = DevCrewAgents(AgentRegistry())
+    tasks = with_callbacks(crew._create_development_tasks("A bakery ordering site"))
+    expected = Crew(agents=crew.agents.get_all_agents(), tasks=tasks).kickoff()
+    expected_callbacks = list(callbacks)
+    callbacks.clear()
+
+    crew = DevCrew(cache=False, runs_dir=str(tmp_path))
+    crew.agents = DevCrewAgents(AgentRegistry())
+    create_tasks = crew._create_development_tasks
+    monkeypatch.setattr(crew, "_create_development_tasks",
+                        lambda description: with_callbacks(create_tasks(description)))
+    result = crew.create_development_plan("A bakery ordering site", parallel=False)
+
+    assert callbacks == expected_callbacks == [task.name for task in tasks]
+    assert result.raw == expected.raw
+    assert result.json_dict == expected.json_dict
+    assert [output.model_dump() for output in result.tasks_output] == [
+        output.model_dump() for output in expected.tasks_output
+    ]
+    assert isinstance(result.token_usage, UsageMetrics)
+    assert result.token_usage.successful_requests == 16
@@ -0,0 +1,36 @@
+"""
+Tests for the static-first prompt layout of DevTeamTasks.
+"""
+from crewai import Agent
+
+from src.tasks.task_definitions import DevTeamTasks, PromptLayout
+
+
+def make_agent():
+    return Agent(role="Planner", goal="Plan projects", backstory="Veteran PM", llm="ollama/llama2")
+
+
+def test_static_first_puts_inputs_last():
+    tasks = DevTeamTasks(prompt_layout=PromptLayout.STATIC_FIRST)
+    task = tasks.create_project_planning_task(make_agent(), "SPEC TEXT", "BACKLOG TEXT")
+
+    assert task.description.rstrip().endswith("Product Backlog: BACKLOG TEXT")
+    assert task.description.index("Deliverables:") < task.description.index("SPEC TEXT")
+    assert task.expected_output == DevTeamTasks.STATIC_FIRST_EXPECTED_OUTPUT
+
+
+def test_static_first_prefix_is_shared_across_projects():
+    tasks = DevTeamTasks(prompt_layout=PromptLayout.STATIC_FIRST)
+    agent = make_agent()
+    first = tasks.create_requirements_specification_task(agent, "A bakery ordering site")
+    second = tasks.create_requirements_specification_task(agent, "A library reservation app")
+
+    static_part = first.description[:first.description.index("Inputs:")]
+    assert second.description.startswith(static_part)
+
+
+def test_inline_layout_keeps_inputs_after_intro():
+    task = DevTeamTasks(prompt_layout=PromptLayout.INLINE).create_project_planning_task(
+        make_agent(), "SPEC TEXT", "BACKLOG TEXT"
+    )
+    assert task.description.splitlines()[1].strip() == "Requirements Specification: SPEC TEXT"
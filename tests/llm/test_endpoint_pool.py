@@ -0,0 +1,129 @@
+"""
+Tests for load balancing and ejection in the Ollama endpoint pool.
+"""
+import pytest
+import requests
+
+from src.llm.endpoint_pool import EndpointPool
+from src.llm.ollama_client import OllamaError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeClient:
+    def __init__(self, url, fail_with=None):
+        self.url = url
+        self.fail_with = fail_with
+        self.calls = 0
+
+    def chat_stream(self, **kwargs):
+        self.calls += 1
+        if self.fail_with:
+            raise self.fail_with
+        yield {"message": {"content": self.url}, "done": True}
+
+
+def make_pool(urls, failing=(), clock=None):
+    clients = {}
+
+    def factory(url):
+        error = requests.exceptions.ConnectTimeout("timed out") if url in failing else None
+        clients[url] = FakeClient(url, fail_with=error)
+        return clients[url]
+
+    pool = EndpointPool(urls, eject_seconds=30, client_factory=factory, clock=clock or FakeClock())
+    return pool, clients
+
+
+def test_requests_go_to_least_loaded_endpoint():
+    pool, _ = make_pool(["http://a", "http://b"])
+    first = pool.acquire()
+    second = pool.acquire()
+    assert {first.url, second.url} == {"http://a", "http://b"}
+
+    pool.release(first, latency=0.1)
+    pool.release(second, latency=2.0)
+    assert pool.acquire().url == first.url
+
+
+def test_timed_out_endpoint_is_ejected_and_request_retried():
+    clock = FakeClock()
+    pool, clients = make_pool(["http://a", "http://b"], failing={"http://a"}, clock=clock)
+
+    for _ in range(3):
+        chunks = list(pool.chat_stream(model="llama2", messages=[]))
+        assert chunks[0]["message"]["content"] == "http://b"
+
+    assert clients["http://a"].calls == 1
+    status = {entry["url"]: entry for entry in pool.status()}
+    assert not status["http://a"]["healthy"]
+    assert status["http://b"]["in_flight"] == 0
+
+    clock.now = 31
+    assert pool.status()[0]["healthy"]
+
+
+def test_pool_raises_the_last_endpoints_error():
+    pool, clients = make_pool(["http://a"], failing={"http://a"})
+    with pytest.raises(requests.exceptions.ConnectTimeout):
+        list(pool.chat_stream(model="llama2", messages=[]))
+
+    # The only endpoint is not ejected, so the next request reaches it too
+    assert pool.status()[0]["circuit"] == "closed"
+    with pytest.raises(requests.exceptions.ConnectTimeout):
+        list(pool.chat_stream(model="llama2", messages=[]))
+    assert clients["http://a"].calls == 2
+
+
+def test_last_available_endpoint_is_not_ejected():
+    pool, _ = make_pool(["http://a", "http://b"], failing={"http://a", "http://b"})
+    with pytest.raises(requests.exceptions.ConnectTimeout):
+        list(pool.chat_stream(model="llama2", messages=[]))
+
+    assert [entry["circuit"] for entry in pool.status()] == ["open", "closed"]
+
+
+def test_retries_reach_a_single_endpoint_and_report_the_timeout():
+    from src.llm.crew_llm import StreamingOllamaLLM
+    from src.llm.resilience import RetryPolicy
+    from src.utils.error_types import ErrorCategory, TaskExecutionError
+
+    pool, clients = make_pool(["http://a"], failing={"http://a"})
+    llm = StreamingOllamaLLM(model="llama2", client=pool,
+                             retry_policy=RetryPolicy(max_attempts=3, base_delay=0))
+
+    with pytest.raises(TaskExecutionError) as raised:
+        llm.call("hi")
+
+    assert clients["http://a"].calls == 3
+    assert raised.value.category is ErrorCategory.TIMEOUT_ERROR
+    assert isinstance(raised.value.__cause__, requests.exceptions.ConnectTimeout)
+
+
+def test_endpoints_refusing_a_request_are_skipped(monkeypatch):
+    pool, _ = make_pool(["http://a", "http://b"])
+    fast, slow = pool.acquire(), pool.acquire()
+    pool.release(fast, latency=0.1)
+    pool.release(slow, latency=2.0)
+    # The circuit opened after the availability check, e.g. on another thread
+    monkeypatch.setattr(fast.breaker, "acquire", lambda: False)
+
+    assert pool.acquire() is slow
+    assert fast.in_flight == 0
+
+    monkeypatch.setattr(slow.breaker, "acquire", lambda: False)
+    with pytest.raises(OllamaError):
+        pool.acquire()
+    assert slow.in_flight == 1
+
+
+def test_from_env_reads_endpoint_list(monkeypatch):
+    monkeypatch.setenv("OLLAMA_ENDPOINTS", "http://a:11434, http://b:11434/")
+    pool = EndpointPool.from_env()
+    assert [endpoint.url for endpoint in pool.endpoints] == ["http://a:11434", "http://b:11434"]
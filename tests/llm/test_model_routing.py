@@ -0,0 +1,112 @@
+"""
+Tests for routing tasks to model tiers.
+"""
+import json
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pytest
+
+from src.config.model_config import DEFAULT_CONFIGS, ModelType
+from src.config.model_routing import ModelRouting, ModelTier
+from src.llm.crew_llm import StreamingOllamaLLM
+from src.utils.context_budget import ContextBudgetManager
+from src.utils.scheduler import TaskScheduler
+
+
+# Tiers of a deployment that opted into a smaller and a larger model
+TIERED = {
+    ModelTier.SMALL: replace(DEFAULT_CONFIGS[ModelType.LLAMA2], temperature=0.3),
+    ModelTier.LARGE: DEFAULT_CONFIGS[ModelType.MISTRAL]
+}
+
+
+class RecordingClient:
+    def __init__(self):
+        self.requests = []
+
+    def chat_stream(self, model, messages, options=None, keep_alive=None, format=None):
+        self.requests.append({"model": model, "options": options})
+        yield {"message": {"content": "ok"}, "done": False}
+        yield {"message": {"content": ""}, "done": True, "prompt_eval_count": 10,
+               "eval_count": 4, "eval_duration": 1_000_000_000}
+
+
+def test_env_overrides_tier_models_and_task_tiers(monkeypatch):
+    monkeypatch.setenv("DEVCREW_TIER_SMALL", "llama3.2:1b")
+    monkeypatch.setenv("DEVCREW_TIER_LARGE", "mistral:7b")
+    monkeypatch.setenv("DEVCREW_TASK_TIERS", "qa=large, development=standard")
+    routing = ModelRouting.from_env()
+
+    assert routing.config_for("git_workflow").model_name == "llama3.2:1b"
+    assert routing.config_for("qa").model_name == "mistral:7b"
+    assert routing.config_for("qa").context_length == 8192
+    assert routing.tier_for("qa") is ModelTier.LARGE
+    assert routing.tier_for("development") is ModelTier.STANDARD
+    assert routing.tier_for("unknown_task") is ModelTier.STANDARD
+
+
+def test_default_tiers_keep_the_crew_model(monkeypatch):
+    for tier in ModelTier:
+        monkeypatch.delenv(f"DEVCREW_TIER_{tier.name}", raising=False)
+    client = RecordingClient()
+    llm = StreamingOllamaLLM(model="llama2", routing=ModelRouting.from_env(), client=client)
+
+    for name in ("git_workflow", "qa", "architecture_design"):
+        llm.call("hi", from_task=SimpleNamespace(name=name))
+
+    assert {request["model"] for request in client.requests} == {"llama2"}
+    assert {request["options"]["num_ctx"] for request in client.requests} == {4096}
+    assert {request["options"]["temperature"] for request in client.requests} == {0.7}
+    # Left to Ollama's default, as before tiers existed
+    assert not any("top_p" in request["options"] for request in client.requests)
+
+
+def test_llm_sends_each_task_to_its_tier_model():
+    client = RecordingClient()
+    llm = StreamingOllamaLLM(model="llama2", routing=ModelRouting(TIERED), client=client)
+
+    llm.call("hi", from_task=SimpleNamespace(name="git_workflow"))
+    llm.call("hi", from_task=SimpleNamespace(name="architecture_design"))
+
+    small, large = client.requests
+    assert small["model"] == "llama2"
+    assert small["options"]["temperature"] == pytest.approx(0.3)
+    assert large["model"] == "mistral"
+    assert large["options"]["num_ctx"] == 8192
+
+
+def test_tier_report_groups_task_stats():
+    client = RecordingClient()
+    routing = ModelRouting(TIERED)
+    llm = StreamingOllamaLLM(model="llama2", routing=routing, client=client)
+    for name in ("git_workflow", "sprint_report", "development"):
+        llm.call("hi", from_task=SimpleNamespace(name=name))
+
+    report = routing.tier_report(llm.stats.get_all_stats())
+
+    assert report["small"]["calls"] == 2
+    assert sorted(report["small"]["tasks"]) == ["git_workflow", "sprint_report"]
+    assert report["large"]["model"] == "mistral"
+    assert report["large"]["completion_tokens"] == 4
+    assert report["large"]["tokens_per_second"] == pytest.approx(4.0)
+    json.dumps(report)
+
+
+def test_context_budget_uses_routed_context_window():
+    llm = StreamingOllamaLLM(model="llama2", routing=ModelRouting(TIERED), client=RecordingClient())
+    manager = ContextBudgetManager.from_llm(llm)
+
+    def task(name):
+        return SimpleNamespace(name=name, description="", expected_output="", agent=None)
+
+    assert manager.context_budget(task("development")) - manager.context_budget(task("qa")) == 8192 - 4096
+
+
+def test_context_window_size_follows_the_running_task():
+    llm = StreamingOllamaLLM(model="llama2", routing=ModelRouting(TIERED), client=RecordingClient())
+    tasks = [SimpleNamespace(name=name, context=[]) for name in ("qa", "development")]
+    scheduler = TaskScheduler(runner=lambda task, context: llm.get_context_window_size())
+
+    assert scheduler.run(tasks) == [4096, 8192]
+    assert llm.get_context_window_size() == 4096
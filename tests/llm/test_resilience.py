@@ -0,0 +1,174 @@
+"""
+Tests for retrying LLM calls and circuit breaking per endpoint.
+"""
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from src.llm.crew_llm import StreamingOllamaLLM
+from src.llm.endpoint_pool import EndpointPool
+from src.llm.ollama_client import OllamaError
+from src.llm.resilience import (
+    CircuitBreaker,
+    CircuitState,
+    ErrorReporter,
+    RetryPolicy,
+    classify_llm_error
+)
+from src.utils.error_handler import ErrorHandler
+from src.utils.error_types import ErrorCategory, ModelExecutionError, TaskExecutionError
+from src.utils.metrics import DevCrewMetrics
+from src.utils.monitor import TaskMonitor
+from src.utils.tracing import Tracer
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0.0)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FlakyClient:
+    """Raises the queued errors one per request, then answers."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def chat_stream(self, model, messages, options=None, keep_alive=None, format=None):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        yield {"message": {"content": "ok"}, "done": True, "eval_count": 1}
+
+
+def test_failures_are_classified_by_cause():
+    timeout = classify_llm_error(requests.exceptions.ReadTimeout("slow"), "qa", "llama2")
+    busy = classify_llm_error(OllamaError("server busy", status_code=503), "qa", "llama2")
+    crashed = classify_llm_error(OllamaError("runner died", status_code=500), "qa", "llama2")
+    missing = classify_llm_error(OllamaError("model not found", status_code=404), "qa", "llama2")
+
+    assert timeout.category is ErrorCategory.TIMEOUT_ERROR
+    assert busy.category is ErrorCategory.RESOURCE_ERROR
+    assert isinstance(crashed, ModelExecutionError) and crashed.context["retryable"]
+    assert isinstance(missing, ModelExecutionError) and not missing.context["retryable"]
+
+
+def test_retry_delays_grow_exponentially_with_full_jitter():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    assert [policy.delay(attempt, rng=lambda: 1.0) for attempt in (1, 2, 3, 4)] == [1, 2, 4, 5]
+    assert policy.delay(3, rng=lambda: 0.5) == 2.0
+
+
+def test_transient_failures_are_retried_and_reported():
+    client = FlakyClient(requests.exceptions.ConnectionError("refused"),
+                         OllamaError("server busy", status_code=503))
+    llm = StreamingOllamaLLM(model="llama2", client=client, retry_policy=NO_WAIT)
+    handler = ErrorHandler()
+    monitor = TaskMonitor(tracer=Tracer(enabled=False), metrics=DevCrewMetrics())
+    llm.add_listener(ErrorReporter(handler))
+    llm.add_listener(monitor)
+
+    monitor.start_task("qa")
+    assert llm.call("hi", from_task=SimpleNamespace(name="qa")) == "ok"
+
+    assert client.calls == 3
+    summary = handler.get_error_summary()
+    assert summary["errors_by_category"] == {"resource_error": 2}
+    assert summary["recovery_attempts"] == {"attempted": 1, "total": 2}
+    metrics = monitor.task_metrics["qa"]
+    assert (metrics.error_count, metrics.recovery_attempts, metrics.successful_recoveries) == (2, 1, 1)
+
+
+def test_error_reporter_only_sees_its_own_runs_retries():
+    from src.llm.streaming import listener_scope
+    from src.utils.scheduler import TaskScheduler
+
+    client = FlakyClient(OllamaError("server busy", status_code=503))
+    llm = StreamingOllamaLLM(model="llama2", client=client, retry_policy=NO_WAIT)
+    handler = ErrorHandler()
+    scheduler = TaskScheduler(runner=lambda task, context: llm.call("hi", from_task=task))
+
+    with listener_scope(ErrorReporter(handler)):
+        scheduler.run([SimpleNamespace(name="qa", context=None)])  # Runs on a worker thread
+    client.errors.append(OllamaError("server busy", status_code=503))
+    llm.call("hi", from_task=SimpleNamespace(name="qa"))  # Another run's call
+
+    assert client.calls == 4
+    assert handler.get_error_summary()["errors_by_category"] == {"resource_error": 1}
+
+
+def test_concurrent_listener_registration_keeps_every_listener():
+    from concurrent.futures import ThreadPoolExecutor
+
+    llm = StreamingOllamaLLM(model="llama2", client=FlakyClient())
+    listeners = [ErrorReporter(ErrorHandler()) for _ in range(200)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(llm.add_listener, listeners))
+
+    assert len(llm.listeners) == 201
+
+
+def test_permanent_failures_are_not_retried():
+    client = FlakyClient(OllamaError("model not found", status_code=404))
+    llm = StreamingOllamaLLM(model="llama2", client=client, retry_policy=NO_WAIT)
+
+    with pytest.raises(ModelExecutionError):
+        llm.call("hi", from_task=SimpleNamespace(name="qa"))
+    assert client.calls == 1
+
+
+def test_giving_up_raises_the_classified_error():
+    client = FlakyClient(*[requests.exceptions.ReadTimeout("slow")] * 3)
+    llm = StreamingOllamaLLM(model="llama2", client=client, retry_policy=NO_WAIT)
+
+    with pytest.raises(TaskExecutionError) as raised:
+        llm.call("hi", from_task=SimpleNamespace(name="qa"))
+    assert raised.value.category is ErrorCategory.TIMEOUT_ERROR
+    assert client.calls == 3
+
+
+def test_circuit_opens_after_repeated_failures_and_probes_once():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+    assert not breaker.acquire()
+
+    clock.now = 10
+    assert breaker.acquire()
+    assert not breaker.acquire()  # Only one probe at a time
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+    clock.now = 20
+    assert breaker.acquire()
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_pool_ejects_endpoint_returning_server_errors():
+    clock = FakeClock()
+    clients = {
+        "http://a": FlakyClient(*[OllamaError("server busy", status_code=503)] * 2),
+        "http://b": FlakyClient()
+    }
+    pool = EndpointPool(list(clients), eject_seconds=30, failure_threshold=2,
+                        client_factory=clients.get, clock=clock)
+    # Make "a" the preferred endpoint until its circuit opens
+    pool.endpoints[1].latency = 5.0
+    pool.endpoints[0].latency = 0.1
+
+    for _ in range(2):
+        with pytest.raises(OllamaError):
+            list(pool.chat_stream(model="llama2", messages=[]))
+    list(pool.chat_stream(model="llama2", messages=[]))
+
+    assert clients["http://b"].calls == 1
+    assert pool.status()[0]["circuit"] == "open"
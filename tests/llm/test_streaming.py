@@ -0,0 +1,153 @@
+"""
+Tests for streamed generation, statistics and token-based progress.
+"""
+import json
+
+import pytest
+
+from src.llm.ollama_client import OllamaClient, OllamaError
+from src.llm.streaming import GenerationStats, GenerationStatsRecorder, stream_generation
+from src.utils.progress_tracker import ProgressManager
+
+
+def make_chunks(words, prompt_tokens=12, eval_count=None):
+    chunks = [{"message": {"content": word}, "done": False} for word in words]
+    chunks.append({
+        "message": {"content": ""},
+        "done": True,
+        "prompt_eval_count": prompt_tokens,
+        "prompt_eval_duration": 200_000_000,
+        "eval_count": len(words) if eval_count is None else eval_count,
+        "eval_duration": 500_000_000
+    })
+    return chunks
+
+
+class FakeResponse:
+    def __init__(self, status_code, lines):
+        self.status_code = status_code
+        self.lines = lines
+        self.text = "\n".join(lines)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def iter_lines(self):
+        return iter(line.encode() for line in self.lines)
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.payloads = []
+
+    def post(self, url, json=None, stream=False, timeout=None):
+        self.payloads.append(json)
+        return self.response
+
+
+def test_stream_generation_collects_text_and_stats():
+    recorder = GenerationStatsRecorder()
+    text, stats = stream_generation(
+        make_chunks(["Hello", " world"]), "llama2", "requirements_spec", [recorder]
+    )
+
+    assert text == "Hello world"
+    assert stats.prompt_tokens == 12
+    assert stats.completion_tokens == 2
+    assert stats.time_to_first_token is not None
+    assert stats.tokens_per_second == pytest.approx(4.0)
+
+    task_stats = recorder.get_task_stats("requirements_spec")
+    assert task_stats["calls"] == 1
+    assert task_stats["tokens_per_second"] == pytest.approx(4.0)
+
+
+def test_token_counts_come_from_the_final_chunk():
+    manager = ProgressManager()
+    manager.add_task("development", estimated_duration=600, token_budget=8)
+    # Chunks may carry several tokens each
+    _, stats = stream_generation(
+        make_chunks(["Hello world", "!"], eval_count=3), "llama2", "development", [manager]
+    )
+
+    assert stats.chunk_count == 2
+    assert stats.completion_tokens == 3
+    assert manager.tasks["development"][1].tokens_generated == 3
+
+
+def test_recorder_keeps_time_to_first_token_of_every_call():
+    recorder = GenerationStatsRecorder()
+    for seconds in (0.5, 1.5):
+        recorder.on_complete("qa", GenerationStats(model="llama2", time_to_first_token=seconds))
+    recorder.on_complete("qa", GenerationStats(model="llama2"))
+
+    task_stats = recorder.get_task_stats("qa")
+    assert task_stats["time_to_first_token"] == pytest.approx(2.0)
+    assert task_stats["avg_time_to_first_token"] == pytest.approx(1.0)
+    assert task_stats["last_time_to_first_token"] == pytest.approx(1.5)
+
+
+def test_progress_follows_streamed_tokens():
+    manager = ProgressManager()
+    manager.add_task("development", estimated_duration=600, token_budget=4)
+
+    stream_generation(make_chunks(["a", "b"]), "llama2", "development", [manager])
+    tracker = manager.tasks["development"][1]
+
+    assert tracker.is_running
+    assert tracker.progress == pytest.approx(0.5)
+    assert tracker.tokens_per_second == pytest.approx(4.0)
+
+    manager.complete_task("development")
+    assert tracker.progress == 1.0
+
+
+def test_client_streams_chunks_and_sends_options():
+    lines = [json.dumps(chunk) for chunk in make_chunks(["ok"])]
+    session = FakeSession(FakeResponse(200, lines))
+    client = OllamaClient(session=session)
+
+    chunks = list(client.chat_stream("llama2", [{"role": "user", "content": "hi"}],
+                                     options={"num_predict": 8}))
+
+    assert chunks[0]["message"]["content"] == "ok"
+    assert session.payloads[0]["stream"] is True
+    assert session.payloads[0]["options"] == {"num_predict": 8}
+
+
+def test_client_raises_on_error_status():
+    client = OllamaClient(session=FakeSession(FakeResponse(500, ["boom"])))
+    with pytest.raises(OllamaError) as exc:
+        list(client.chat_stream("llama2", []))
+    assert exc.value.status_code == 500
+
+
+def test_llm_sends_keep_alive_with_every_request():
+    from src.llm.crew_llm import StreamingOllamaLLM
+
+    lines = [json.dumps(chunk) for chunk in make_chunks(["ok"])]
+    session = FakeSession(FakeResponse(200, lines))
+    llm = StreamingOllamaLLM(model="llama2", keep_alive="1h", client=OllamaClient(session=session))
+
+    assert llm.call("hi") == "ok"
+    assert session.payloads[0]["keep_alive"] == "1h"
+
+
+def test_llm_constrains_structured_tasks_to_their_schema():
+    from types import SimpleNamespace
+
+    from src.llm.crew_llm import StreamingOllamaLLM
+    from src.tasks.output_schemas import SprintReport
+
+    lines = [json.dumps(chunk) for chunk in make_chunks(['{"velocity": "21"}', "\n"])]
+    session = FakeSession(FakeResponse(200, lines))
+    llm = StreamingOllamaLLM(model="llama2", client=OllamaClient(session=session))
+
+    answer = llm.call("hi", from_task=SimpleNamespace(name="sprint_report", output_json=SprintReport))
+
+    assert answer == 'Final Answer: {"velocity": "21"}'
+    assert session.payloads[0]["format"] == SprintReport.model_json_schema()
@@ -0,0 +1,68 @@
+"""
+Tests for the deterministic offline LLM backend.
+"""
+import pytest
+
+from src.llm.streaming import stream_generation
+from src.llm.stub_backend import StubOllamaClient, StubSettings
+
+PROMPT = [{"role": "user", "content": "Current Task: Plan it\n- Timeline\n- Risks\nFinal Answer:"}]
+
+
+def generate(client, messages=PROMPT, **options):
+    return stream_generation(client.chat_stream("llama2", messages, options=options), "llama2")
+
+
+def test_responses_are_deterministic_and_task_shaped():
+    client = StubOllamaClient(StubSettings(output_tokens=64))
+    first, stats = generate(client)
+    second, _ = generate(client)
+
+    assert first == second
+    assert first.startswith("Thought:")
+    assert "Final Answer:" in first
+    assert "## Timeline" in first and "## Risks" in first
+    assert stats.completion_tokens == 64
+
+
+def test_num_predict_caps_the_response_length():
+    client = StubOllamaClient(StubSettings(output_tokens=500))
+    _, stats = generate(client, num_predict=40)
+    assert stats.completion_tokens == 40
+
+
+def test_throughput_is_simulated_and_reported():
+    sleeps = []
+    client = StubOllamaClient(
+        StubSettings(output_tokens=100, prompt_tokens_per_second=100, tokens_per_second=50),
+        sleep=sleeps.append
+    )
+    _, stats = generate(client)
+
+    assert sum(sleeps) == pytest.approx(stats.prompt_eval_time + 100 / 50)
+    assert stats.tokens_per_second == pytest.approx(50)
+    assert stats.prompt_eval_time == pytest.approx(stats.prompt_tokens / 100)
+
+
+def test_stop_sequences_end_the_response():
+    client = StubOllamaClient(StubSettings(output_tokens=64))
+    text, _ = generate(client, stop=["Final Answer:"])
+    assert text.startswith("Thought:")
+    assert "Final Answer:" not in text
+
+
+def test_json_format_streams_schema_shaped_json():
+    import json
+    from src.tasks.output_schemas import CodeReview
+
+    schema = CodeReview.model_json_schema()
+    client = StubOllamaClient(StubSettings(output_tokens=80))
+    messages = [{"role": "user", "content": "Review the code"}]
+    text = "".join(chunk["message"]["content"]
+                   for chunk in client.chat_stream("llama2", messages, format=schema))
+
+    review = CodeReview.model_validate(json.loads(text))
+    assert review.feedback
+    again = "".join(chunk["message"]["content"]
+                    for chunk in client.chat_stream("llama2", messages, format=schema))
+    assert again == text
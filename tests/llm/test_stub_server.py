@@ -0,0 +1,61 @@
+"""
+Tests for the Ollama-compatible stub HTTP server.
+"""
+import threading
+import time
+
+import pytest
+import requests
+
+from src.llm.ollama_client import OllamaClient, OllamaError
+from src.llm.streaming import stream_generation
+from src.llm.stub_server import LatencyDistribution, StubServer, StubServerConfig
+
+MESSAGES = [{"role": "user", "content": "Current Task: Plan\n- Timeline\n- Risks"}]
+
+
+def test_chat_streams_over_http():
+    config = StubServerConfig(output_tokens=40, tokens_per_chunk=4)
+    with StubServer(config) as server:
+        text, stats = stream_generation(
+            OllamaClient(server.url).chat_stream("llama2", MESSAGES), "llama2"
+        )
+    assert "## Timeline" in text
+    assert stats.completion_tokens == 40
+    assert server.stats.to_dict()["completed"] == 1
+
+
+def test_generate_endpoint_without_streaming():
+    with StubServer(StubServerConfig(output_tokens=10)) as server:
+        body = requests.post(f"{server.url}/api/generate",
+                             json={"model": "llama2", "prompt": "hi", "stream": False}).json()
+    assert body["done"] is True
+    assert body["eval_count"] == 10
+
+
+def test_injected_errors_surface_as_ollama_errors():
+    with StubServer(StubServerConfig(error_rate=1.0)) as server:
+        with pytest.raises(OllamaError) as exc:
+            list(OllamaClient(server.url).chat_stream("llama2", MESSAGES))
+    assert exc.value.status_code == 500
+
+
+def test_requests_beyond_queue_are_rejected():
+    config = StubServerConfig(latency=LatencyDistribution.parse("fixed:0.3"),
+                              max_concurrency=1, max_queue=0)
+    with StubServer(config) as server:
+        client = OllamaClient(server.url)
+        first = threading.Thread(target=lambda: list(client.chat_stream("llama2", MESSAGES)))
+        first.start()
+        while server.stats.to_dict()["requests"] == 0:
+            time.sleep(0.005)
+        with pytest.raises(OllamaError) as exc:
+            list(OllamaClient(server.url).chat_stream("llama2", MESSAGES))
+        first.join()
+    assert exc.value.status_code == 503
+
+
+def test_latency_specification_is_validated():
+    assert LatencyDistribution.parse("uniform:0.1,0.2").params == [0.1, 0.2]
+    with pytest.raises(ValueError):
+        LatencyDistribution.parse("lognormal:1")
@@ -0,0 +1,31 @@
+"""
+Tests for regression detection in the benchmark suite.
+"""
+from benchmarks.suite import compare
+
+
+def results(**metrics):
+    return {"scenarios": {"dev_plan": dict(metrics)}}
+
+
+def test_flags_metrics_above_threshold():
+    baseline = results(wall_s=1.0, cpu_s=1.0, prompt_tokens=1000)
+    current = results(wall_s=1.5, cpu_s=1.05, prompt_tokens=1000)
+
+    regressions = compare(baseline, current, threshold=0.1)
+
+    assert [(r["scenario"], r["metric"]) for r in regressions] == [("dev_plan", "wall_s")]
+    assert regressions[0]["change"] == 0.5
+
+
+def test_small_absolute_changes_are_noise():
+    baseline = results(wall_s=0.01, peak_rss_mb=200.0)
+    current = results(wall_s=0.02, peak_rss_mb=260.0)
+
+    regressions = compare(baseline, current, threshold=0.1, min_delta=0.05)
+
+    assert [r["metric"] for r in regressions] == ["peak_rss_mb"]
+
+
+def test_new_scenarios_are_not_compared():
+    assert compare({"scenarios": {}}, results(wall_s=5.0), threshold=0.1) == []
@@ -0,0 +1,148 @@
+"""
+Tests for deadlines, cancellation of running tasks and aborting model streams.
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm.ollama_client import OllamaClient
+from src.llm.streaming import stream_generation
+from src.llm.stub_server import LatencyDistribution, StubServer, StubServerConfig
+from src.utils.cancellation import (
+    CANCELLED,
+    DEADLINE,
+    CancellationToken,
+    cancellation_scope,
+    sleep
+)
+from src.utils.error_types import ErrorCategory, TaskCancelledError
+from src.utils.scheduler import TaskScheduler
+
+MESSAGES = [{"role": "user", "content": "Current Task: Plan\n- Timeline\n- Risks"}]
+
+
+def make_task(name, context=None):
+    return SimpleNamespace(name=name, context=context)
+
+
+def cancellable_runner(seconds):
+    """Runner that sleeps like a long generation, honouring cancellation."""
+    def run(task, context):
+        sleep(seconds)
+        return SimpleNamespace(raw=f"{task.name}-out")
+    return run
+
+
+def test_deadline_cancels_token_and_children():
+    parent = CancellationToken(timeout=0.05)
+    child = CancellationToken(parent=parent, name="qa")
+    fired = threading.Event()
+    child.on_cancel(fired.set)
+
+    assert fired.wait(2)
+    assert (parent.reason, child.reason) == (DEADLINE, DEADLINE)
+    with pytest.raises(TaskCancelledError) as raised:
+        child.raise_if_cancelled(partial_output="half")
+    assert raised.value.category is ErrorCategory.TIMEOUT_ERROR
+    assert (raised.value.task_name, raised.value.partial_output) == ("qa", "half")
+
+
+def test_sleep_wakes_up_when_cancelled():
+    token = CancellationToken()
+    threading.Timer(0.05, token.cancel).start()
+    started = time.perf_counter()
+    with cancellation_scope(token), pytest.raises(TaskCancelledError):
+        sleep(5)
+    assert time.perf_counter() - started < 2
+
+
+def test_task_timeout_fails_only_the_slow_task():
+    tasks = [make_task("fast"), make_task("slow")]
+    runners = {"fast": cancellable_runner(0.0), "slow": cancellable_runner(5)}
+    completed = []
+    scheduler = TaskScheduler(max_concurrency=2, runner=lambda task, context:
+                              runners[task.name](task, context))
+
+    with pytest.raises(TaskCancelledError) as raised:
+        scheduler.run(tasks, task_timeout={"slow": 0.05}.get,
+                      on_complete=lambda name, output: completed.append(name))
+    assert raised.value.task_name == "slow"
+    assert raised.value.reason == DEADLINE
+    assert completed == ["fast"]
+
+
+def test_cancelling_the_run_aborts_running_and_pending_tasks():
+    root = make_task("root")
+    tasks = [root, make_task("child", [root])]
+    run_token = CancellationToken()
+    errors = []
+    threading.Timer(0.05, run_token.cancel).start()
+
+    started = time.perf_counter()
+    with pytest.raises(TaskCancelledError) as raised:
+        TaskScheduler(runner=cancellable_runner(5)).run(
+            tasks, cancellation=run_token, on_error=lambda name, error: errors.append(name)
+        )
+    assert time.perf_counter() - started < 2
+    assert raised.value.reason == CANCELLED
+    assert errors == ["root"]
+
+
+def test_cancel_closes_http_stream_and_frees_server_slot():
+    config = StubServerConfig(output_tokens=400, chunk_interval=0.01)
+    with StubServer(config) as server:
+        token = CancellationToken(timeout=0.2, name="development")
+        with cancellation_scope(token), pytest.raises(TaskCancelledError) as raised:
+            stream_generation(OllamaClient(server.url).chat_stream("llama2", MESSAGES), "llama2")
+
+        assert raised.value.partial_output
+        deadline = time.monotonic() + 5
+        while server.stats.to_dict()["client_disconnects"] == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        stats = server.stats.to_dict()
+    assert stats["client_disconnects"] == 1
+    assert stats["completed"] == 0
+
+
+def test_cancel_before_first_chunk_aborts_request():
+    config = StubServerConfig(latency=LatencyDistribution.parse("fixed:2"))
+    with StubServer(config) as server:
+        client = OllamaClient(server.url)
+        token = CancellationToken(timeout=0.3, name="development")
+        started = time.perf_counter()
+        with cancellation_scope(token), pytest.raises(TaskCancelledError) as raised:
+            stream_generation(client.chat_stream("llama2", MESSAGES), "llama2")
+        elapsed = time.perf_counter() - started
+
+    assert raised.value.reason == DEADLINE
+    assert elapsed < 1.0
+
+
+def test_cancelled_request_keeps_pool_endpoints_in_service():
+    from src.llm.endpoint_pool import EndpointPool
+
+    config = StubServerConfig(latency=LatencyDistribution.parse("fixed:2"))
+    with StubServer(config) as first, StubServer(config) as second:
+        pool = EndpointPool([first.url, second.url])
+        token = CancellationToken(timeout=0.3, name="development")
+        with cancellation_scope(token), pytest.raises(TaskCancelledError):
+            stream_generation(pool.chat_stream(model="llama2", messages=MESSAGES), "llama2")
+
+    # No failover to the second endpoint, and neither circuit opened
+    assert [entry["requests"] for entry in pool.status()] == [1, 0]
+    assert [entry["circuit"] for entry in pool.status()] == ["closed", "closed"]
+
+
+def test_request_timeout_is_capped_by_deadline():
+    sent = []
+
+    class Session:
+        def post(self, url, json=None, stream=False, timeout=None):
+            sent.append(timeout)
+            raise OSError("unreachable")
+
+    with cancellation_scope(CancellationToken(timeout=2)), pytest.raises(OSError):
+        list(OllamaClient(session=Session()).chat_stream("llama2", MESSAGES))
+    assert 0 < sent[0] <= 2
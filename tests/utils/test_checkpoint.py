@@ -0,0 +1,79 @@
+"""
+Tests for checkpointed runs and resuming through the scheduler.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.checkpoint import RunCheckpoint, RunStatus
+from src.utils.scheduler import TaskScheduler
+
+
+def make_task(name, context=None):
+    return SimpleNamespace(name=name, context=context)
+
+
+def make_chain():
+    requirements = make_task("requirements")
+    backlog = make_task("backlog", [requirements])
+    mockups = make_task("mockups", [requirements])
+    development = make_task("development", [backlog, mockups])
+    return [requirements, backlog, mockups, development]
+
+
+def test_checkpoint_round_trip(tmp_path):
+    checkpoint = RunCheckpoint.create(
+        inputs={"project_description": "Image app"},
+        task_names=["requirements", "backlog"],
+        runs_dir=str(tmp_path),
+        run_id="run-1"
+    )
+    checkpoint.save_output("requirements", {"raw": "SRS"})
+    checkpoint.mark_failed("backlog", "model crashed", "Conception")
+
+    loaded = RunCheckpoint.load("run-1", str(tmp_path))
+    assert loaded.load_outputs() == {"requirements": {"raw": "SRS"}}
+    assert loaded.manifest["status"] == RunStatus.FAILED
+    assert loaded.manifest["failures"]["backlog"]["phase"] == "Conception"
+
+    with pytest.raises(FileNotFoundError):
+        RunCheckpoint.load("missing", str(tmp_path))
+
+
+def test_failure_keeps_finished_outputs():
+    finished, errors = {}, {}
+
+    def runner(task, context):
+        if task.name == "backlog":
+            raise RuntimeError("ollama went away")
+        return SimpleNamespace(raw=task.name)
+
+    with pytest.raises(RuntimeError):
+        TaskScheduler(max_concurrency=2, runner=runner).run(
+            make_chain(),
+            on_complete=lambda name, output: finished.__setitem__(name, output.raw),
+            on_error=lambda name, error: errors.__setitem__(name, str(error))
+        )
+
+    assert finished == {"requirements": "requirements", "mockups": "mockups"}
+    assert errors == {"backlog": "ollama went away"}
+
+
+def test_resume_runs_only_unfinished_and_downstream_tasks():
+    executed = []
+
+    def runner(task, context):
+        executed.append(task.name)
+        return SimpleNamespace(raw=f"{task.name}-new")
+
+    completed = {
+        "requirements": SimpleNamespace(raw="requirements-old"),
+        "mockups": SimpleNamespace(raw="mockups-old"),
+        "development": SimpleNamespace(raw="development-stale")
+    }
+    outputs = TaskScheduler(runner=runner).run(make_chain(), completed=completed)
+
+    assert sorted(executed) == ["backlog", "development"]
+    assert [output.raw for output in outputs] == [
+        "requirements-old", "backlog-new", "mockups-old", "development-new"
+    ]
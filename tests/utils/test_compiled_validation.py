@@ -0,0 +1,133 @@
+"""
+Tests for compiled rule sets and batch validation.
+"""
+import pytest
+
+from src.utils.validator import (
+    CompiledRuleSet,
+    ContainsKeyword,
+    DocumentFeatures,
+    KeywordMatcher,
+    MinWords,
+    TaskValidator,
+    ValidationRule,
+    ValidationSeverity,
+    create_common_validation_rules
+)
+
+DESIGN = "## Architecture\n" + " ".join(
+    f"Service {index} Components talk through a REST Interface." for index in range(10)
+)
+
+
+def common_validator():
+    validator = TaskValidator()
+    for task_type, rules in create_common_validation_rules().items():
+        for rule in rules:
+            validator.add_output_rule(task_type, rule)
+    return validator
+
+
+def rule(name, validator, severity=ValidationSeverity.ERROR):
+    return ValidationRule(name=name, description="", validator=validator,
+                          error_message=f"{name} failed", severity=severity)
+
+
+def test_keyword_matcher_finds_overlapping_keywords_once():
+    matcher = KeywordMatcher(["interface", "interfaces", "face", "api", "Component", "INTERFACE"])
+
+    assert matcher.find("rest interfaces between components") == {
+        "interface", "interfaces", "face", "component"
+    }
+    assert matcher.find("nothing here") == frozenset()
+    assert KeywordMatcher([]).find("anything") == frozenset()
+
+
+def test_features_are_shared_by_all_rules():
+    lowered = []
+
+    class CountingFeatures(DocumentFeatures):
+        @property
+        def lower(self):
+            lowered.append(True)
+            return self.text.lower()
+
+    rules = CompiledRuleSet([
+        rule("components", ContainsKeyword("components")),
+        rule("interface", ContainsKeyword("interface")),
+        rule("words", MinWords(20), ValidationSeverity.WARNING)
+    ])
+    features = CountingFeatures(DESIGN, rules.matcher)
+
+    assert ContainsKeyword("components").evaluate(features)
+    assert ContainsKeyword("interface").evaluate(features)
+    assert len(lowered) == 1
+    assert rules.validate(DESIGN).is_valid
+    assert rules.validate("Components only").warnings[0]["rule_name"] == "words"
+
+
+def test_compiled_results_match_plain_rule_checks():
+    validator = common_validator()
+    outputs = [DESIGN, "Components", "", "An interface", None]
+
+    results = validator.validate_outputs("architecture_design", outputs)
+
+    for output, result in zip(outputs, results):
+        assert result == validator.validate_output("architecture_design", output)
+    assert [result.is_valid for result in results] == [True, True, False, False, False]
+    assert results[1].warnings[0]["rule_name"] == "has_interfaces"
+    assert results[4].errors[0]["message"].startswith("Validation error:")
+
+
+def test_first_critical_failure_short_circuits():
+    calls = []
+
+    def tracked(result):
+        def check(text):
+            calls.append(result)
+            return result
+        return check
+
+    rules = CompiledRuleSet([
+        rule("style", tracked("style"), ValidationSeverity.WARNING),
+        rule("safe", tracked(False), ValidationSeverity.CRITICAL),
+        rule("later", tracked(False), ValidationSeverity.CRITICAL)
+    ])
+    result = rules.validate("text")
+
+    assert [error["rule_name"] for error in result.errors] == ["safe"]
+    assert (result.warnings, calls) == ([], [False])
+
+
+def test_adding_a_rule_recompiles_the_rule_set():
+    validator = common_validator()
+    before = validator.compiled_rules("architecture_design")
+    validator.add_output_rule("architecture_design", rule("database", ContainsKeyword("database")))
+
+    result = validator.validate_output("architecture_design", DESIGN)
+    assert validator.compiled_rules("architecture_design") is not before
+    assert [error["rule_name"] for error in result.errors] == ["database"]
+
+
+def test_batch_in_process_pool():
+    validator = common_validator()
+    outputs = [DESIGN, "Components", ""] * 20
+
+    pooled = validator.validate_outputs("architecture_design", outputs, processes=2)
+    assert pooled == common_validator().validate_outputs("architecture_design", outputs)
+
+    validator.add_output_rule("architecture_design", rule("lambda", lambda text: True))
+    with pytest.raises(ValueError):
+        validator.validate_outputs("architecture_design", outputs, processes=2)
+
+
+def test_review_feedback_rule_reads_text_and_structured_reviews():
+    rule = create_common_validation_rules()["code_review"][0]
+    compiled = CompiledRuleSet([rule])
+
+    assert rule.validator({"feedback": [{"area": "api"}]})
+    assert not rule.validator({"summary": "fine"})
+    assert compiled.validate('{"summary": "ok", "feedback": [{"area": "api"}]}').is_valid
+    assert compiled.validate("## Review\n- Handle timeouts in the client").is_valid
+    assert not compiled.validate('{"summary": "ok", "feedback": []}').is_valid
+    assert not compiled.validate("Looks good to me.").is_valid
@@ -0,0 +1,79 @@
+"""
+Tests for context token budgeting and compaction.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.context_budget import (
+    TRUNCATION_MARKER,
+    CompactionPolicy,
+    ContextBudgetManager,
+    allocate_budget,
+    estimate_tokens
+)
+
+
+def make_task(name="development", description="Implement the image upload API"):
+    agent = SimpleNamespace(role="Developer", goal="Ship code", backstory="Senior engineer")
+    return SimpleNamespace(name=name, description=description, expected_output="A plan", agent=agent)
+
+
+def paragraphs(topic, count, words=40):
+    return "\n\n".join(f"{topic} paragraph {i}: " + " ".join(["filler"] * words) for i in range(count))
+
+
+def test_allocate_budget_is_max_min_fair():
+    assert allocate_budget([100, 1000, 1000], 900) == [100, 400, 400]
+    assert allocate_budget([50, 60], 1000) == [50, 60]
+
+
+def test_context_within_budget_is_untouched():
+    manager = ContextBudgetManager(num_ctx=4096, num_predict=512)
+    sources = [("requirements", "short spec"), ("backlog", "short backlog")]
+    assert manager.build_context(make_task(), sources) == "short spec\n\n----------\n\nshort backlog"
+    assert manager.tokens_saved == {}
+
+
+def test_truncate_policy_fits_budget_and_records_savings():
+    manager = ContextBudgetManager(num_ctx=2048, num_predict=512, policy=CompactionPolicy.TRUNCATE)
+    task = make_task()
+    sources = [("mockups", paragraphs("mockups", 40)), ("architecture", paragraphs("arch", 40))]
+
+    context = manager.build_context(task, sources)
+
+    assert estimate_tokens(context) <= manager.context_budget(task)
+    assert context.count(TRUNCATION_MARKER) == 2
+    assert manager.tokens_saved["development"] > 0
+
+
+def test_relevant_policy_keeps_matching_chunks():
+    manager = ContextBudgetManager(num_ctx=1600, num_predict=256, policy=CompactionPolicy.RELEVANT)
+    relevant = "The image upload endpoint accepts multipart uploads for the image library."
+    text = paragraphs("unrelated", 30) + "\n\n" + relevant + "\n\n" + paragraphs("unrelated tail", 30)
+
+    context = manager.build_context(make_task(), [("architecture", text)])
+
+    assert relevant in context
+    assert estimate_tokens(context) < estimate_tokens(text)
+
+
+def test_summarize_policy_summarizes_each_source_once():
+    calls = []
+
+    def summarizer(text, max_tokens):
+        calls.append(max_tokens)
+        return "summary"
+
+    manager = ContextBudgetManager(
+        num_ctx=1600, num_predict=256, policy=CompactionPolicy.SUMMARIZE, summarizer=summarizer
+    )
+    sources = [("architecture", paragraphs("arch", 60))]
+    assert manager.build_context(make_task(), sources) == "summary"
+    manager.build_context(make_task(), sources)
+    assert len(calls) == 1
+
+
+def test_summarize_policy_requires_summarizer():
+    with pytest.raises(ValueError):
+        ContextBudgetManager(policy=CompactionPolicy.SUMMARIZE)
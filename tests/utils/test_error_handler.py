@@ -0,0 +1,114 @@
+"""
+Tests for the indexed, bounded error handler.
+"""
+from datetime import datetime, timedelta
+
+from src.utils.error_handler import ErrorHandler, TaskError
+from src.utils.error_types import ErrorCategory
+
+
+def make_error(task_name, phase="Implementation", category=None, timestamp=None, message="boom"):
+    return TaskError(
+        task_name=task_name,
+        error_message=message,
+        timestamp=timestamp or datetime.now(),
+        phase=phase,
+        context={"error_type": "RuntimeError"},
+        category=category
+    )
+
+
+def test_errors_are_indexed_by_task_phase_and_category():
+    handler = ErrorHandler()
+    handler.log_error(make_error("development", category=ErrorCategory.MODEL_ERROR))
+    handler.log_error(make_error("code_review", phase="Review"))
+    handler.log_error(make_error("development", category=ErrorCategory.TIMEOUT_ERROR))
+
+    assert [e.category for e in handler.get_task_errors("development")] == [
+        ErrorCategory.MODEL_ERROR, ErrorCategory.TIMEOUT_ERROR
+    ]
+    assert [e.task_name for e in handler.get_phase_errors("Review")] == ["code_review"]
+    assert len(handler.get_category_errors(ErrorCategory.MODEL_ERROR)) == 1
+    assert len(handler.get_category_errors(None)) == 1
+
+    summary = handler.get_error_summary()
+    assert summary["total_errors"] == 3
+    assert summary["errors_by_phase"] == {"Implementation": 2, "Review": 1}
+    assert summary["errors_by_category"] == {"model_error": 1, "timeout_error": 1, "unknown": 1}
+
+
+def test_max_entries_evicts_oldest_and_spills(tmp_path):
+    spill = tmp_path / "errors.jsonl"
+    handler = ErrorHandler(max_entries=2, spill_path=str(spill))
+    for index in range(5):
+        handler.log_error(make_error(f"task_{index % 2}", message=f"error {index}",
+                                     category=ErrorCategory.MODEL_ERROR))
+
+    assert [e.error_message for e in handler.errors] == ["error 3", "error 4"]
+    assert [e.error_message for e in handler.get_task_errors("task_0")] == ["error 4"]
+    assert len(handler.get_category_errors(ErrorCategory.MODEL_ERROR)) == 2
+
+    spilled = list(handler.iter_spilled())
+    assert [e.error_message for e in spilled] == ["error 0", "error 1", "error 2"]
+    assert spilled[0].category is ErrorCategory.MODEL_ERROR
+
+    # Counts cover evicted errors too
+    summary = handler.get_error_summary()
+    assert summary["total_errors"] == 5
+    assert summary["retained_errors"] == 2
+
+
+def test_max_age_expires_old_errors():
+    now = datetime(2024, 1, 1, 12, 0)
+    handler = ErrorHandler(max_age=timedelta(minutes=10), clock=lambda: now)
+    handler.log_error(make_error("development", timestamp=now - timedelta(minutes=30)))
+    handler.log_error(make_error("development", timestamp=now - timedelta(minutes=5)))
+    assert len(handler.get_task_errors("development")) == 1
+
+    now += timedelta(minutes=6)
+    handler.expire()
+    assert handler.get_task_errors("development") == []
+    assert handler.get_error_summary()["total_errors"] == 2
+
+
+def test_recovery_is_counted_once_per_error():
+    handler = ErrorHandler()
+    recovered = []
+    handler.add_recovery_strategy("development", recovered.append)
+    error = make_error("development")
+    handler.log_error(error)
+
+    assert handler.attempt_recovery("development", error)
+    assert not handler.attempt_recovery("development", error)
+    assert recovered == [error]
+    assert handler.get_error_summary()["recovery_attempts"] == {"attempted": 1, "total": 1}
+
+
+def test_task_error_round_trips_without_instance_dict():
+    error = make_error("qa", category=ErrorCategory.TIMEOUT_ERROR)
+
+    assert not hasattr(error, "__dict__")
+    assert TaskError.from_dict(error.to_dict()) == error
+    assert TaskError.from_dict(error.to_dict()) != make_error("qa")
+
+
+def test_handlers_sharing_a_spill_file_write_whole_lines(tmp_path):
+    import threading
+
+    spill = tmp_path / "errors.jsonl"
+    handlers = [ErrorHandler(max_entries=1, spill_path=str(spill)) for _ in range(4)]
+
+    def log(handler, run):
+        for index in range(200):
+            handler.log_error(make_error(f"run_{run}", message="x" * 500 + str(index)))
+
+    threads = [threading.Thread(target=log, args=(handler, run))
+               for run, handler in enumerate(handlers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    spilled = list(handlers[0].iter_spilled())
+    assert len(spilled) == 4 * 199
+    assert {error.task_name for error in spilled} == {f"run_{run}" for run in range(4)}
@@ -0,0 +1,108 @@
+"""
+Tests for the mergeable latency sketch and TaskMonitor's duration percentiles.
+"""
+import json
+import random
+
+import pytest
+
+from src.utils.metrics import DevCrewMetrics
+from src.utils.monitor import MetricType, TaskMonitor
+from src.utils.stats import LatencySketch, percentile
+from src.utils.tracing import Tracer
+
+
+def lognormal_sample(seed: int, size: int = 5000):
+    rng = random.Random(seed)
+    return [rng.lognormvariate(2.0, 0.8) for _ in range(size)]
+
+
+@pytest.mark.parametrize("q", [50, 90, 99])
+def test_quantiles_within_relative_accuracy(q):
+    values = lognormal_sample(1)
+    sketch = LatencySketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+    exact = percentile(values, q)
+    assert sketch.quantile(q / 100) == pytest.approx(exact, rel=0.02)
+
+
+def test_merged_sketch_matches_single_sketch():
+    first, second = lognormal_sample(1), lognormal_sample(2)
+    combined = LatencySketch()
+    for value in first + second:
+        combined.add(value)
+    left, right = LatencySketch(), LatencySketch()
+    for value in first:
+        left.add(value)
+    for value in second:
+        right.add(value)
+
+    left.merge(LatencySketch.from_dict(json.loads(json.dumps(right.to_dict()))))
+    assert left.buckets == combined.buckets
+    assert left.summary() == pytest.approx(combined.summary())
+
+
+def test_merge_rejects_different_accuracy():
+    with pytest.raises(ValueError):
+        LatencySketch(0.01).merge(LatencySketch(0.02))
+
+
+def test_bucket_count_is_bounded():
+    sketch = LatencySketch(max_buckets=64)
+    for exponent in range(-6, 6):
+        for step in range(100):
+            sketch.add(10 ** exponent * (1 + step / 100))
+    assert len(sketch.buckets) <= 64
+    assert sketch.quantile(0.99) == pytest.approx(percentile(
+        [10 ** e * (1 + s / 100) for e in range(-6, 6) for s in range(100)], 99
+    ), rel=0.02)
+
+
+def test_empty_and_zero_values():
+    sketch = LatencySketch()
+    assert sketch.quantile(0.5) == 0.0
+    sketch.add(0.0)
+    sketch.add(2.0)
+    assert sketch.quantile(0.0) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(2.0, rel=0.01)
+
+
+def monitor() -> TaskMonitor:
+    return TaskMonitor(tracer=Tracer(enabled=False), metrics=DevCrewMetrics())
+
+
+def test_monitor_keeps_percentiles_per_task_and_model():
+    worker = monitor()
+    for seconds in (10, 20, 30, 40):
+        worker.record_duration("architecture_design", seconds, model="mistral")
+    worker.record_duration("git_workflow", 2, model="llama2")
+
+    task = worker.get_duration_percentiles("architecture_design")
+    assert task["count"] == 4
+    assert task["p50"] == pytest.approx(20, rel=0.01)
+    assert worker.get_duration_percentiles(model="llama2")["max"] == 2
+    assert worker.get_duration_percentiles("unknown") == {}
+
+
+def test_monitor_merges_snapshots_from_workers():
+    workers = [monitor(), monitor()]
+    workers[0].record_duration("qa", 5, model="llama2")
+    workers[1].record_duration("qa", 15, model="llama2")
+    workers[1].record_duration("devops", 3, model="llama2")
+
+    aggregate = monitor()
+    for worker in workers:
+        aggregate.merge_duration_snapshot(json.loads(json.dumps(worker.duration_snapshot())))
+    assert aggregate.get_duration_percentiles("qa")["count"] == 2
+    assert aggregate.get_duration_percentiles(model="llama2")["count"] == 3
+
+
+def test_duration_alert_uses_tail_latency():
+    worker = monitor()
+    for seconds in [1] * 98 + [50, 60]:
+        worker.record_duration("development", seconds)
+    worker.set_alert_threshold(MetricType.DURATION, 30)
+    [alert] = worker.check_alerts()
+    assert alert["task_name"] == "development"
+    assert alert["current_value"] > 30
@@ -0,0 +1,89 @@
+"""
+Tests for the Prometheus metrics and exporter.
+"""
+import threading
+import urllib.request
+
+from src.llm.streaming import GenerationStats
+from src.utils.metrics import (
+    CONTENT_TYPE,
+    Counter,
+    DevCrewMetrics,
+    Histogram,
+    MetricsRegistry,
+    MetricsServer
+)
+from src.utils.monitor import TaskMonitor
+from src.utils.tracing import Tracer
+
+
+def test_counter_sums_increments_from_many_threads():
+    counter = Counter("events_total", "Events", ("kind",))
+
+    def work():
+        child = counter.labels("a")
+        for _ in range(10_000):
+            child.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert counter.labels("a").value == 80_000
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.register(Histogram("latency_seconds", "Latency", ("task",), (1.0, 5.0)))
+    for value in (0.5, 2.0, 3.0, 10.0):
+        histogram.labels("qa").observe(value)
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds Latency", "# TYPE latency_seconds histogram"]
+    assert 'latency_seconds_bucket{task="qa",le="1"} 1' in lines
+    assert 'latency_seconds_bucket{task="qa",le="5"} 3' in lines
+    assert 'latency_seconds_bucket{task="qa",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{task="qa"} 15.5' in lines
+    assert 'latency_seconds_count{task="qa"} 4' in lines
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    counter = registry.register(Counter("errors_total", "Errors", ("message",)))
+    counter.labels('say "hi"\n').inc()
+    assert 'errors_total{message="say \\"hi\\"\\n"} 1' in registry.render()
+
+
+def test_task_monitor_updates_metrics():
+    metrics = DevCrewMetrics()
+    monitor = TaskMonitor(tracer=Tracer(enabled=False), metrics=metrics)
+    monitor.start_task("qa")
+    assert metrics.tasks_in_flight.labels().value == 1
+    monitor.record_error("qa", "ModelExecutionError", {"category": "model_error"})
+    monitor.record_recovery_attempt("qa", successful=True)
+    monitor.record_validation("qa", passed=False)
+    monitor.end_task("qa")
+
+    text = metrics.render()
+    assert "devcrew_tasks_in_flight 0" in text
+    assert 'devcrew_task_errors_total{task="qa",category="model_error"} 1' in text
+    assert 'devcrew_task_recoveries_total{task="qa",outcome="success"} 1' in text
+    assert 'devcrew_task_validations_total{task="qa",result="fail"} 1' in text
+    assert 'devcrew_task_duration_seconds_count{task="qa"} 1' in text
+
+
+def test_server_exposes_llm_throughput():
+    metrics = DevCrewMetrics()
+    metrics.llm_listener.on_complete("qa", GenerationStats(
+        model="llama2", prompt_tokens=100, completion_tokens=40,
+        time_to_first_token=0.2, total_time=2.2, generation_time=2.0
+    ))
+    with MetricsServer(metrics) as server:
+        with urllib.request.urlopen(server.url) as response:
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            text = response.read().decode("utf-8")
+
+    assert 'devcrew_llm_tokens_total{model="llama2",kind="completion"} 40' in text
+    assert 'devcrew_llm_generation_seconds_total{model="llama2"} 2' in text
+    assert 'devcrew_llm_time_to_first_token_seconds_count{model="llama2"} 1' in text
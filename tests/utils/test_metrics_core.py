@@ -0,0 +1,125 @@
+"""
+Tests for the sharded metrics core and the utilities built on it.
+"""
+import threading
+from datetime import datetime
+
+from src.utils.error_handler import ErrorHandler, TaskError
+from src.utils.metrics import DevCrewMetrics
+from src.utils.metrics_core import ShardedCounter, ThreadCells
+from src.utils.monitor import TaskMonitor
+from src.utils.tracing import Tracer
+
+
+def run_threads(target, count=8):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_sharded_counter_loses_no_increments():
+    counter = ShardedCounter()
+
+    def work():
+        for index in range(5000):
+            counter.inc("events")
+            counter.inc(("task", index % 4))
+
+    run_threads(work)
+    totals = counter.totals()
+    assert counter.value("events") == 40_000
+    assert totals[("task", 0)] == 10_000
+
+
+def test_shards_of_finished_threads_are_retired():
+    counter = ShardedCounter()
+    run_threads(lambda: counter.inc("events"), count=5)
+    assert counter.value("events") == 5
+    assert len(counter._shards) == 0  # Only finished threads recorded
+    counter.inc("events")
+    assert counter.value("events") == 6
+
+
+def test_unread_counters_retire_shards_as_threads_come_and_go():
+    counter = ShardedCounter()
+    cells = ThreadCells(1)
+
+    def work():
+        counter.inc("events")
+        cells.cell()[0] += 1
+
+    # One worker at a time, as in successive runs; nothing reads in between
+    for _ in range(20):
+        run_threads(work, count=1)
+    assert len(counter._shards) == 1
+    assert len(cells._cells) == 1
+    assert counter.value("events") == 20
+    assert cells.totals() == [20]
+
+
+def test_thread_cells_sum_and_retire():
+    cells = ThreadCells(2)
+
+    def work():
+        cell = cells.cell()
+        for _ in range(1000):
+            cell[0] += 1
+            cell[1] += 0.5
+
+    run_threads(work, count=4)
+    assert cells.totals() == [4000, 2000]
+    assert cells.totals() == [4000, 2000]
+
+
+def test_counter_clear():
+    counter = ShardedCounter()
+    counter.inc("events", 3)
+    counter.clear()
+    assert counter.totals() == {}
+
+
+def test_task_monitor_counts_concurrent_errors():
+    monitor = TaskMonitor(tracer=Tracer(enabled=False), metrics=DevCrewMetrics())
+    monitor.start_task("development")
+
+    def work():
+        for _ in range(500):
+            monitor.record_error("development", "TimeoutError", {})
+            monitor.record_validation("development", passed=True)
+
+    run_threads(work)
+    summary = monitor.get_task_summary("development")
+    assert summary["error_count"] == 4000
+    assert summary["error_patterns"] == {"TimeoutError": 4000}
+    assert monitor.task_metrics["development"].validation_passes == 4000
+    assert monitor.get_global_patterns()["total_errors"] == 4000
+
+
+def test_error_handler_recovers_each_error_once():
+    handler = ErrorHandler()
+    calls = []
+    handler.add_recovery_strategy("qa", calls.append)
+    error = TaskError("qa", "boom", datetime.now(), "Implementation")
+    handler.log_error(error)
+
+    run_threads(lambda: handler.attempt_recovery("qa", error))
+    assert calls == [error]
+    assert handler.get_error_summary()["recovery_attempts"] == {"attempted": 1, "total": 1}
+
+
+def test_failed_recovery_can_be_retried():
+    handler = ErrorHandler()
+    attempts = []
+
+    def strategy(error):
+        attempts.append(error)
+        if len(attempts) == 1:
+            raise RuntimeError("still down")
+
+    handler.add_recovery_strategy("qa", strategy)
+    error = TaskError("qa", "boom", datetime.now(), "Implementation")
+    assert handler.attempt_recovery("qa", error) is False
+    assert error.context["recovery_error"] == "still down"
+    assert handler.attempt_recovery("qa", error) is True
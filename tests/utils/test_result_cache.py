@@ -0,0 +1,125 @@
+"""
+Tests for the content-addressed task result cache.
+"""
+from dataclasses import replace
+from types import SimpleNamespace
+
+from src.config.model_config import ModelType, get_model_config
+from src.utils.result_cache import CachedTaskRunner, TaskResultCache, resolve_cache
+
+
+def make_task(name="requirements_spec", description="Describe the app"):
+    agent = SimpleNamespace(role="Product Owner", backstory="Experienced PO")
+    return SimpleNamespace(
+        name=name,
+        description=description,
+        expected_output="A document",
+        agent=agent
+    )
+
+
+class CountingRunner:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, task, context):
+        self.calls += 1
+        return SimpleNamespace(
+            name=task.name,
+            description=task.description,
+            expected_output=task.expected_output,
+            raw=f"{task.name} output #{self.calls}",
+            json_dict=None,
+            agent=task.agent.role
+        )
+
+
+def test_key_depends_on_context_and_model(tmp_path):
+    cache = TaskResultCache(cache_dir=str(tmp_path))
+    task = make_task()
+    key = cache.key_for_task(task, "upstream")
+
+    assert key == cache.key_for_task(task, "upstream")
+    assert key != cache.key_for_task(task, "other upstream")
+
+    mistral = TaskResultCache(
+        cache_dir=str(tmp_path / "mistral"),
+        model_config=get_model_config(ModelType.MISTRAL)
+    )
+    assert key != mistral.key_for_task(task, "upstream")
+
+    warmer = TaskResultCache(
+        cache_dir=str(tmp_path / "warm"),
+        model_config=replace(cache.model_config, temperature=0.9)
+    )
+    assert key != warmer.key_for_task(task, "upstream")
+
+
+def test_cached_runner_serves_repeats_from_disk(tmp_path):
+    runner = CountingRunner()
+    task = make_task()
+
+    first = CachedTaskRunner(TaskResultCache(cache_dir=str(tmp_path)), runner)(task, "ctx")
+    # A fresh cache instance on the same directory simulates a new process
+    second = CachedTaskRunner(TaskResultCache(cache_dir=str(tmp_path)), runner)(task, "ctx")
+
+    assert runner.calls == 1
+    assert second.raw == first.raw
+    assert second.agent == "Product Owner"
+
+
+def test_text_and_json_runs_of_a_task_do_not_share_results(tmp_path):
+    from src.tasks.output_schemas import RequirementsSpec
+
+    runner = CountingRunner()
+    cached = CachedTaskRunner(TaskResultCache(cache_dir=str(tmp_path)), runner)
+    text_task = make_task()
+    json_task = make_task()
+    json_task.output_json = RequirementsSpec  # What OutputMode.JSON changes
+
+    cached(text_task, "ctx")
+    cached(json_task, "ctx")
+    cached(json_task, "ctx")
+
+    assert runner.calls == 2
+    assert cached.cache.stats()["misses"] == 2
+
+
+def test_invalidation(tmp_path):
+    cache = TaskResultCache(cache_dir=str(tmp_path))
+    runner = CountingRunner()
+    cached = CachedTaskRunner(cache, runner)
+    task = make_task()
+
+    cached(task, "ctx")
+    cached(make_task(name="product_backlog", description="Build the backlog"), "ctx")
+    assert cache.invalidate_task("requirements_spec") == 1
+    cached(task, "ctx")
+    assert runner.calls == 3
+
+    assert cache.invalidate(cache.key_for_task(task, "ctx"))
+    assert not cache.invalidate(cache.key_for_task(task, "ctx"))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TaskResultCache(cache_dir=str(tmp_path), max_size_bytes=400 * 1024)
+    blob = "x" * (100 * 1024)
+
+    cache.put("first", {"raw": blob})
+    cache.put("second", {"raw": blob})
+    cache.get("first")
+    for index in range(6):
+        cache.put(f"filler-{index}", {"raw": blob})
+
+    assert cache.stats()["size_bytes"] <= 400 * 1024 + 100 * 1024
+    assert cache.get("second") is None
+
+
+def test_cache_false_turns_caching_off_despite_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("DEVCREW_CACHE_DIR", str(tmp_path / "cache"))
+    from_env = resolve_cache(None)
+
+    assert isinstance(from_env, TaskResultCache)
+    assert resolve_cache(False) is None
+    assert resolve_cache(from_env) is from_env
+    from_env.close()
@@ -0,0 +1,96 @@
+"""
+Tests for the dependency-aware task scheduler.
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils.error_types import ContextError
+from src.utils.scheduler import CONTEXT_DIVIDER, TaskScheduler, build_dependency_graph
+
+NOT_SPECIFIED = object()  # Stand-in for crewai's sentinel
+
+
+def make_task(name, context=None):
+    return SimpleNamespace(name=name, context=context)
+
+
+def make_diamond():
+    root = make_task("root")
+    left = make_task("left", [root])
+    right = make_task("right", [root])
+    join = make_task("join", [left, right])
+    return [root, left, right, join]
+
+
+class RecordingRunner:
+    """Fake runner that tracks contexts and peak concurrency."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.contexts = {}
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, task, context):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+            self.contexts[task.name] = context
+        return SimpleNamespace(raw=f"{task.name}-out")
+
+
+def test_graph_from_context_lists():
+    graph = build_dependency_graph(make_diamond())
+    assert graph == {"root": [], "left": ["root"], "right": ["root"], "join": ["left", "right"]}
+
+
+def test_unspecified_context_depends_on_previous_tasks():
+    tasks = [make_task("a"), make_task("b", NOT_SPECIFIED), make_task("c", NOT_SPECIFIED)]
+    assert build_dependency_graph(tasks)["c"] == ["a", "b"]
+
+
+def test_missing_dependency_raises_context_error():
+    outsider = make_task("outsider")
+    with pytest.raises(ContextError) as exc:
+        build_dependency_graph([make_task("a", [outsider])])
+    assert exc.value.context["missing_dependencies"] == ["outsider"]
+
+
+def test_cycle_raises_context_error():
+    a = make_task("a")
+    b = make_task("b", [a])
+    a.context = [b]
+    with pytest.raises(ContextError):
+        build_dependency_graph([a, b])
+
+
+def test_independent_branches_run_concurrently():
+    runner = RecordingRunner()
+    outputs = TaskScheduler(max_concurrency=4, runner=runner).run(make_diamond())
+
+    assert [output.raw for output in outputs] == ["root-out", "left-out", "right-out", "join-out"]
+    assert runner.peak == 2
+    assert runner.contexts["join"] == CONTEXT_DIVIDER.join(["left-out", "right-out"])
+
+
+def test_concurrency_cap_is_respected():
+    root = make_task("root")
+    leaves = [make_task(f"leaf{i}", [root]) for i in range(6)]
+    runner = RecordingRunner(delay=0.02)
+    TaskScheduler(max_concurrency=2, runner=runner).run([root] + leaves)
+    assert runner.peak == 2
+
+
+def test_runner_errors_propagate():
+    def failing_runner(task, context):
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        TaskScheduler(runner=failing_runner).run([make_task("a")])
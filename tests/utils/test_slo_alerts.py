@@ -0,0 +1,117 @@
+"""
+Tests for incremental threshold and SLO alerting in TaskMonitor.
+"""
+import pytest
+
+from src.llm.streaming import GenerationStats
+from src.utils.metrics import DevCrewMetrics
+from src.utils.monitor import LatencySLO, MetricType, TaskMonitor, ThroughputSLO
+from src.utils.stats import SlidingWindow
+from src.utils.tracing import Tracer
+
+
+@pytest.fixture
+def monitor():
+    return TaskMonitor(tracer=Tracer(enabled=False), metrics=DevCrewMetrics())
+
+
+def test_sliding_window_evicts_by_size_and_age():
+    now = [0.0]
+    window = SlidingWindow(max_size=3, max_age=10.0, clock=lambda: now[0])
+    for value in (5, 1, 9, 3):
+        window.add(value)
+    assert len(window) == 3
+    assert window.sum == 13
+    assert window.percentile(50) == 3
+    now[0] = 20.0
+    assert len(window) == 0
+    assert window.percentile(95) == 0.0
+
+
+def test_latency_slo_fires_and_resolves(monitor):
+    events = []
+    monitor.add_alert_handler(events.append)
+    monitor.add_slo(LatencySLO(threshold=60, task_name="architecture_design",
+                               percentile=95, window_size=3))
+
+    monitor.record_duration("architecture_design", 30)
+    monitor.record_duration("development", 500)  # Not covered by the objective
+    assert monitor.check_alerts() == []
+
+    monitor.record_duration("architecture_design", 90)
+    [alert] = monitor.check_alerts()
+    assert alert["slo"] == "p95_duration:architecture_design"
+    assert alert["current_value"] == 90
+    assert events[-1]["state"] == "firing"
+
+    for _ in range(3):
+        monitor.record_duration("architecture_design", 20)
+    assert monitor.check_alerts() == []
+    assert [event["state"] for event in events] == ["firing", "resolved"]
+
+
+def test_latency_slo_waits_for_min_samples(monitor):
+    monitor.add_slo(LatencySLO(threshold=1, min_samples=3))
+    monitor.record_duration("qa", 5)
+    monitor.record_duration("qa", 5)
+    assert monitor.check_alerts() == []
+    monitor.record_duration("qa", 5)
+    assert monitor.check_alerts()[0]["task_name"] == "qa"
+
+
+def test_throughput_slo_flags_slow_model_during_task(monitor):
+    monitor.add_slo(ThroughputSLO(min_tokens_per_second=10, window_size=2))
+    monitor.start_task("development")
+
+    def generation(model, tokens, seconds):
+        monitor.on_complete("development", GenerationStats(
+            model=model, completion_tokens=tokens, generation_time=seconds
+        ))
+
+    generation("mistral", 200, 10)
+    assert monitor.check_alerts() == []
+    generation("mistral", 20, 10)  # Window: 220 tokens over 20s
+    assert monitor.check_alerts() == []
+    generation("mistral", 20, 10)  # The fast response leaves the window
+    [alert] = monitor.check_alerts()
+    assert alert["metric"] == MetricType.THROUGHPUT.value
+    assert alert["model"] == "mistral"
+    assert alert["current_value"] == pytest.approx(2.0)
+
+
+def test_throughput_ignores_tasks_not_running(monitor):
+    monitor.add_slo(ThroughputSLO(min_tokens_per_second=10))
+    monitor.on_complete("qa", GenerationStats(model="llama2", completion_tokens=1,
+                                              generation_time=10))
+    assert monitor.check_alerts() == []
+
+
+def test_throughput_ignores_same_task_of_another_run(monitor):
+    from src.utils.cancellation import CancellationToken, cancellation_scope
+
+    monitor.add_slo(ThroughputSLO(min_tokens_per_second=10, window_size=1))
+    with cancellation_scope(CancellationToken(name="qa")):
+        monitor.start_task("qa")
+    with cancellation_scope(CancellationToken(name="qa")):  # A concurrent run's qa task
+        monitor.on_complete("qa", GenerationStats(model="llama2", completion_tokens=1,
+                                                  generation_time=10))
+    assert monitor.check_alerts() == []
+
+
+def test_error_threshold_is_incremental(monitor):
+    monitor.set_alert_threshold(MetricType.ERROR_COUNT, 1)
+    monitor.start_task("qa")
+    monitor.record_error("qa", "TimeoutError", {})
+    assert monitor.check_alerts() == []
+    monitor.record_error("qa", "TimeoutError", {})
+    assert monitor.check_alerts()[0]["current_value"] == 2
+    monitor.start_task("qa")  # A new execution starts counting again
+    assert monitor.check_alerts() == []
+
+
+def test_threshold_set_later_applies_to_recorded_events(monitor):
+    monitor.start_task("qa")
+    monitor.record_error("qa", "TimeoutError", {})
+    monitor.set_alert_threshold(MetricType.SUCCESS_RATE, 0.5)
+    [alert] = monitor.check_alerts()
+    assert alert["metric"] == MetricType.SUCCESS_RATE.value
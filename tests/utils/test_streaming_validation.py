@@ -0,0 +1,148 @@
+"""
+Tests for validating model outputs while they stream.
+"""
+import pytest
+
+from src.llm.streaming import stream_generation
+from src.utils.error_types import ErrorCategory, ValidationError
+from src.utils.monitor import TaskMonitor
+from src.utils.validator import (
+    StreamBehavior,
+    StreamingValidator,
+    TaskValidator,
+    ValidationRule,
+    ValidationSeverity,
+    create_common_validation_rules,
+    find_repetition,
+    format_rule
+)
+
+INTRO = "## Requirements\nThe system lets customers browse components and place orders. "
+LOOP = "the order service calls the payment service which "
+
+
+def common_validator():
+    validator = TaskValidator()
+    for task_type, rules in create_common_validation_rules().items():
+        for rule in rules:
+            validator.add_output_rule(task_type, rule)
+    return validator
+
+
+def looping_chunks(repeats=200):
+    yield INTRO
+    for _ in range(repeats):
+        for word in LOOP.split():
+            yield word + " "
+
+
+def test_find_repetition_needs_a_long_loop():
+    assert find_repetition(INTRO + LOOP * 10) == LOOP.strip()
+    assert find_repetition(INTRO + LOOP * 2) is None
+    assert find_repetition("| --- " * 20) is None  # Short repeats such as table rules
+    assert find_repetition("") is None
+
+
+def test_validate_stream_stops_at_repetition_loop():
+    consumed = []
+
+    def chunks():
+        for chunk in looping_chunks():
+            consumed.append(chunk)
+            yield chunk
+
+    result = common_validator().validate_stream("requirements_spec", chunks())
+
+    assert not result.is_valid
+    assert [error["rule_name"] for error in result.errors] == ["no_repetition_loop"]
+    assert result.aborted_at is not None
+    assert len(consumed) < 200 * len(LOOP.split()) // 4
+
+
+def test_rules_satisfied_early_are_not_evaluated_again():
+    calls = []
+
+    def has_heading(text):
+        calls.append(len(text))
+        return text.startswith("## ")
+
+    validator = TaskValidator()
+    validator.add_output_rule("plan", ValidationRule(
+        name="heading", description="", validator=has_heading, error_message="no heading",
+        severity=ValidationSeverity.ERROR, streaming=StreamBehavior.SATISFIED_EARLY
+    ))
+    validation = validator.begin_stream("plan", check_interval=8)
+    for word in ("## Plan\n" + "step " * 100).split(" "):
+        assert validation.feed(word + " ") is None
+
+    assert validation.finish().is_valid
+    assert validation.satisfied == ["heading"]
+    assert len(calls) == 1
+
+
+def test_format_rule_fails_early_and_final_only_rules_wait():
+    validator = TaskValidator()
+    validator.add_output_rule("plan", format_rule(r"^## ", within_chars=40))
+    validator.add_output_rule("plan", ValidationRule(
+        name="long", description="", validator=lambda text: len(text) > 10_000,
+        error_message="too short", severity=ValidationSeverity.ERROR
+    ))
+    validation = validator.begin_stream("plan", check_interval=16)
+
+    assert validation.feed("Sure! Here is the plan you asked for.") is None
+    violation = validation.feed(" It has several steps.")
+    assert violation["rule_name"] == "expected_format"
+    assert validation.finish().errors == [violation]
+
+
+def test_streaming_validator_aborts_generation_and_records_it():
+    closed = []
+
+    def chunks():
+        try:
+            for chunk in looping_chunks():
+                yield {"message": {"content": chunk}}
+        finally:
+            closed.append(True)
+
+    monitor = TaskMonitor()
+    monitor.start_task("requirements_spec")
+    listener = StreamingValidator(common_validator(), monitor=monitor)
+
+    with pytest.raises(ValidationError) as raised:
+        stream_generation(chunks(), "llama2", "requirements_spec", [listener])
+
+    assert raised.value.category is ErrorCategory.VALIDATION_ERROR
+    assert "no_repetition_loop" in raised.value.context["validation_errors"]
+    assert closed == [True]
+    metrics = monitor.task_metrics["requirements_spec"]
+    assert (metrics.validation_attempts, metrics.validation_aborts) == (1, 1)
+
+    # A clean response for the same task counts as a passed validation
+    stream_generation(iter([{"message": {"content": INTRO + LOOP * 2}}, {"done": True}]),
+                      "llama2", "requirements_spec", [listener])
+    assert (metrics.validation_attempts, metrics.validation_passes) == (2, 1)
+
+
+def test_concurrent_generations_of_one_task_are_validated_apart():
+    from src.utils.cancellation import CancellationToken, cancellation_scope
+
+    monitor = TaskMonitor()
+    monitor.start_task("requirements_spec")
+    listener = StreamingValidator(common_validator(), monitor=monitor, check_interval=1)
+    looping, clean = CancellationToken(name="requirements_spec"), CancellationToken(name="requirements_spec")
+
+    for token in (looping, clean):
+        with cancellation_scope(token):
+            listener.on_start("requirements_spec", "llama2")
+    with pytest.raises(ValidationError):
+        for index, chunk in enumerate(looping_chunks()):
+            with cancellation_scope(clean):
+                listener.on_token("requirements_spec", f"requirement {index} ", 1)
+            with cancellation_scope(looping):
+                listener.on_token("requirements_spec", chunk, 1)
+    with cancellation_scope(clean):
+        listener.on_complete("requirements_spec", None)
+
+    metrics = monitor.task_metrics["requirements_spec"]
+    assert (metrics.validation_aborts, metrics.validation_passes) == (1, 1)
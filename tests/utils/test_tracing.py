@@ -0,0 +1,96 @@
+"""
+Tests for span tracing and the Chrome trace export.
+"""
+import json
+import threading
+
+import pytest
+
+from src.utils.monitor import TaskMonitor
+from src.utils.tracing import Tracer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_span_records_complete_event():
+    clock = FakeClock()
+    tracer = Tracer(clock=clock)
+    with tracer.span("llm:llama2", "llm", task="qa") as span:
+        clock.now += 0.25
+        span.set(completion_tokens=12)
+
+    [event] = tracer.events()
+    assert event["ph"] == "X"
+    assert event["ts"] == 0
+    assert event["dur"] == pytest.approx(250_000)
+    assert event["args"] == {"task": "qa", "completion_tokens": 12}
+    assert event["tid"] == threading.get_ident()
+
+
+def test_span_records_exception_type():
+    tracer = Tracer()
+    with pytest.raises(ValueError):
+        with tracer.span("validate_output:qa", "validation"):
+            raise ValueError("bad output")
+    assert tracer.events()[0]["args"]["error"] == "ValueError"
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer(enabled=False)
+    with tracer.span("task", "task") as span:
+        span.set(ignored=True)
+    tracer.instant("checkpoint", "checkpoint")
+    tracer.end(tracer.begin("task", "task"))
+    assert tracer.events() == []
+
+
+def test_max_events_drops_overflow():
+    tracer = Tracer(max_events=2)
+    for _ in range(5):
+        tracer.instant("tick", "test")
+    assert len(tracer.events()) == 2
+    assert tracer.to_chrome_trace()["otherData"]["dropped_events"] == 3
+
+
+def test_chrome_trace_names_threads(tmp_path):
+    tracer = Tracer()
+
+    def work():
+        with tracer.span("task", "task"):
+            pass
+
+    thread = threading.Thread(target=work, name="worker-1")
+    thread.start()
+    thread.join()
+    path = tmp_path / "trace" / "run.json"
+    tracer.save(str(path))
+
+    trace = json.loads(path.read_text())
+    names = {
+        event["args"]["name"] for event in trace["traceEvents"]
+        if event["ph"] == "M" and event["name"] == "thread_name"
+    }
+    assert names == {"worker-1"}
+    assert trace["displayTimeUnit"] == "ms"
+
+
+def test_task_monitor_traces_tasks_and_checkpoints():
+    tracer = Tracer()
+    monitor = TaskMonitor(tracer=tracer)
+    monitor.start_task("qa", phase="Implementation")
+    monitor.record_checkpoint("qa", "tests_written")
+    monitor.record_error("qa", "TimeoutError", {})
+    monitor.end_task("qa")
+
+    events = tracer.events()
+    assert [(event["name"], event["ph"]) for event in events] == [
+        ("tests_written", "i"), ("error:TimeoutError", "i"), ("qa", "X")
+    ]
+    assert events[-1]["args"] == {"phase": "Implementation"}
+    assert monitor.get_task_summary("qa")["error_count"] == 1
@@ -0,0 +1,108 @@
+"""
+Tests for memoised validation results.
+"""
+from src.utils.validation_memo import ValidationMemo
+from src.utils.validator import (
+    CompiledRuleSet,
+    TaskValidator,
+    ValidationRule,
+    ValidationSeverity,
+    create_common_validation_rules
+)
+
+SPEC = "## Requirements\n" + " ".join(f"Requirement {index} is clear." for index in range(20))
+
+
+def counting_rule(calls, name="counted", passes=True):
+    def check(text):
+        calls.append(text)
+        return passes
+    return ValidationRule(name=name, description="", validator=check,
+                          error_message=f"{name} failed", severity=ValidationSeverity.ERROR)
+
+
+def common_validator(memo):
+    validator = TaskValidator(memo=memo)
+    for task_type, rules in create_common_validation_rules().items():
+        for rule in rules:
+            validator.add_output_rule(task_type, rule)
+    return validator
+
+
+def test_repeated_validation_is_served_from_memo():
+    calls = []
+    validator = TaskValidator(memo=ValidationMemo())
+    validator.add_output_rule("plan", counting_rule(calls, passes=False))
+
+    first = validator.validate_output("plan", SPEC)
+    first.errors.clear()  # Callers get their own copy
+    second = validator.validate_output("plan", SPEC)
+    validator.validate_output("plan", SPEC + " More.")
+
+    assert len(calls) == 2
+    assert [error["rule_name"] for error in second.errors] == ["counted"]
+    assert validator.memo.stats()["hits"] == 1
+
+
+def test_adding_a_rule_invalidates_memoised_results():
+    calls = []
+    validator = TaskValidator(memo=ValidationMemo())
+    validator.add_output_rule("plan", counting_rule(calls))
+    validator.add_input_rule("plan", counting_rule(calls))
+    assert validator.validate_output("plan", SPEC).is_valid
+    assert validator.validate_input("plan", SPEC).is_valid
+
+    validator.add_output_rule("plan", counting_rule(calls, name="strict", passes=False))
+    result = validator.validate_output("plan", SPEC)
+
+    assert [error["rule_name"] for error in result.errors] == ["strict"]
+    assert validator.memo.stats()["entries"] == 2  # The input result survives
+    assert validator.validate_input("plan", SPEC).is_valid
+    assert len(calls) == 4
+
+
+def test_lru_eviction_bounds_the_memo():
+    memo = ValidationMemo(max_entries=2)
+    for index in range(3):
+        memo.put(f"output:plan:v1:{index}", {"is_valid": True, "errors": [], "warnings": []})
+    memo.get("output:plan:v1:1")
+    memo.put("output:plan:v1:3", {"is_valid": True, "errors": [], "warnings": []})
+
+    assert memo.get("output:plan:v1:0") is None
+    assert memo.get("output:plan:v1:2") is None
+    assert memo.get("output:plan:v1:1") is not None
+    assert memo.stats()["entries"] == 2
+
+
+def test_rule_set_version_follows_rule_content():
+    def closing_over(value):
+        return ValidationRule(name="rule", description="", validator=lambda text: value in text,
+                              error_message="missing", severity=ValidationSeverity.ERROR)
+
+    common = create_common_validation_rules()["architecture_design"]
+    assert CompiledRuleSet(common).version == \
+        CompiledRuleSet(create_common_validation_rules()["architecture_design"]).version
+    assert CompiledRuleSet([closing_over("a")]).version != CompiledRuleSet([closing_over("b")]).version
+
+
+def test_persistent_store_is_shared_between_validators(tmp_path):
+    store_dir = str(tmp_path / "validation")
+    first = common_validator(ValidationMemo(store_dir=store_dir))
+    expected = first.validate_output("requirements_spec", SPEC)
+    first.memo.close()
+
+    second = common_validator(ValidationMemo(store_dir=store_dir))
+    results = second.validate_outputs("requirements_spec", [SPEC, ""])
+
+    assert results[0] == expected
+    assert not results[1].is_valid
+    assert second.memo.stats()["hits"] == 1
+    assert second.memo.stats()["stored_entries"] == 2
+
+    calls = []
+    second.add_output_rule("requirements_spec", counting_rule(calls))
+    second.validate_output("requirements_spec", SPEC)
+    assert len(calls) == 1  # Results of the previous rule set are not reused
+    assert second.memo.invalidate("output", "requirements_spec", persistent=True) == 4
+    assert second.memo.stats()["stored_entries"] == 0
+    second.memo.close()